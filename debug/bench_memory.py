@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measure the memory footprint of parsed expression nodes.
+
+Usage::
+
+    python debug/bench_memory.py
+"""
+
+import gc
+import tracemalloc
+
+from jsonpolars.expr import api as expr
+from jsonpolars.base_expr import parse_expr
+
+
+def make_expr_data(i: int) -> dict:
+    # like a rule engine, the leaves repeat a lot, the rule name is unique
+    return expr.Alias(
+        name=f"rule_{i}",
+        expr=expr.GreatThan(
+            left=expr.Plus(
+                left=expr.Column(name=f"col_{i % 20}"),
+                right=expr.Lit(value=i % 5),
+            ),
+            right=expr.Lit(value=0),
+        ),
+    ).to_dict()
+
+
+def measure(
+    n: int = 10000,
+    intern: bool = False,
+    keep_table: bool = True,
+) -> float:
+    data_list = [make_expr_data(i) for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    table = dict()
+    exprs = [
+        parse_expr(data, intern=table if intern else False) for data in data_list
+    ]
+    if keep_table is False:
+        del table
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_nodes = n * 6  # Alias, GreatThan, Plus, Column, Lit, Lit
+    assert len(exprs) == n
+    return (after - before) / n_nodes
+
+
+def main():
+    node = expr.Column(name="a")
+    print(f"has __dict__: {hasattr(node, '__dict__')}")
+    print(f"bytes per node: {measure():.1f}")
+    print(f"bytes per node, intern: {measure(intern=True):.1f}")
+    bytes_per_node = measure(intern=True, keep_table=False)
+    print(f"bytes per node, intern, table dropped: {bytes_per_node:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark ``parse_dfop`` / ``to_dict`` on a plan with about 10k nodes.
+
+Usage::
+
+    python debug/bench_parse.py
+"""
+
+import timeit
+
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.base_dfop import parse_dfop
+
+
+def make_plan(n_columns: int = 1000) -> dict:
+    named_exprs = dict()
+    for i in range(n_columns):
+        named_exprs[f"col_{i}"] = expr.LogicalAnd(
+            left=expr.GreatThan(
+                left=expr.Plus(
+                    left=expr.Column(name=f"a_{i}"),
+                    right=expr.Lit(value=i),
+                ),
+                right=expr.Lit(value=0),
+            ),
+            right=expr.StrContains(
+                expr=expr.Cast(expr=expr.Column(name=f"b_{i}"), dtype="String"),
+                pattern="x",
+            ),
+        )
+    plan = dfop.WithColumns(named_exprs=named_exprs)
+    return plan.to_dict()
+
+
+def count_nodes(data) -> int:
+    if isinstance(data, dict):
+        return int("type" in data) + sum(count_nodes(v) for v in data.values())
+    elif isinstance(data, list):
+        return sum(count_nodes(v) for v in data)
+    return 0
+
+
+def main():
+    plan_data = make_plan()
+    plan = parse_dfop(plan_data)
+    print(f"nodes: {count_nodes(plan_data)}")
+    number, repeat = 10, 5
+    elapsed = min(
+        timeit.repeat(lambda: parse_dfop(plan_data), number=number, repeat=repeat)
+    )
+    print(f"parse_dfop: {elapsed / number * 1000:.2f} ms")
+    elapsed = min(
+        timeit.repeat(lambda: plan.to_dict(), number=number, repeat=repeat)
+    )
+    print(f"to_dict: {elapsed / number * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run jsonpolars plans from ``asyncio`` code without blocking the event loop.
+
+The plan runs in a thread pool executor and the event loop only awaits the
+result. Polars releases the GIL while it computes, so many plans overlap on
+the polars thread pool.
+
+Example::
+
+    >>> import asyncio
+    >>> from jsonpolars.aio import collect_async
+    >>> async def handle(request):
+    ...     df = await collect_async(plan, lf, timeout=5)
+    ...     ...
+
+.. note::
+
+    On timeout or cancellation the awaiting task is cancelled and the result
+    is discarded, but polars cannot interrupt a query that has already
+    started, it still runs to the end in the background.
+
+    ``pl.LazyFrame.collect_async`` is not used, its callback may crash the
+    interpreter at exit while a query is still running.
+"""
+
+import typing as T
+import asyncio
+import functools
+from concurrent.futures import Executor
+
+import polars as pl
+
+from .utils_dfop import T_PLAN, to_dfop_list
+from .dfop.pipeline import Pipeline
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .dfop.api import T_DFOP
+
+
+def _run_eager(
+    dfops: T.List["T_DFOP"],
+    df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]],
+) -> T.Optional[pl.DataFrame]:
+    """
+    Run the dfops one by one, the frame is collected before the first dfop
+    that cannot be applied on a ``pl.LazyFrame``.
+    """
+    for dfop in dfops:
+        if isinstance(df, pl.LazyFrame) and not dfop.lazy_supported:
+            df = df.collect()
+        df = dfop.to_polars(df)
+    if isinstance(df, pl.LazyFrame):
+        df = df.collect()
+    return df
+
+
+def _run(
+    pipeline: Pipeline,
+    df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]],
+) -> T.Optional[pl.DataFrame]:
+    if not pipeline.lazy_supported:
+        result = _run_eager(pipeline.dfops, df)
+        return None if pipeline.is_sink else result
+    if pipeline.is_sink:
+        pipeline.sink(df)
+        return None
+    return pipeline.to_lazyframe(df).collect()
+
+
+async def collect_async(
+    plan: T_PLAN,
+    df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]] = None,
+    timeout: T.Optional[float] = None,
+    executor: T.Optional[Executor] = None,
+) -> T.Optional[pl.DataFrame]:
+    """
+    Run a plan without blocking the event loop, and give back the collected
+    result. A plan that ends with a sink dfop writes the result and gives
+    back None.
+
+    :param df: the input frame, leave it None if the plan starts with a
+        source dfop.
+    :param timeout: the seconds to wait for the result, raise
+        ``asyncio.TimeoutError`` after that.
+    :param executor: the executor that runs the plan, default is the default
+        executor of the event loop.
+    """
+    pipeline = Pipeline(dfops=to_dfop_list(plan))
+    loop = asyncio.get_running_loop()
+    func = functools.partial(_run, pipeline, df)
+    return await asyncio.wait_for(loop.run_in_executor(executor, func), timeout)
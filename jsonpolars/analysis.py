@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+
+"""
+Find out which input columns a jsonpolars expression or plan reads, without
+running it, and without polars' lazy engine.
+
+A loader can use it to only read the needed Parquet columns, and to only
+decode the needed fields of a struct column.
+
+Example::
+
+    >>> from jsonpolars.analysis import analyze_columns
+    >>> res = analyze_columns(
+    ...     [
+    ...         {"type": "with_columns", "named_exprs": {"b": dot_field("user", ["id"]).to_dict()}},
+    ...         {"type": "select", "exprs": ["a", "b"]},
+    ...     ]
+    ... )
+    >>> res.columns, res.struct_fields, res.all_columns
+    ({'a', 'user'}, {'user': {('id',)}}, False)
+"""
+
+import typing as T
+import re
+import dataclasses
+
+from .model import iter_child_nodes
+from .base_expr import ExprEnum, BaseExpr
+from .base_dfop import DfopEnum
+from .utils_dfop import T_PLAN, to_dfop_list
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .expr.api import T_EXPR
+    from .dfop.api import T_DFOP
+
+T_FIELD_PATH = T.Tuple[str, ...]
+
+
+@dataclasses.dataclass
+class ExprColumns:
+    """
+    The columns an expression reads.
+
+    :param columns: the names of the columns read.
+    :param struct_fields: the field paths read from a struct column through
+        ``StructField``, by the name of the column. The empty path ``()``
+        means the whole column is read too.
+    :param all_columns: True if the expression reads columns that are not
+        known by name, for example ``pl.col("*")`` or a regex.
+    """
+
+    columns: T.Set[str] = dataclasses.field(default_factory=set)
+    struct_fields: T.Dict[str, T.Set[T_FIELD_PATH]] = dataclasses.field(
+        default_factory=dict
+    )
+    all_columns: bool = dataclasses.field(default=False)
+
+
+@dataclasses.dataclass
+class StepColumns:
+    """
+    The columns of one dfop of a plan.
+
+    :param dfop: the dfop.
+    :param reads: the names of the columns the dfop reads, as they are named
+        in the frame the dfop runs on.
+    :param produces: the names of the columns the dfop adds or replaces, in
+        the output order.
+    :param all_columns: True if the dfop reads all the columns of its input
+        frame, for example a ``Count``.
+    """
+
+    dfop: "T_DFOP" = dataclasses.field()
+    reads: T.Set[str] = dataclasses.field(default_factory=set)
+    produces: T.List[str] = dataclasses.field(default_factory=list)
+    all_columns: bool = dataclasses.field(default=False)
+
+
+@dataclasses.dataclass
+class PlanColumns:
+    """
+    The input columns of a plan.
+
+    :param columns: the names of the input columns the plan reads, including
+        the ones it passes through to the output.
+    :param struct_fields: the field paths read from a struct input column
+        through ``StructField``, by the name of the input column. The empty
+        path ``()`` means the whole column is read too.
+    :param all_columns: True if the plan needs input columns that are not
+        known by name, for example the plan doesn't end with a ``Select``, so
+        all the other input columns are kept in the output.
+    :param steps: the columns of each dfop.
+    """
+
+    columns: T.Set[str] = dataclasses.field(default_factory=set)
+    struct_fields: T.Dict[str, T.Set[T_FIELD_PATH]] = dataclasses.field(
+        default_factory=dict
+    )
+    all_columns: bool = dataclasses.field(default=False)
+    steps: T.List[StepColumns] = dataclasses.field(default_factory=list)
+
+
+def _is_wildcard(name: str) -> bool:
+    return name == "*" or (name.startswith("^") and name.endswith("$"))
+
+
+class _Collector:
+    """
+    Collect the columns and the struct field paths read.
+    """
+
+    def __init__(self):
+        self.columns: T.Set[str] = set()
+        self.paths: T.Dict[str, T.Set[T_FIELD_PATH]] = dict()
+
+    def add(self, name: str, path: T_FIELD_PATH = ()):
+        self.columns.add(name)
+        self.paths.setdefault(name, set()).add(path)
+
+    def get_struct_fields(self) -> T.Dict[str, T.Set[T_FIELD_PATH]]:
+        return {
+            name: paths
+            for name, paths in self.paths.items()
+            if any(len(path) for path in paths)
+        }
+
+
+# a ``str`` in a field of these type hints is a column name, in an
+# ``OtherExpr`` field it is a python literal
+_COLUMN_STR_HINTS = {
+    "IntoExpr",
+    "IntoExprColumn",
+    "ColumnNameOrSelector",
+    "DatetimeElementExpr",
+}
+_p_identifier = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_column_str_fields_cache: T.Dict[type, T.Tuple[str, ...]] = dict()
+
+
+def _get_column_str_fields(klass: type) -> T.Tuple[str, ...]:
+    try:
+        return _column_str_fields_cache[klass]
+    except KeyError:
+        pass
+    names = tuple(
+        field.name
+        for field in dataclasses.fields(klass)
+        if _COLUMN_STR_HINTS.intersection(_p_identifier.findall(str(field.type)))
+    )
+    _column_str_fields_cache[klass] = names
+    return names
+
+
+def _iter_column_strs(value: T.Any) -> T.Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            if isinstance(v, str):
+                yield v
+    elif isinstance(value, dict):
+        for v in value.values():
+            if isinstance(v, str):
+                yield v
+
+
+def _resolve_struct_field(
+    node: "T_EXPR",
+) -> T.Optional[T.Tuple[str, T.List[T_FIELD_PATH]]]:
+    """
+    Resolve a ``StructField`` chain, for example built by
+    :func:`jsonpolars.jskit.dot_field`, to the root column and the field
+    paths it reads.
+    """
+    names: T.List[T.List[str]] = list()
+    while node.type == ExprEnum.struct_field.value:
+        fields = [node.name] if isinstance(node.name, str) else list(node.name)
+        names.append(fields + list(node.more_names))
+        node = node.expr
+        if not isinstance(node, BaseExpr):
+            return None
+    if node.type != ExprEnum.column.value:
+        return None
+    paths: T.List[T_FIELD_PATH] = [()]
+    for fields in reversed(names):
+        paths = [path + (field,) for path in paths for field in fields]
+    return node.name, paths
+
+
+def find_expr_columns(expr_like: T.Union[str, "T_EXPR"]) -> ExprColumns:
+    """
+    Find the columns an expression reads. A ``str`` is a column name.
+    """
+    result = ExprColumns()
+    collector = _Collector()
+
+    def add(name: str, path: T_FIELD_PATH = ()):
+        if _is_wildcard(name):
+            result.all_columns = True
+        else:
+            collector.add(name, path)
+
+    stack = [expr_like]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            add(node)
+            continue
+        if node.type == ExprEnum.column.value:
+            add(node.name)
+            continue
+        if node.type == ExprEnum.struct_field.value:
+            resolved = _resolve_struct_field(node)
+            if resolved is not None:
+                root, paths = resolved
+                for path in paths:
+                    add(root, path)
+                continue
+        for name in _get_column_str_fields(type(node)):
+            stack.extend(_iter_column_strs(getattr(node, name)))
+        stack.extend(
+            child for child in iter_child_nodes(node) if isinstance(child, BaseExpr)
+        )
+    result.columns = collector.columns
+    result.struct_fields = collector.get_struct_fields()
+    return result
+
+
+def _get_output_name(expr_like: T.Union[str, "T_EXPR"]) -> T.Optional[str]:
+    if isinstance(expr_like, str):
+        return expr_like
+    try:
+        return expr_like.to_polars().meta.output_name(raise_if_undetermined=False)
+    except Exception:  # pragma: no cover
+        return None
+
+
+class _Schema:
+    """
+    The columns of the frame at a step of the plan, and the input column each
+    of them comes from.
+
+    :param origins: the input column of each known column, None if it is
+        computed.
+    :param removed: the input columns that are dropped or renamed.
+    :param is_open: True if the frame may have input columns that are not
+        known by name.
+    """
+
+    def __init__(self):
+        self.origins: T.Dict[str, T.Optional[str]] = dict()
+        self.removed: T.Set[str] = set()
+        self.is_open = True
+
+    def resolve(self, name: str) -> T.Optional[str]:
+        if name in self.origins:
+            return self.origins[name]
+        if self.is_open and name not in self.removed:
+            return name
+        return None
+
+    def remove(self, name: str):
+        self.origins.pop(name, None)
+        self.removed.add(name)
+
+
+def _iter_step_exprs(dfop: "T_DFOP") -> T.Iterable[T.Any]:
+    if dfop.type in (DfopEnum.select.value, DfopEnum.with_columns.value):
+        yield from dfop.exprs
+        yield from dfop.named_exprs.values()
+    elif dfop.type == DfopEnum.sort.value:
+        yield from dfop.by
+    elif dfop.type == DfopEnum.drop.value:
+        yield from dfop.columns
+    elif dfop.type == DfopEnum.drop_nulls.value:
+        if isinstance(dfop.subset, list):
+            yield from dfop.subset
+    elif dfop.type == DfopEnum.filter.value:
+        yield from dfop.predicates
+        yield from dfop.constraints
+
+
+# these dfops don't read any column
+_NO_READ_TYPES = {
+    DfopEnum.head.value,
+    DfopEnum.tail.value,
+}
+
+
+def analyze_columns(plan: T_PLAN) -> PlanColumns:
+    """
+    Find the input columns a plan reads, and the columns each dfop reads and
+    produces.
+
+    The columns are tracked through the dfops, a column computed by a dfop is
+    not an input column, and a ``Rename`` is followed back to the input
+    column. A dfop this function doesn't know reads all the columns.
+    """
+    result = PlanColumns()
+    collector = _Collector()
+    schema = _Schema()
+
+    def add_input(name: str, paths: T.Iterable[T_FIELD_PATH] = ((),)):
+        origin = schema.resolve(name)
+        if origin is not None:
+            for path in paths:
+                collector.add(origin, path)
+
+    def read_all(step: StepColumns):
+        step.all_columns = True
+        for name in list(schema.origins):
+            add_input(name)
+        if schema.is_open:
+            result.all_columns = True
+
+    for dfop in to_dfop_list(plan):
+        step = StepColumns(dfop=dfop)
+        result.steps.append(step)
+        if dfop.is_source:
+            schema = _Schema()
+            continue
+        if dfop.is_sink or dfop.type in _NO_READ_TYPES:
+            continue
+
+        if dfop.type in (
+            DfopEnum.select.value,
+            DfopEnum.with_columns.value,
+            DfopEnum.sort.value,
+            DfopEnum.drop.value,
+            DfopEnum.drop_nulls.value,
+            DfopEnum.rename.value,
+            DfopEnum.filter.value,
+        ):
+            for expr_like in _iter_step_exprs(dfop):
+                expr_columns = find_expr_columns(expr_like)
+                step.reads.update(expr_columns.columns)
+                for name in expr_columns.columns:
+                    add_input(name, expr_columns.struct_fields.get(name, [()]))
+                if expr_columns.all_columns:
+                    read_all(step)
+            if dfop.type == DfopEnum.drop_nulls.value and not isinstance(
+                dfop.subset, list
+            ):
+                read_all(step)
+        else:
+            read_all(step)
+
+        if dfop.type in (DfopEnum.select.value, DfopEnum.with_columns.value):
+            outputs: T.Dict[str, T.Optional[str]] = dict()
+            items = [(_get_output_name(ex), ex) for ex in dfop.exprs]
+            items.extend(dfop.named_exprs.items())
+            for name, expr_like in items:
+                if name is None:  # pragma: no cover
+                    continue
+                if isinstance(expr_like, str):
+                    origin = schema.resolve(expr_like)
+                elif expr_like.type == ExprEnum.column.value:
+                    origin = schema.resolve(expr_like.name)
+                else:
+                    origin = None
+                outputs[name] = origin
+                step.produces.append(name)
+            if dfop.type == DfopEnum.select.value and not step.all_columns:
+                schema.origins = outputs
+                schema.is_open = False
+            else:
+                schema.origins.update(outputs)
+        elif dfop.type == DfopEnum.drop.value:
+            for name in step.reads:
+                schema.remove(name)
+        elif dfop.type == DfopEnum.rename.value:
+            if isinstance(dfop.mapping, dict):
+                origins = {
+                    new: schema.resolve(old) for old, new in dfop.mapping.items()
+                }
+                for old in dfop.mapping:
+                    schema.remove(old)
+                schema.origins.update(origins)
+                step.reads.update(dfop.mapping)
+                step.produces.extend(dfop.mapping.values())
+            else:  # a callable renames the columns we don't know
+                schema = _Schema()
+        elif dfop.type not in (
+            DfopEnum.sort.value,
+            DfopEnum.drop_nulls.value,
+            DfopEnum.filter.value,
+        ):
+            # for example a ``Count``, all the columns are computed
+            schema.origins = {name: None for name in schema.origins}
+            schema.is_open = False
+
+    # the columns in the output are read too
+    for name in list(schema.origins):
+        add_input(name)
+    if schema.is_open:
+        result.all_columns = True
+    result.columns = collector.columns
+    result.struct_fields = collector.get_struct_fields()
+    return result
@@ -9,6 +9,41 @@ from .base_dfop import DfopEnum
 from .base_dfop import parse_dfop
 from .dfop.api import T_DFOP
 from .dfop import api as dfop
+from .utils_dfop import T_PLAN
+from .utils_dfop import to_dfop_list
+from .streaming import StreamingPlan
+from .streaming import run_streaming
+from .cache import CompileCache
+from .cache import compile_cache
+from .cache import compile_expr
+from .cache import compile_dfop
+from .loader import LineError
+from .loader import LoadResult
+from .loader import load_plans
+from .ipc import MappedIpc
+from .ipc import map_ipc
+from .ipc import run_plan
+from .slices import is_row_local
+from .slices import iter_slices
+from .slices import run_sliced
+from .arrow import run_arrow
+from .arrow import iter_arrow_batches
+from .arrow import run_arrow_reader
+from .aio import collect_async
+from .batch import JobResult
+from .batch import BatchResult
+from .batch import run_batch
+from .server import PlanRegistry
+from .server import PlanServer
+from .client import PlanClient
+from .optimize import fold_constants
+from .optimize import eliminate_common_subexprs
+from .optimize import merge_adjacent_dfops
+from .analysis import ExprColumns
+from .analysis import StepColumns
+from .analysis import PlanColumns
+from .analysis import find_expr_columns
+from .analysis import analyze_columns
 from .chain import chain
 from .chain import PRE
 from . import jskit
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run jsonpolars plans on PyArrow data, and give back PyArrow data.
+
+The input is converted with ``pl.from_arrow(..., rechunk=False)``, the numeric,
+boolean and temporal buffers are shared with polars, no copy is made. The
+result is converted back with ``pl.DataFrame.to_arrow``, which is zero-copy
+too.
+
+A ``pa.RecordBatchReader`` is processed batch by batch, so the full stream is
+never buffered, if the plan is row-local, see
+:func:`jsonpolars.slices.is_row_local`. A plan that is not row-local, for
+example a ``Sort``, needs all the rows, the stream is read into one table
+first.
+
+Example::
+
+    >>> import pyarrow as pa
+    >>> from jsonpolars.arrow import run_arrow, run_arrow_reader
+    >>> plan = [{"type": "drop", "columns": ["b"]}]
+    >>> table = run_arrow(plan, pa.table({"a": [1, 2], "b": [3, 4]}))
+    >>> reader = run_arrow_reader(plan, upstream_reader)
+    >>> for batch in reader:
+    ...     ...
+
+.. note::
+
+    ``pyarrow`` is an optional dependency, ``pip install "jsonpolars[arrow]"``.
+"""
+
+import typing as T
+
+import polars as pl
+
+from .utils_dfop import T_PLAN, to_dfop_list
+from .slices import is_row_local
+from .dfop.pipeline import Pipeline
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    import pyarrow as pa
+
+T_ARROW_DATA = T.Union["pa.Table", "pa.RecordBatch"]
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "jsonpolars.arrow requires pyarrow, "
+            'install it with ``pip install "jsonpolars[arrow]"``.'
+        ) from e
+    return pa
+
+
+def _from_arrow(data: T_ARROW_DATA) -> pl.DataFrame:
+    return pl.from_arrow(data, rechunk=False)
+
+
+def run_arrow(plan: T_PLAN, data: T_ARROW_DATA) -> "pa.Table":
+    """
+    Run a plan on a ``pa.Table`` or a ``pa.RecordBatch``, and give back the
+    result as a ``pa.Table``.
+    """
+    func = Pipeline(dfops=to_dfop_list(plan)).compile()
+    return func(_from_arrow(data)).to_arrow()
+
+
+def iter_arrow_batches(
+    plan: T_PLAN,
+    reader: "pa.RecordBatchReader",
+) -> T.Iterable["pa.RecordBatch"]:
+    """
+    Run a plan on the batches of a ``pa.RecordBatchReader``, and yield the
+    result batches in order.
+
+    A row-local plan runs on each batch as soon as it is read, the other plans
+    run once on all the batches.
+    """
+    pa = _import_pyarrow()
+    dfops = to_dfop_list(plan)
+    func = Pipeline(dfops=dfops).compile()
+    if not is_row_local(dfops):
+        table = pa.Table.from_batches(list(reader), schema=reader.schema)
+        yield from func(_from_arrow(table)).to_arrow().to_batches()
+        return
+    for batch in reader:
+        yield from func(_from_arrow(batch)).to_arrow().to_batches()
+
+
+def run_arrow_reader(
+    plan: T_PLAN,
+    reader: "pa.RecordBatchReader",
+) -> "pa.RecordBatchReader":
+    """
+    Run a plan on a ``pa.RecordBatchReader`` lazily, and give back the result
+    as a ``pa.RecordBatchReader``. The batches are processed when the returned
+    reader is read, see :func:`iter_arrow_batches`.
+    """
+    pa = _import_pyarrow()
+    # the output schema is the result of the plan on an empty input
+    schema = run_arrow(plan, reader.schema.empty_table()).schema
+    batches = (
+        batch.cast(schema) if batch.schema != schema else batch
+        for batch in iter_arrow_batches(plan, reader)
+    )
+    return pa.RecordBatchReader.from_batches(schema, batches)
@@ -9,15 +9,23 @@ import enum
 import dataclasses
 
 import polars as pl
-from .model import BaseModel
-from .base_expr import BaseExpr
+from .model import (
+    T_INTERN_TABLE,
+    BaseModel,
+    slotted,
+    node_klass_mappings,
+    decode,
+)
 
-from .exc import ParamError
-from .arg import REQ, rm_na, T_KWARGS
+from .exc import LazyFrameNotSupportedError
+from .arg import REQ
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .dfop.api import T_DFOP
 
+# ``to_polars`` returns the same kind of frame as the input frame.
+T_FRAME = T.TypeVar("T_FRAME", pl.DataFrame, pl.LazyFrame)
+
 
 class DfopEnum(str, enum.Enum):
     """ """
@@ -129,65 +137,100 @@ class DfopEnum(str, enum.Enum):
     # Miscellaneous
     # Plot
     # Style
-
-
-def to_dict(inst) -> "T_KWARGS":
+    # Plan
+    pipeline = "pipeline"
+    # Input
+    scan_csv = "scan_csv"
+    scan_ipc = "scan_ipc"
+    scan_ndjson = "scan_ndjson"
+    scan_parquet = "scan_parquet"
+    # Output
+    sink_csv = "sink_csv"
+    sink_ipc = "sink_ipc"
+    sink_ndjson = "sink_ndjson"
+    sink_parquet = "sink_parquet"
+    sink_partitioned_parquet = "sink_partitioned_parquet"
+
+
+@slotted
+@dataclasses.dataclass
+class BaseDfop(BaseModel):
     """
-    Convert an instance of ``BaseExpr`` to a dict. This dict can be used in
-    ``BaseExpr.from_dict`` method to create a identical instance of the original
-    ``BaseExpr`` instance.
+    Base class of all DataFrame operations.
+
+    The ``to_polars`` method works in dual mode. Passing a ``pl.DataFrame``
+    gives back a ``pl.DataFrame``, passing a ``pl.LazyFrame`` gives back a
+    ``pl.LazyFrame`` without materializing any data. Subclasses wrapping a
+    polars method that only exists on the eager ``pl.DataFrame`` should set
+    ``lazy_supported = False`` and call :meth:`ensure_eager` in ``to_polars``.
+
+    Subclasses that the polars streaming engine cannot execute batch by batch
+    should set ``streaming_supported = False``, see :mod:`jsonpolars.streaming`.
+    Subclasses whose output rows only depend on the input row at the same
+    position set ``row_local = True``, see :mod:`jsonpolars.slices`.
+
+    Source dfops set ``is_source = True``, see :mod:`jsonpolars.dfop.io`.
+    They start a plan from files and can only be the first dfop of a plan.
+    The content of the input frame is ignored, but ``to_polars`` keeps the
+    dual mode contract: ``None`` or a ``pl.LazyFrame`` gives back the lazy
+    scan, a ``pl.DataFrame`` gives back the collected ``pl.DataFrame``.
+
+    Sink dfops set ``is_sink = True``, they can only be the last dfop of a
+    plan. ``to_polars`` writes the frame and gives back the input frame, so a
+    sink keeps the dual mode contract. To write the result of a plan without
+    collecting it into the memory, use the terminal
+    :meth:`jsonpolars.dfop.pipeline.Pipeline.sink` method, or
+    :func:`jsonpolars.streaming.run_streaming`.
     """
-    if isinstance(inst, BaseExpr):
-        return inst.to_dict()
-    elif isinstance(inst, (tuple, list)):
-        return type(inst)([to_dict(v) for v in inst])
-    elif isinstance(inst, dict):
-        kwargs = {k: to_dict(v) for k, v in inst.items()}
-        return rm_na(**kwargs)
-    else:
-        return inst
-
 
-@dataclasses.dataclass
-class BaseDfop(BaseModel):
     type: str = dataclasses.field(default=REQ)
 
-    def _validate(self):
-        for field in dataclasses.fields(self.__class__):
-            if field.init:
-                k = field.name
-                if getattr(self, k) is REQ:  # pragma: no cover
-                    raise ParamError(f"Field {k!r} is required for {self.__class__}.")
-
-    def __post_init__(self):
-        self._validate()
-
-    def to_dict(self) -> T_KWARGS:
-        kwargs = dict()
-        for field in dataclasses.fields(self.__class__):
-            value = getattr(self, field.name)
-            kwargs[field.name] = to_dict(value)
-        return rm_na(**kwargs)
-
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
+    lazy_supported: T.ClassVar[bool] = True
+    streaming_supported: T.ClassVar[bool] = True
+    is_source: T.ClassVar[bool] = False
+    is_sink: T.ClassVar[bool] = False
+    row_local: T.ClassVar[bool] = False
+
+    def ensure_eager(self, df: T.Union[pl.DataFrame, pl.LazyFrame]):
+        """
+        Raise :class:`~jsonpolars.exc.LazyFrameNotSupportedError` instead of
+        silently collecting a ``pl.LazyFrame``.
+        """
+        if isinstance(df, pl.LazyFrame):
+            raise LazyFrameNotSupportedError(
+                f"{self.__class__.__name__} ({self.type!r}) cannot be applied "
+                f"on a pl.LazyFrame, collect it first."
+            )
+
+    def compile(self) -> T.Callable[[T_FRAME], T_FRAME]:
         """
-        Create an instance of ``BaseExpr`` from either a human created dict,
-        or a dict created by the ``BaseExpr.to_dict`` method.
+        Translate this dfop into a callable that applies it on a frame.
+
+        The default implementation binds ``to_polars``. Dfops that hold
+        expressions override it to lower the expressions to ``pl.Expr`` only
+        once, so the callable can be cached and reused, see
+        :mod:`jsonpolars.cache`.
         """
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
+        return self.to_polars
 
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
         raise NotImplementedError()
 
 
 dfop_enum_to_klass_mapping: T.Dict[str, T.Type["T_DFOP"]] = dict()
 
 
-def parse_dfop(dct: T.Dict[str, T.Any]) -> "T_DFOP":
+def parse_dfop(
+    dct: T.Dict[str, T.Any],
+    intern: T.Union[bool, T_INTERN_TABLE] = False,
+) -> "T_DFOP":
     """
     Note: you have to import everything in the :mod:`jsonpolars.dfop` module
     to make this work.
+
+    :param intern: opt-in hash-consing, see :func:`jsonpolars.model.decode`.
     """
-    return dfop_enum_to_klass_mapping[dct["type"]].from_dict(dct)
+    return decode(dct, "dfop", intern=intern)
+
+
+node_klass_mappings["dfop"] = dfop_enum_to_klass_mapping
@@ -2,12 +2,22 @@
 
 import typing as T
 import enum
+import functools
+import contextlib
+import contextvars
 import dataclasses
 
 import polars as pl
 
-from .arg import REQ, rm_na, T_KWARGS
-from .model import BaseModel
+from .arg import REQ
+from .model import (
+    T_INTERN_TABLE,
+    BaseModel,
+    slotted,
+    node_klass_mappings,
+    decode,
+    iter_post_order,
+)
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .expr.api import T_EXPR
@@ -379,42 +389,95 @@ class ExprEnum(str, enum.Enum):
     # Window
 
 
-def to_dict(inst) -> T_KWARGS:
+# maps ``id`` of a ``BaseExpr`` to the node and its ``pl.Expr`` while a tree
+# is lowered. The node is kept alive, so that its ``id`` is not reused.
+T_LOWERED = T.Dict[int, T.Tuple["BaseExpr", pl.Expr]]
+
+_lowered: "contextvars.ContextVar[T.Optional[T_LOWERED]]" = (
+    contextvars.ContextVar("_lowered", default=None)
+)
+
+
+def _lower_descendants(root: "BaseExpr", lowered: T_LOWERED):
+    for node in iter_post_order(root, lambda node: id(node) in lowered):
+        if node is not root and isinstance(node, BaseExpr):
+            to_polars = node.__class__.to_polars
+            to_polars = getattr(to_polars, "__wrapped__", to_polars)
+            lowered[id(node)] = (node, to_polars(node))
+
+
+@contextlib.contextmanager
+def lowering_scope():
     """
-    Convert an instance of ``BaseExpr`` to a dict. This dict can be used in
-    ``BaseExpr.from_dict`` method to create a identical instance of the original
-    ``BaseExpr`` instance.
+    Within this context, each ``BaseExpr`` instance is lowered to ``pl.Expr``
+    only once, even across many ``to_polars`` calls. It is useful to lower
+    many expressions that share sub trees, for example the ones parsed with
+    ``parse_expr(..., intern=True)``.
+    """
+    if _lowered.get() is not None:
+        yield
+        return
+    token = _lowered.set(dict())
+    try:
+        yield
+    finally:
+        _lowered.reset(token)
+
+
+def _lower_iteratively(to_polars: T.Callable[["BaseExpr"], pl.Expr]):
+    """
+    Wrap the ``to_polars`` method of a ``BaseExpr`` subclass, so that lowering
+    a tree of any depth doesn't recurse.
+
+    The outermost call lowers all descendant nodes in post order first. When
+    a node calls ``to_polars`` of its child, the result is already memoized,
+    so each call only goes one level deep. A node shared by many parents is
+    lowered only once.
     """
-    if isinstance(inst, BaseExpr):
-        return inst.to_dict()
-    elif isinstance(inst, (tuple, list)):
-        return type(inst)([to_dict(v) for v in inst])
-    elif isinstance(inst, dict):
-        kwargs = {k: to_dict(v) for k, v in inst.items()}
-        return rm_na(**kwargs)
-    else:
-        return inst
+    if getattr(to_polars, "_is_lower_iteratively", False):
+        return to_polars
 
+    @functools.wraps(to_polars)
+    def wrapper(self: "BaseExpr") -> pl.Expr:
+        lowered = _lowered.get()
+        if lowered is None:
+            with lowering_scope():
+                return wrapper(self)
+        try:
+            return lowered[id(self)][1]
+        except KeyError:
+            pass
+        _lower_descendants(self, lowered)
+        expr = to_polars(self)
+        # a subclass may call this method via ``super()``, only memoize the
+        # result of the most derived implementation
+        if self.__class__.to_polars is wrapper:
+            lowered[id(self)] = (self, expr)
+        return expr
 
+    wrapper._is_lower_iteratively = True
+    return wrapper
+
+
+@slotted
 @dataclasses.dataclass
 class BaseExpr(BaseModel):
+    """
+    Base class of all expressions.
+
+    Subclasses that aggregate a column, so that an output row depends on
+    other rows of the input, should set ``row_local = False``, see
+    :mod:`jsonpolars.slices`.
+    """
+
     type: str = dataclasses.field(default=REQ)
 
-    def to_dict(self) -> T_KWARGS:
-        kwargs = dict()
-        for field in dataclasses.fields(self.__class__):
-            value = getattr(self, field.name)
-            kwargs[field.name] = to_dict(value)
-        return rm_na(**kwargs)
-
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        """
-        Create an instance of ``BaseExpr`` from either a human created dict,
-        or a dict created by the ``BaseExpr.to_dict`` method.
-        """
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
+    row_local: T.ClassVar[bool] = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "to_polars" in cls.__dict__:
+            cls.to_polars = _lower_iteratively(cls.__dict__["to_polars"])
 
     def to_polars(self) -> pl.Expr:
         raise NotImplementedError()
@@ -423,9 +486,17 @@ class BaseExpr(BaseModel):
 expr_enum_to_klass_mapping: T.Dict[str, T.Type["T_EXPR"]] = dict()
 
 
-def parse_expr(dct: T.Dict[str, T.Any]) -> "T_EXPR":
+def parse_expr(
+    dct: T.Dict[str, T.Any],
+    intern: T.Union[bool, T_INTERN_TABLE] = False,
+) -> "T_EXPR":
     """
     Note: you have to import everything in the :mod:`jsonpolars.expr` module
     to make this work.
+
+    :param intern: opt-in hash-consing, see :func:`jsonpolars.model.decode`.
     """
-    return expr_enum_to_klass_mapping[dct["type"]].from_dict(dct)
+    return decode(dct, "expr", intern=intern)
+
+
+node_klass_mappings["expr"] = expr_enum_to_klass_mapping
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run many independent ``(plan, input, output)`` jobs across a process pool.
+
+Each job applies one plan to one input file and writes one output file, the
+source and sink dfops are picked by the file extension, see
+:func:`jsonpolars.cli.build_plan`. The plans are sent to the workers as the
+plain dict form of ``to_dict``, no dataclass object crosses the process
+boundary. Each worker parses a distinct plan only once and keeps it in a
+per-process cache keyed by the fingerprint of the plan dict.
+
+The jobs are submitted one by one, an idle worker picks the next job, so a
+few slow jobs don't hold up the others. A failing job is reported in its
+:class:`JobResult` and doesn't abort the others.
+
+Example::
+
+    >>> from jsonpolars.batch import run_batch
+    >>> res = run_batch(
+    ...     [
+    ...         (plan_a, "in/2024-01-01.parquet", "out/a/2024-01-01.parquet"),
+    ...         (plan_b, "in/2024-01-01.parquet", "out/b/2024-01-01.parquet"),
+    ...     ],
+    ...     workers=8,
+    ... )
+    >>> [job.error for job in res.failed]
+    []
+"""
+
+import typing as T
+import os
+import time
+import dataclasses
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+
+from .cache import CompileCache, fingerprint_data
+from .base_dfop import BaseDfop
+from .utils_dfop import T_PLAN, to_dfop_list
+from .streaming import StreamingPlan
+from .cli import build_plan, _count_output_rows
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .dfop.api import T_DFOP
+
+
+@dataclasses.dataclass
+class JobResult:
+    """
+    :param index: the 0-based index of the job in the job list.
+    :param input: the input path of the job.
+    :param output: the output path of the job.
+    :param rows_out: the number of rows in the result, None if the job failed
+        or the output cannot be read back, for example a partitioned sink.
+    :param seconds: the seconds the job took in the worker.
+    :param pid: the process id of the worker.
+    :param error: the type and the message of the exception, None if the job
+        succeeded.
+    """
+
+    index: int = dataclasses.field()
+    input: T.Optional[str] = dataclasses.field(default=None)
+    output: T.Optional[str] = dataclasses.field(default=None)
+    rows_out: T.Optional[int] = dataclasses.field(default=None)
+    seconds: float = dataclasses.field(default=0.0)
+    pid: T.Optional[int] = dataclasses.field(default=None)
+    error: T.Optional[str] = dataclasses.field(default=None)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass
+class BatchResult:
+    """
+    :param jobs: the result of each job, in the order of the job list.
+    :param seconds: the wall clock seconds of the whole batch.
+    """
+
+    jobs: T.List[JobResult] = dataclasses.field(default_factory=list)
+    seconds: float = dataclasses.field(default=0.0)
+
+    @property
+    def succeeded(self) -> T.List[JobResult]:
+        return [job for job in self.jobs if job.ok]
+
+    @property
+    def failed(self) -> T.List[JobResult]:
+        return [job for job in self.jobs if not job.ok]
+
+
+# the plan dict or list of dicts, the input path, the output path
+T_JOB = T.Tuple[T_PLAN, T.Optional[str], T.Optional[str]]
+T_WIRE_JOB = T.Tuple[int, T.Union[dict, list], T.Optional[str], T.Optional[str]]
+
+#: the parsed plans of the current process, keyed by the plan fingerprint
+plan_cache = CompileCache(maxsize=1024)
+
+
+def _to_wire_plan(plan: T_PLAN) -> T.Union[dict, list]:
+    if isinstance(plan, BaseDfop):
+        return plan.to_dict()
+    if isinstance(plan, (list, tuple)):
+        return [
+            dfop.to_dict() if isinstance(dfop, BaseDfop) else dfop for dfop in plan
+        ]
+    return plan
+
+
+def _get_plan(plan_data: T.Union[dict, list]) -> T.List["T_DFOP"]:
+    key = fingerprint_data(plan_data, kind="dfop")
+    dfops = plan_cache.get(key)
+    if dfops is None:
+        dfops = to_dfop_list(plan_data)
+        plan_cache.set(key, dfops)
+    return dfops
+
+
+def _run_job(job: T_WIRE_JOB) -> JobResult:
+    """
+    Run one job in a worker process.
+    """
+    index, plan_data, input_path, output_path = job
+    result = JobResult(
+        index=index,
+        input=input_path,
+        output=output_path,
+        pid=os.getpid(),
+    )
+    start = time.perf_counter()
+    try:
+        dfops = build_plan(_get_plan(plan_data), input_path, output_path)
+        df = StreamingPlan.from_plan(dfops).collect()
+        if df is None:
+            result.rows_out = _count_output_rows(dfops[-1])
+        else:
+            result.rows_out = df.height
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _finish_job(job: T_WIRE_JOB, future: Future) -> JobResult:
+    try:
+        return future.result()
+    except Exception as e:  # the worker died
+        return JobResult(
+            index=job[0],
+            input=job[2],
+            output=job[3],
+            error=f"{type(e).__name__}: {e}",
+        )
+
+
+def _iter_job_results(
+    wire_jobs: T.Iterable[T_WIRE_JOB],
+    workers: int,
+) -> T.Iterable[JobResult]:
+    if workers <= 1:
+        for job in wire_jobs:
+            yield _run_job(job)
+        return
+    # the workers are spawned instead of forked, a forked child can deadlock
+    # on the polars thread pool of the parent.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        pending: T.Deque[T.Tuple[T_WIRE_JOB, Future]] = deque()
+        for job in wire_jobs:
+            try:
+                future = executor.submit(_run_job, job)
+            except Exception as e:  # the pool is broken
+                future = Future()
+                future.set_exception(e)
+            pending.append((job, future))
+            if len(pending) >= workers * 2:
+                yield _finish_job(*pending.popleft())
+        while pending:
+            yield _finish_job(*pending.popleft())
+
+
+def run_batch(
+    jobs: T.Iterable[T_JOB],
+    workers: T.Optional[int] = None,
+) -> BatchResult:
+    """
+    Run ``(plan, input, output)`` jobs across a process pool.
+
+    :param jobs: the jobs, a plan is a dfop dict, a list of dfop dicts or
+        the ``BaseDfop`` of them. Leave the input None if the plan starts
+        with a source dfop, leave the output None if the plan ends with a
+        sink dfop, or to only count the result rows.
+    :param workers: the number of worker processes, default is the number of
+        CPUs. 0 or 1 runs the jobs in the current process.
+
+    .. note::
+
+        Custom dfop and expression classes must be registered at import time
+        of a module, so the worker processes know them.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    wire_jobs = (
+        (index, _to_wire_plan(plan), input_path, output_path)
+        for index, (plan, input_path, output_path) in enumerate(jobs)
+    )
+    result = BatchResult(jobs=list(_iter_job_results(wire_jobs, workers)))
+    result.seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+
+"""
+A bounded compile cache that maps the canonical fingerprint of a JSON
+expression / dfop straight to the compiled ``pl.Expr`` / dfop callable.
+
+A service that receives the same JSON plans again and again can skip the
+``parse_expr`` -> ``from_dict`` -> ``to_polars`` translation, the compile
+cost drops to a dict lookup.
+
+Example::
+
+    >>> from jsonpolars.cache import compile_expr
+    >>> pl_expr = compile_expr({"type": "column", "name": "a"})
+    >>> pl_expr is compile_expr({"type": "column", "name": "a"})
+    True
+"""
+
+import typing as T
+import json
+import time
+import enum
+import decimal
+import hashlib
+import datetime
+import threading
+import dataclasses
+from collections import OrderedDict
+
+import polars as pl
+
+from .arg import _REQUIRED, _NOTHING, _PRE
+from .model import BaseModel, node_klass_mappings
+from .base_expr import BaseExpr, parse_expr
+from .base_dfop import BaseDfop, parse_dfop
+from .expr import api as _expr_api  # noqa: F401, registers the expr types
+from .dfop import api as _dfop_api  # noqa: F401, registers the dfop types
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .expr.api import T_EXPR
+    from .dfop.api import T_DFOP
+    from .base_dfop import T_FRAME
+
+
+def _canonicalize_value(value: T.Any) -> T.Any:
+    """
+    Keep the key order of every dict, as a list of pairs the key order
+    survives the sorted keys of ``json.dumps``.
+    """
+    if isinstance(value, dict):
+        return {
+            "__ordered__": [[k, _canonicalize_value(v)] for k, v in value.items()]
+        }
+    elif isinstance(value, (list, tuple)):
+        return [_canonicalize_value(v) for v in value]
+    else:
+        return value
+
+
+def _find_klass(
+    dct: T.Dict[str, T.Any],
+    kind: T.Optional[str],
+) -> T.Optional[T.Type[BaseModel]]:
+    type_ = dct.get("type")
+    if not isinstance(type_, str):
+        return None
+    kinds = list(node_klass_mappings) if kind is None else [kind]
+    klasses = {
+        node_klass_mappings[k][type_]
+        for k in kinds
+        if type_ in node_klass_mappings.get(k, {})
+    }
+    # an unknown or an ambiguous type, for example ``filter`` is both a dfop
+    # and an expression
+    if len(klasses) != 1:
+        return None
+    return klasses.pop()
+
+
+def _canonicalize(data: T.Any, kind: T.Optional[str] = None) -> T.Any:
+    """
+    Only the keys of a node dict are sorted, the field order of a node doesn't
+    matter. The key order of a dict field is kept, the model treats it as
+    significant, for example the order of ``named_exprs`` decides the column
+    order of the output DataFrame, and the order of ``FuncStruct.schema``
+    decides the field order of the struct.
+    """
+    if isinstance(data, (list, tuple)):
+        return [_canonicalize(v, kind) for v in data]
+    if not isinstance(data, dict):
+        return data
+    klass = _find_klass(data, kind)
+    if klass is None:
+        return _canonicalize_value(data)
+    spec = klass.get_field_spec()
+    hints = dict(zip(spec.node_names, zip(spec.node_shapes, spec.node_kinds)))
+    dct = dict()
+    for k, v in data.items():
+        if k not in hints:
+            dct[k] = _canonicalize_value(v)
+            continue
+        shape, child_kind = hints[k]
+        if shape == "dict" and isinstance(v, dict):
+            dct[k] = {
+                "__ordered__": [
+                    [kk, _canonicalize(vv, child_kind)] for kk, vv in v.items()
+                ]
+            }
+        else:
+            dct[k] = _canonicalize(v, child_kind)
+    return dct
+
+
+def fingerprint_data(data: T.Any, kind: T.Optional[str] = None) -> str:
+    """
+    Return a canonical fingerprint of a JSON serializable object, in any
+    process. Two node dicts with the same content produce the same
+    fingerprint regardless of the order of their fields, the key order of
+    any other dict is significant.
+
+    :param kind: the kind of the node dicts, ``"expr"`` or ``"dfop"``, None
+        looks up the ``type`` in both.
+    """
+    text = json.dumps(
+        _canonicalize(data, kind),
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=repr,
+    )
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def fingerprint(
+    node: T.Union[dict, "T_EXPR", "T_DFOP"],
+    kind: T.Optional[str] = None,
+) -> str:
+    """
+    Return the canonical fingerprint of a dict, ``BaseExpr`` or ``BaseDfop``.
+
+    .. note::
+
+        A ``BaseExpr`` / ``BaseDfop`` uses its memoized structural
+        fingerprint, see :meth:`jsonpolars.model.BaseModel.fingerprint`.
+        A dict is fingerprinted by its JSON content. So a dict and the object
+        parsed from it are two different cache keys.
+
+    :param kind: the kind of a node dict, see :func:`fingerprint_data`.
+    """
+    if isinstance(node, (BaseExpr, BaseDfop)):
+        return node.fingerprint()
+    return fingerprint_data(node, kind)
+
+
+_CACHEABLE_LEAF_TYPES = (
+    str,
+    int,
+    float,
+    bool,
+    type(None),
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    enum.Enum,
+    pl.DataType,
+    _REQUIRED,
+    _NOTHING,
+    _PRE,
+)
+
+
+def is_cacheable(value: T.Any) -> bool:
+    """
+    Check if the fingerprint of a dict, ``BaseExpr`` or ``BaseDfop`` is a safe
+    cache key. A callable or any other opaque object is fingerprinted by its
+    ``repr``, that includes the memory address. The address can be reused by
+    a new object after the old one is garbage collected, so such values are
+    never cached.
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, BaseModel):
+            spec = value.get_field_spec()
+            stack.extend([getattr(value, name) for name in spec.names])
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, type) and issubclass(value, pl.DataType):
+            continue
+        elif not isinstance(value, _CACHEABLE_LEAF_TYPES):
+            return False
+    return True
+
+
+_MISSING = object()
+
+
+@dataclasses.dataclass
+class CacheInfo:
+    hits: int = dataclasses.field()
+    misses: int = dataclasses.field()
+    maxsize: int = dataclasses.field()
+    currsize: int = dataclasses.field()
+    ttl: T.Optional[float] = dataclasses.field()
+
+
+class CompileCache:
+    """
+    Thread safe LRU cache with optional time-to-live eviction.
+
+    :param maxsize: the maximum number of compiled objects in the cache,
+        the least recently used one is evicted first.
+    :param ttl: seconds since insertion after which an entry is evicted,
+        None means never.
+    :param enabled: set to False to opt out, every call compiles again.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: T.Optional[float] = None,
+        enabled: bool = True,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._data: T.OrderedDict[T.Hashable, T.Tuple[float, T.Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge_expired()
+            return len(self._data)
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and (now - created_at) > self.ttl
+
+    def _purge_expired(self):
+        if self.ttl is None:
+            return
+        now = time.monotonic()
+        expired = [
+            key
+            for key, (created_at, _) in self._data.items()
+            if self._is_expired(created_at, now)
+        ]
+        for key in expired:
+            del self._data[key]
+
+    def get(self, key: T.Hashable, default: T.Any = None) -> T.Any:
+        with self._lock:
+            try:
+                created_at, value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if self._is_expired(created_at, time.monotonic()):
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: T.Hashable, value: T.Any):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            self._purge_expired()
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                maxsize=self.maxsize,
+                currsize=len(self._data),
+                ttl=self.ttl,
+            )
+
+    def _get_or_compile(
+        self,
+        namespace: str,
+        node: T.Any,
+        compile_func: T.Callable[[T.Any], T.Any],
+    ) -> T.Any:
+        if self.enabled is False:
+            return compile_func(node)
+        key = (namespace, fingerprint(node, kind=namespace))
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compile_func(node)
+            # only a cacheable node is ever stored, so a hit is always safe
+            if is_cacheable(node):
+                self.set(key, value)
+        return value
+
+    def compile_expr(self, expr_like: T.Union[dict, "T_EXPR"]) -> pl.Expr:
+        """
+        Get the compiled ``pl.Expr`` of a expression dict or ``BaseExpr``.
+        """
+        return self._get_or_compile("expr", expr_like, _compile_expr)
+
+    def compile_dfop(
+        self,
+        dfop_like: T.Union[dict, "T_DFOP"],
+    ) -> T.Callable[["T_FRAME"], "T_FRAME"]:
+        """
+        Get the compiled callable of a dfop dict or ``BaseDfop``, see
+        :meth:`jsonpolars.base_dfop.BaseDfop.compile`.
+        """
+        return self._get_or_compile("dfop", dfop_like, _compile_dfop)
+
+
+def _compile_expr(expr_like: T.Union[dict, "T_EXPR"]) -> pl.Expr:
+    if isinstance(expr_like, dict):
+        expr_like = parse_expr(expr_like)
+    return expr_like.to_polars()
+
+
+def _compile_dfop(
+    dfop_like: T.Union[dict, "T_DFOP"],
+) -> T.Callable[["T_FRAME"], "T_FRAME"]:
+    if isinstance(dfop_like, dict):
+        dfop_like = parse_dfop(dfop_like)
+    return dfop_like.compile()
+
+
+compile_cache = CompileCache()
+
+
+def compile_expr(
+    expr_like: T.Union[dict, "T_EXPR"],
+    use_cache: bool = True,
+) -> pl.Expr:
+    """
+    Compile a expression dict or ``BaseExpr`` to ``pl.Expr`` using the
+    module level :data:`compile_cache`. Set ``use_cache=False`` to opt out.
+    """
+    if use_cache:
+        return compile_cache.compile_expr(expr_like)
+    return _compile_expr(expr_like)
+
+
+def compile_dfop(
+    dfop_like: T.Union[dict, "T_DFOP"],
+    use_cache: bool = True,
+) -> T.Callable[["T_FRAME"], "T_FRAME"]:
+    """
+    Compile a dfop dict or ``BaseDfop`` to a callable using the module level
+    :data:`compile_cache`. Set ``use_cache=False`` to opt out.
+    """
+    if use_cache:
+        return compile_cache.compile_dfop(dfop_like)
+    return _compile_dfop(dfop_like)
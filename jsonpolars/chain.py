@@ -5,6 +5,8 @@ Allow to use the polars liked chain syntax to create the expression.
 """
 
 import typing as T
+import dataclasses
+
 from .arg import PRE
 
 
@@ -19,13 +21,14 @@ def chain(*args: "T_EXPR") -> "T_EXPR":
     """
     Allow to use the polars liked chain syntax to create the expression.
 
-    The next expression automatically use the previous one as the ``expr`` attribute.
+    The next expression automatically use the previous one as the ``expr`` attribute,
+    a copy of the next expression is created, the arguments are not mutated.
     """
     ex = None
     for arg in args:
         # print(ex, arg)
         if ex is not None:
-            setattr(arg, "expr", ex)
+            arg = dataclasses.replace(arg, expr=ex)
         ex = arg
     # print(ex)
     return ex
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""
+The ``jsonpolars`` command line tool, it runs a JSON plan on files without
+writing any Python code.
+
+Example::
+
+    $ jsonpolars plan.json "data/*.parquet" -o out.parquet --count-rows
+    rows in: 1000000
+    rows out: 1200
+    parse: 0.001s, run: 0.215s, total: 0.216s
+
+The plan file holds a dfop dict, or a list of dfop dicts. The input is
+scanned lazily with a source dfop picked by the file extension, and the
+output is written with a sink dfop without collecting the result, so the
+plan runs on the polars streaming engine when possible.
+
+The rows in, and the rows out of a sink, are only counted with
+``--count-rows``, it scans the input and reads the output back once more.
+Without a sink the rows out are the height of the printed result.
+"""
+
+import typing as T
+import sys
+import json
+import time
+import argparse
+
+import polars as pl
+
+from ._version import __version__
+from .exc import ParamError
+from .utils_dfop import T_PLAN, to_dfop_list
+from .streaming import StreamingPlan
+from .dfop import api as dfop
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .dfop.api import T_DFOP
+
+# file extension -> (source dfop class, sink dfop class)
+file_formats: T.Dict[str, T.Tuple[T.Type["T_DFOP"], T.Type["T_DFOP"]]] = {
+    ".parquet": (dfop.ScanParquet, dfop.SinkParquet),
+    ".csv": (dfop.ScanCsv, dfop.SinkCsv),
+    ".ndjson": (dfop.ScanNdjson, dfop.SinkNdjson),
+    ".jsonl": (dfop.ScanNdjson, dfop.SinkNdjson),
+    ".arrow": (dfop.ScanIpc, dfop.SinkIpc),
+    ".ipc": (dfop.ScanIpc, dfop.SinkIpc),
+    ".feather": (dfop.ScanIpc, dfop.SinkIpc),
+}
+
+
+def _get_file_format(path: str) -> T.Tuple[T.Type["T_DFOP"], T.Type["T_DFOP"]]:
+    for ext, klasses in file_formats.items():
+        if path.lower().endswith(ext):
+            return klasses
+    raise ParamError(
+        f"cannot tell the file format of {path!r}, "
+        f"supported extensions are {list(file_formats)}."
+    )
+
+
+def _count_rows(source: "T_DFOP") -> int:
+    # a parquet / ipc reader answers it from the file metadata
+    return source.to_polars().select(pl.len()).collect().item()
+
+
+def _count_output_rows(sink: "T_DFOP") -> T.Optional[int]:
+    try:
+        scan_klass, _ = _get_file_format(sink.path)
+    except (AttributeError, ParamError):  # for example a partitioned sink
+        return None
+    return _count_rows(scan_klass(source=sink.path))
+
+
+def build_plan(
+    plan_data: T_PLAN,
+    input_path: T.Optional[str] = None,
+    output_path: T.Optional[str] = None,
+) -> T.List["T_DFOP"]:
+    """
+    Parse the plan, prepend the source dfop of the input and append the sink
+    dfop of the output.
+    """
+    dfops = to_dfop_list(plan_data)
+    if input_path is not None:
+        if dfops and dfops[0].is_source:
+            raise ParamError("the plan already starts with a source dfop.")
+        scan_klass, _ = _get_file_format(input_path)
+        dfops.insert(0, scan_klass(source=input_path))
+    if output_path is not None:
+        if dfops and dfops[-1].is_sink:
+            raise ParamError("the plan already ends with a sink dfop.")
+        _, sink_klass = _get_file_format(output_path)
+        dfops.append(sink_klass(path=output_path))
+    if not (dfops and dfops[0].is_source):
+        raise ParamError("an input path is required.")
+    return dfops
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="jsonpolars",
+        description="Run a JSON plan on files.",
+    )
+    parser.add_argument(
+        "plan",
+        help="the JSON file of the plan, a dfop dict or a list of dfop dicts.",
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        help="the input path or glob, optional if the plan starts with a "
+        "source dfop. The format is picked by the file extension.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="the output path, optional if the plan ends with a sink dfop. "
+        "Leave it empty to print the result.",
+    )
+    parser.add_argument(
+        "--no-streaming",
+        action="store_true",
+        help="run the plan on the in-memory engine instead of the streaming "
+        "engine.",
+    )
+    parser.add_argument(
+        "--count-rows",
+        action="store_true",
+        help="count the rows in the input, and the rows in the output of a "
+        "sink. It scans the input and reads the output back once more.",
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    return parser
+
+
+def run(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    with open(args.plan, "r", encoding="utf-8") as f:
+        plan_data = json.load(f)
+    dfops = build_plan(plan_data, input_path=args.input, output_path=args.output)
+    parse_time = time.perf_counter() - start
+
+    source, sink = dfops[0], dfops[-1]
+    if args.count_rows:
+        print(f"rows in: {_count_rows(source)}", file=sys.stderr)
+    start = time.perf_counter()
+    if args.no_streaming:
+        result = dfop.Pipeline(dfops=dfops).to_polars()
+    else:
+        result = StreamingPlan.from_plan(dfops).collect()
+    run_time = time.perf_counter() - start
+
+    rows_out = None
+    if sink.is_sink:
+        if args.count_rows:
+            rows_out = _count_output_rows(sink)
+    else:
+        rows_out = result.height
+        print(result)
+    if rows_out is not None:
+        print(f"rows out: {rows_out}", file=sys.stderr)
+    print(
+        f"parse: {parse_time:.3f}s, "
+        f"run: {run_time:.3f}s, "
+        f"total: {parse_time + run_time:.3f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def main(argv: T.Optional[T.List[str]] = None) -> int:
+    """
+    The entry point of the ``jsonpolars`` console script.
+    """
+    args = make_parser().parse_args(argv)
+    try:
+        return run(args)
+    except (
+        ParamError,
+        KeyError,  # an unknown dfop or expr type
+        OSError,
+        ValueError,
+        pl.exceptions.PolarsError,
+    ) as e:
+        print(f"error: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
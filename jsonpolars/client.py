@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""
+The client of :mod:`jsonpolars.server`.
+
+This module only imports the standard library, so a short lived client
+starts fast. :meth:`PlanClient.run_ipc` sends and receives the raw Arrow
+IPC stream bytes, only :meth:`PlanClient.run` imports polars to convert a
+``pl.DataFrame``.
+
+Example::
+
+    >>> from jsonpolars.client import PlanClient
+    >>> client = PlanClient(port=8765)
+    >>> client.register("top3", [{"type": "head", "n": 3}])
+    >>> body = client.run_ipc("top3", arrow_ipc_stream_bytes)
+"""
+
+import typing as T
+import io
+import json
+import urllib.error
+import urllib.request
+
+from .exc import ParamError
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    import polars as pl
+
+ARROW_STREAM_MIME = "application/vnd.apache.arrow.stream"
+JSON_MIME = "application/json"
+
+
+class PlanClient:
+    """
+    The client of :class:`jsonpolars.server.PlanServer`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        timeout: T.Optional[float] = None,
+    ):
+        self.url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: T.Optional[bytes] = None,
+        content_type: str = JSON_MIME,
+    ) -> bytes:
+        request = urllib.request.Request(
+            self.url + path,
+            data=body,
+            method=method,
+            headers={"Content-Type": content_type},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            error = json.loads(e.read()).get("error")
+            raise ParamError(f"HTTP {e.code}: {error}") from None
+
+    def register(self, plan_id: str, plan: T.Union[dict, list]):
+        self._request("PUT", f"/plans/{plan_id}", json.dumps(plan).encode("utf-8"))
+
+    def unregister(self, plan_id: str):
+        self._request("DELETE", f"/plans/{plan_id}")
+
+    def list_ids(self) -> T.List[str]:
+        return json.loads(self._request("GET", "/plans"))
+
+    def run_ipc(self, plan_id: str, body: bytes = b"") -> bytes:
+        """
+        Run a plan on an Arrow IPC stream, and give back the Arrow IPC stream
+        of the result.
+        """
+        return self._request(
+            "POST", f"/plans/{plan_id}/run", body, content_type=ARROW_STREAM_MIME
+        )
+
+    def run(
+        self,
+        plan_id: str,
+        df: T.Optional["pl.DataFrame"] = None,
+    ) -> "pl.DataFrame":
+        """
+        Run a plan on a ``pl.DataFrame``, polars is imported on the first call.
+        """
+        import polars as pl
+
+        body = b""
+        if df is not None:
+            buffer = io.BytesIO()
+            df.write_ipc_stream(buffer)
+            body = buffer.getvalue()
+        return pl.read_ipc_stream(io.BytesIO(self.run_ipc(plan_id, body)))
@@ -3,10 +3,9 @@
 import typing as T
 import dataclasses
 
-import polars as pl
-
-from ..expr import api as expr
-from ..base_dfop import DfopEnum, BaseDfop, dfop_enum_to_klass_mapping
+from ..expr import api as expr  # noqa: F401, registers the expr types
+from ..model import slotted
+from ..base_dfop import DfopEnum, BaseDfop, dfop_enum_to_klass_mapping, T_FRAME
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .api import T_DFOP
@@ -14,6 +13,7 @@ if T.TYPE_CHECKING:  # pragma: no cover
     from ..typehint import IntoExpr, ColumnNameOrSelector
 
 
+@slotted
 @dataclasses.dataclass
 class Count(BaseDfop):
     """
@@ -22,11 +22,7 @@ class Count(BaseDfop):
 
     type: str = dataclasses.field(default=DfopEnum.count.value)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        return cls()
-
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
         return df.count()
 
 
@@ -9,7 +9,18 @@ from .manipulation import Head
 from .manipulation import Tail
 from .manipulation import Sort
 from .manipulation import DropNulls
+from .manipulation import Filter
 from .aggregation import Count
+from .pipeline import Pipeline
+from .io import ScanParquet
+from .io import ScanCsv
+from .io import ScanNdjson
+from .io import ScanIpc
+from .io import SinkParquet
+from .io import SinkIpc
+from .io import SinkCsv
+from .io import SinkNdjson
+from .io import SinkPartitionedParquet
 
 T_DFOP = T.Union[
     Select,
@@ -20,5 +31,16 @@ T_DFOP = T.Union[
     Tail,
     Sort,
     DropNulls,
+    Filter,
     Count,
+    Pipeline,
+    ScanParquet,
+    ScanCsv,
+    ScanNdjson,
+    ScanIpc,
+    SinkParquet,
+    SinkIpc,
+    SinkCsv,
+    SinkNdjson,
+    SinkPartitionedParquet,
 ]
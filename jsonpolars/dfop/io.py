@@ -0,0 +1,536 @@
+# -*- coding: utf-8 -*-
+
+"""
+Source dfops that start a plan from files with the polars lazy ``pl.scan_*``
+readers. The polars query optimizer pushes the projections and the predicates
+of the rest of the plan into the reader, so only the needed columns and
+row groups are read from the disk.
+
+Example::
+
+    >>> from jsonpolars.dfop import api as dfop
+    >>> plan = dfop.Pipeline(
+    ...     dfops=[
+    ...         dfop.ScanParquet(source="data/*.parquet"),
+    ...         dfop.Select(exprs=["id", "name"]),
+    ...     ]
+    ... )
+    >>> df = plan.to_polars()
+"""
+
+import typing as T
+import dataclasses
+
+import polars as pl
+
+from ..arg import REQ, NA, rm_na
+from ..model import slotted
+from ..utils_expr import str_to_polars_dtype_mapping
+from ..base_dfop import DfopEnum, BaseDfop, dfop_enum_to_klass_mapping
+
+
+def _to_polars_schema_overrides(
+    schema_overrides: T.Dict[str, str],
+) -> T.Dict[str, T.Type["pl.DataType"]]:
+    return {
+        name: str_to_polars_dtype_mapping[dtype]
+        for name, dtype in schema_overrides.items()
+    }
+
+
+@slotted
+@dataclasses.dataclass
+class BaseScan(BaseDfop):
+    """
+    Base class of the source dfops. ``to_polars`` ignores the content of the
+    input frame, ``None`` or a ``pl.LazyFrame`` gives back the lazy scan, a
+    ``pl.DataFrame`` gives back the collected ``pl.DataFrame``.
+    """
+
+    is_source = True
+
+    def scan(self) -> pl.LazyFrame:
+        raise NotImplementedError()
+
+    def to_polars(
+        self,
+        df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]] = None,
+    ) -> T.Union[pl.DataFrame, pl.LazyFrame]:
+        lf = self.scan()
+        if isinstance(df, pl.DataFrame):
+            return lf.collect()
+        return lf
+
+
+@slotted
+@dataclasses.dataclass
+class ScanParquet(BaseScan):
+    """
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.scan_parquet.html
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.scan_parquet.value)
+    source: T.Union[str, T.List[str]] = dataclasses.field(default=REQ)
+    n_rows: int = dataclasses.field(default=NA)
+    row_index_name: str = dataclasses.field(default=NA)
+    row_index_offset: int = dataclasses.field(default=NA)
+    parallel: str = dataclasses.field(default=NA)
+    use_statistics: bool = dataclasses.field(default=NA)
+    hive_partitioning: bool = dataclasses.field(default=NA)
+    glob: bool = dataclasses.field(default=NA)
+    rechunk: bool = dataclasses.field(default=NA)
+    low_memory: bool = dataclasses.field(default=NA)
+    cache: bool = dataclasses.field(default=NA)
+    storage_options: T.Dict[str, T.Any] = dataclasses.field(default=NA)
+    retries: int = dataclasses.field(default=NA)
+    include_file_paths: str = dataclasses.field(default=NA)
+    allow_missing_columns: bool = dataclasses.field(default=NA)
+
+    def scan(self) -> pl.LazyFrame:
+        kwargs = rm_na(
+            n_rows=self.n_rows,
+            row_index_name=self.row_index_name,
+            row_index_offset=self.row_index_offset,
+            parallel=self.parallel,
+            use_statistics=self.use_statistics,
+            hive_partitioning=self.hive_partitioning,
+            glob=self.glob,
+            rechunk=self.rechunk,
+            low_memory=self.low_memory,
+            cache=self.cache,
+            storage_options=self.storage_options,
+            retries=self.retries,
+            include_file_paths=self.include_file_paths,
+            allow_missing_columns=self.allow_missing_columns,
+        )
+        return pl.scan_parquet(self.source, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.scan_parquet.value] = ScanParquet
+
+
+@slotted
+@dataclasses.dataclass
+class ScanCsv(BaseScan):
+    """
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.scan_csv.html
+
+    :param schema_overrides: column name to polars type name mapping, see
+        :class:`~jsonpolars.utils_expr.PolarsTypeNameEnum`.
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.scan_csv.value)
+    source: T.Union[str, T.List[str]] = dataclasses.field(default=REQ)
+    has_header: bool = dataclasses.field(default=NA)
+    separator: str = dataclasses.field(default=NA)
+    comment_prefix: str = dataclasses.field(default=NA)
+    quote_char: str = dataclasses.field(default=NA)
+    skip_rows: int = dataclasses.field(default=NA)
+    schema_overrides: T.Dict[str, str] = dataclasses.field(default=NA)
+    null_values: T.Union[str, T.List[str], T.Dict[str, str]] = dataclasses.field(
+        default=NA
+    )
+    ignore_errors: bool = dataclasses.field(default=NA)
+    cache: bool = dataclasses.field(default=NA)
+    infer_schema_length: int = dataclasses.field(default=NA)
+    n_rows: int = dataclasses.field(default=NA)
+    encoding: str = dataclasses.field(default=NA)
+    low_memory: bool = dataclasses.field(default=NA)
+    rechunk: bool = dataclasses.field(default=NA)
+    skip_rows_after_header: int = dataclasses.field(default=NA)
+    row_index_name: str = dataclasses.field(default=NA)
+    row_index_offset: int = dataclasses.field(default=NA)
+    try_parse_dates: bool = dataclasses.field(default=NA)
+    eol_char: str = dataclasses.field(default=NA)
+    new_columns: T.List[str] = dataclasses.field(default=NA)
+    raise_if_empty: bool = dataclasses.field(default=NA)
+    truncate_ragged_lines: bool = dataclasses.field(default=NA)
+    decimal_comma: bool = dataclasses.field(default=NA)
+    glob: bool = dataclasses.field(default=NA)
+
+    def scan(self) -> pl.LazyFrame:
+        kwargs = rm_na(
+            has_header=self.has_header,
+            separator=self.separator,
+            comment_prefix=self.comment_prefix,
+            quote_char=self.quote_char,
+            skip_rows=self.skip_rows,
+            null_values=self.null_values,
+            ignore_errors=self.ignore_errors,
+            cache=self.cache,
+            infer_schema_length=self.infer_schema_length,
+            n_rows=self.n_rows,
+            encoding=self.encoding,
+            low_memory=self.low_memory,
+            rechunk=self.rechunk,
+            skip_rows_after_header=self.skip_rows_after_header,
+            row_index_name=self.row_index_name,
+            row_index_offset=self.row_index_offset,
+            try_parse_dates=self.try_parse_dates,
+            eol_char=self.eol_char,
+            new_columns=self.new_columns,
+            raise_if_empty=self.raise_if_empty,
+            truncate_ragged_lines=self.truncate_ragged_lines,
+            decimal_comma=self.decimal_comma,
+            glob=self.glob,
+        )
+        if isinstance(self.schema_overrides, dict):
+            kwargs["schema_overrides"] = _to_polars_schema_overrides(
+                self.schema_overrides
+            )
+        return pl.scan_csv(self.source, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.scan_csv.value] = ScanCsv
+
+
+@slotted
+@dataclasses.dataclass
+class ScanNdjson(BaseScan):
+    """
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.scan_ndjson.html
+
+    :param schema_overrides: column name to polars type name mapping, see
+        :class:`~jsonpolars.utils_expr.PolarsTypeNameEnum`.
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.scan_ndjson.value)
+    source: T.Union[str, T.List[str]] = dataclasses.field(default=REQ)
+    schema_overrides: T.Dict[str, str] = dataclasses.field(default=NA)
+    infer_schema_length: int = dataclasses.field(default=NA)
+    batch_size: int = dataclasses.field(default=NA)
+    n_rows: int = dataclasses.field(default=NA)
+    low_memory: bool = dataclasses.field(default=NA)
+    rechunk: bool = dataclasses.field(default=NA)
+    row_index_name: str = dataclasses.field(default=NA)
+    row_index_offset: int = dataclasses.field(default=NA)
+    ignore_errors: bool = dataclasses.field(default=NA)
+
+    def scan(self) -> pl.LazyFrame:
+        kwargs = rm_na(
+            infer_schema_length=self.infer_schema_length,
+            batch_size=self.batch_size,
+            n_rows=self.n_rows,
+            low_memory=self.low_memory,
+            rechunk=self.rechunk,
+            row_index_name=self.row_index_name,
+            row_index_offset=self.row_index_offset,
+            ignore_errors=self.ignore_errors,
+        )
+        if isinstance(self.schema_overrides, dict):
+            kwargs["schema_overrides"] = _to_polars_schema_overrides(
+                self.schema_overrides
+            )
+        return pl.scan_ndjson(self.source, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.scan_ndjson.value] = ScanNdjson
+
+
+@slotted
+@dataclasses.dataclass
+class ScanIpc(BaseScan):
+    """
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.scan_ipc.html
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.scan_ipc.value)
+    source: T.Union[str, T.List[str]] = dataclasses.field(default=REQ)
+    n_rows: int = dataclasses.field(default=NA)
+    cache: bool = dataclasses.field(default=NA)
+    rechunk: bool = dataclasses.field(default=NA)
+    row_index_name: str = dataclasses.field(default=NA)
+    row_index_offset: int = dataclasses.field(default=NA)
+    storage_options: T.Dict[str, T.Any] = dataclasses.field(default=NA)
+    hive_partitioning: bool = dataclasses.field(default=NA)
+    include_file_paths: str = dataclasses.field(default=NA)
+
+    def scan(self) -> pl.LazyFrame:
+        kwargs = rm_na(
+            n_rows=self.n_rows,
+            cache=self.cache,
+            rechunk=self.rechunk,
+            row_index_name=self.row_index_name,
+            row_index_offset=self.row_index_offset,
+            storage_options=self.storage_options,
+            hive_partitioning=self.hive_partitioning,
+            include_file_paths=self.include_file_paths,
+        )
+        return pl.scan_ipc(self.source, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.scan_ipc.value] = ScanIpc
+
+
+@slotted
+@dataclasses.dataclass
+class BaseSink(BaseDfop):
+    """
+    Base class of the sink dfops. :meth:`sink` writes a ``pl.LazyFrame`` with
+    ``pl.LazyFrame.sink_*`` without collecting it into the memory.
+    ``to_polars`` writes the input frame and gives it back unchanged, a
+    ``pl.DataFrame`` input is written via ``df.lazy()``.
+    """
+
+    is_sink = True
+
+    def sink(self, lf: pl.LazyFrame):
+        raise NotImplementedError()
+
+    def to_polars(
+        self,
+        df: T.Union[pl.DataFrame, pl.LazyFrame],
+    ) -> T.Union[pl.DataFrame, pl.LazyFrame]:
+        self.sink(df.lazy())
+        return df
+
+
+@slotted
+@dataclasses.dataclass
+class SinkParquet(BaseSink):
+    """
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.LazyFrame.sink_parquet.html
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.sink_parquet.value)
+    path: str = dataclasses.field(default=REQ)
+    compression: str = dataclasses.field(default=NA)
+    compression_level: int = dataclasses.field(default=NA)
+    statistics: T.Union[bool, str, T.Dict[str, bool]] = dataclasses.field(
+        default=NA
+    )
+    row_group_size: int = dataclasses.field(default=NA)
+    data_page_size: int = dataclasses.field(default=NA)
+    maintain_order: bool = dataclasses.field(default=NA)
+    storage_options: T.Dict[str, T.Any] = dataclasses.field(default=NA)
+    retries: int = dataclasses.field(default=NA)
+    mkdir: bool = dataclasses.field(default=NA)
+
+    def sink(self, lf: pl.LazyFrame):
+        kwargs = rm_na(
+            compression=self.compression,
+            compression_level=self.compression_level,
+            statistics=self.statistics,
+            row_group_size=self.row_group_size,
+            data_page_size=self.data_page_size,
+            maintain_order=self.maintain_order,
+            storage_options=self.storage_options,
+            retries=self.retries,
+            mkdir=self.mkdir,
+        )
+        lf.sink_parquet(self.path, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.sink_parquet.value] = SinkParquet
+
+
+def _to_partition(
+    path: str,
+    partition_by: T.List[str],
+    include_key: T.Optional[bool],
+    max_rows_per_file: T.Optional[int],
+) -> T.Optional[T.Any]:
+    """
+    Create the partitioned sink target of the installed polars version, or
+    None if it doesn't support partitioned sinks.
+    """
+    if hasattr(pl, "PartitionBy"):
+        kwargs = rm_na(include_key=include_key, max_rows_per_file=max_rows_per_file)
+        return pl.PartitionBy(path, key=partition_by, **kwargs)
+    # the older name of the partitioned sink target
+    if hasattr(pl, "PartitionByKey"):  # pragma: no cover
+        kwargs = rm_na(include_key=include_key)
+        return pl.PartitionByKey(path, by=partition_by, **kwargs)
+    return None  # pragma: no cover
+
+
+@slotted
+@dataclasses.dataclass
+class SinkPartitionedParquet(BaseSink):
+    """
+    Write the frame as hive-style partitioned Parquet files, for example
+    ``{path}/region=us/date=2024-01-01/00000000.parquet``. The streaming
+    engine routes each batch to the writer of its partition, the whole frame
+    is never collected into the memory.
+
+    Read it back with ``ScanParquet(source="{path}/**/*.parquet",
+    hive_partitioning=True)``.
+
+    :param path: the base directory of the partitions.
+    :param partition_by: the columns to partition by, in the directory order.
+    :param include_key: if True, the partition columns are also written into
+        the files.
+    :param max_rows_per_file: the maximum number of rows per file, a large
+        partition is split into many files.
+
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.LazyFrame.sink_parquet.html
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.sink_partitioned_parquet.value)
+    path: str = dataclasses.field(default=REQ)
+    partition_by: T.List[str] = dataclasses.field(default=REQ)
+    include_key: bool = dataclasses.field(default=NA)
+    max_rows_per_file: int = dataclasses.field(default=NA)
+    compression: str = dataclasses.field(default=NA)
+    compression_level: int = dataclasses.field(default=NA)
+    statistics: T.Union[bool, str, T.Dict[str, bool]] = dataclasses.field(
+        default=NA
+    )
+    row_group_size: int = dataclasses.field(default=NA)
+    data_page_size: int = dataclasses.field(default=NA)
+    maintain_order: bool = dataclasses.field(default=NA)
+    storage_options: T.Dict[str, T.Any] = dataclasses.field(default=NA)
+    retries: int = dataclasses.field(default=NA)
+    mkdir: bool = dataclasses.field(default=NA)
+
+    def sink(self, lf: pl.LazyFrame):
+        kwargs = rm_na(
+            compression=self.compression,
+            compression_level=self.compression_level,
+            statistics=self.statistics,
+            row_group_size=self.row_group_size,
+            data_page_size=self.data_page_size,
+            storage_options=self.storage_options,
+            retries=self.retries,
+        )
+        partition = _to_partition(
+            self.path,
+            self.partition_by,
+            self.include_key,
+            self.max_rows_per_file,
+        )
+        if partition is None:  # pragma: no cover
+            # old polars without partitioned sinks, write the partitions from
+            # the collected frame
+            lf.collect().write_parquet(
+                self.path,
+                partition_by=self.partition_by,
+                **kwargs,
+            )
+            return
+        kwargs.update(rm_na(maintain_order=self.maintain_order, mkdir=self.mkdir))
+        lf.sink_parquet(partition, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.sink_partitioned_parquet.value] = (
+    SinkPartitionedParquet
+)
+
+
+@slotted
+@dataclasses.dataclass
+class SinkIpc(BaseSink):
+    """
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.LazyFrame.sink_ipc.html
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.sink_ipc.value)
+    path: str = dataclasses.field(default=REQ)
+    compression: str = dataclasses.field(default=NA)
+    record_batch_size: int = dataclasses.field(default=NA)
+    maintain_order: bool = dataclasses.field(default=NA)
+    storage_options: T.Dict[str, T.Any] = dataclasses.field(default=NA)
+    retries: int = dataclasses.field(default=NA)
+    mkdir: bool = dataclasses.field(default=NA)
+
+    def sink(self, lf: pl.LazyFrame):
+        kwargs = rm_na(
+            compression=self.compression,
+            record_batch_size=self.record_batch_size,
+            maintain_order=self.maintain_order,
+            storage_options=self.storage_options,
+            retries=self.retries,
+            mkdir=self.mkdir,
+        )
+        lf.sink_ipc(self.path, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.sink_ipc.value] = SinkIpc
+
+
+@slotted
+@dataclasses.dataclass
+class SinkCsv(BaseSink):
+    """
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.LazyFrame.sink_csv.html
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.sink_csv.value)
+    path: str = dataclasses.field(default=REQ)
+    include_bom: bool = dataclasses.field(default=NA)
+    include_header: bool = dataclasses.field(default=NA)
+    separator: str = dataclasses.field(default=NA)
+    line_terminator: str = dataclasses.field(default=NA)
+    quote_char: str = dataclasses.field(default=NA)
+    batch_size: int = dataclasses.field(default=NA)
+    datetime_format: str = dataclasses.field(default=NA)
+    date_format: str = dataclasses.field(default=NA)
+    time_format: str = dataclasses.field(default=NA)
+    float_scientific: bool = dataclasses.field(default=NA)
+    float_precision: int = dataclasses.field(default=NA)
+    null_value: str = dataclasses.field(default=NA)
+    quote_style: str = dataclasses.field(default=NA)
+    compression: str = dataclasses.field(default=NA)
+    compression_level: int = dataclasses.field(default=NA)
+    maintain_order: bool = dataclasses.field(default=NA)
+    storage_options: T.Dict[str, T.Any] = dataclasses.field(default=NA)
+    retries: int = dataclasses.field(default=NA)
+    mkdir: bool = dataclasses.field(default=NA)
+
+    def sink(self, lf: pl.LazyFrame):
+        kwargs = rm_na(
+            include_bom=self.include_bom,
+            include_header=self.include_header,
+            separator=self.separator,
+            line_terminator=self.line_terminator,
+            quote_char=self.quote_char,
+            batch_size=self.batch_size,
+            datetime_format=self.datetime_format,
+            date_format=self.date_format,
+            time_format=self.time_format,
+            float_scientific=self.float_scientific,
+            float_precision=self.float_precision,
+            null_value=self.null_value,
+            quote_style=self.quote_style,
+            compression=self.compression,
+            compression_level=self.compression_level,
+            maintain_order=self.maintain_order,
+            storage_options=self.storage_options,
+            retries=self.retries,
+            mkdir=self.mkdir,
+        )
+        lf.sink_csv(self.path, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.sink_csv.value] = SinkCsv
+
+
+@slotted
+@dataclasses.dataclass
+class SinkNdjson(BaseSink):
+    """
+    Ref: https://docs.pola.rs/api/python/stable/reference/api/polars.LazyFrame.sink_ndjson.html
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.sink_ndjson.value)
+    path: str = dataclasses.field(default=REQ)
+    compression: str = dataclasses.field(default=NA)
+    compression_level: int = dataclasses.field(default=NA)
+    maintain_order: bool = dataclasses.field(default=NA)
+    storage_options: T.Dict[str, T.Any] = dataclasses.field(default=NA)
+    retries: int = dataclasses.field(default=NA)
+    mkdir: bool = dataclasses.field(default=NA)
+
+    def sink(self, lf: pl.LazyFrame):
+        kwargs = rm_na(
+            compression=self.compression,
+            compression_level=self.compression_level,
+            maintain_order=self.maintain_order,
+            storage_options=self.storage_options,
+            retries=self.retries,
+            mkdir=self.mkdir,
+        )
+        lf.sink_ndjson(self.path, **kwargs)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.sink_ndjson.value] = SinkNdjson
@@ -3,23 +3,21 @@
 import typing as T
 import dataclasses
 
-import polars as pl
-
-from ..arg import REQ, NA, rm_na, T_KWARGS
+from ..arg import REQ, NA, rm_na
+from ..model import slotted
 from ..utils_expr import (
-    batch_to_jsonpolars_into_exprs,
-    batch_to_jsonpolars_named_into_exprs,
     batch_to_polars_into_exprs,
     batch_to_polars_named_into_exprs,
 )
-from ..base_dfop import DfopEnum, BaseDfop, dfop_enum_to_klass_mapping
+from ..base_dfop import DfopEnum, BaseDfop, dfop_enum_to_klass_mapping, T_FRAME
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .api import T_DFOP
     from ..expr.api import T_EXPR
-    from ..typehint import IntoExpr, ColumnNameOrSelector
+    from ..typehint import IntoExpr, IntoExprColumn, ColumnNameOrSelector
 
 
+@slotted
 @dataclasses.dataclass
 class Select(BaseDfop):
     """
@@ -30,25 +28,25 @@ class Select(BaseDfop):
     exprs: T.List["IntoExpr"] = dataclasses.field(default_factory=list)
     named_exprs: T.Dict[str, "IntoExpr"] = dataclasses.field(default_factory=dict)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            exprs=batch_to_jsonpolars_into_exprs(dct.get("exprs", list())),
-            named_exprs=batch_to_jsonpolars_named_into_exprs(
-                dct.get("named_exprs", dict())
-            ),
-        )
+    row_local = True
 
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
-        return df.select(
-            *batch_to_polars_into_exprs(self.exprs),
-            **batch_to_polars_named_into_exprs(self.named_exprs),
-        )
+    def compile(self) -> T.Callable[[T_FRAME], T_FRAME]:
+        exprs = batch_to_polars_into_exprs(self.exprs)
+        named_exprs = batch_to_polars_named_into_exprs(self.named_exprs)
+
+        def select(df: T_FRAME) -> T_FRAME:
+            return df.select(*exprs, **named_exprs)
+
+        return select
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
+        return self.compile()(df)
 
 
 dfop_enum_to_klass_mapping[DfopEnum.select.value] = Select
 
 
+@slotted
 @dataclasses.dataclass
 class Rename(BaseDfop):
     """
@@ -60,13 +58,16 @@ class Rename(BaseDfop):
         default=REQ
     )
 
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
+    row_local = True
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
         return df.rename(self.mapping)
 
 
 dfop_enum_to_klass_mapping[DfopEnum.rename.value] = Rename
 
 
+@slotted
 @dataclasses.dataclass
 class Drop(BaseDfop):
     """
@@ -77,27 +78,25 @@ class Drop(BaseDfop):
     columns: T.List["ColumnNameOrSelector"] = dataclasses.field(default=REQ)
     strict: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        return cls(
-            columns=batch_to_jsonpolars_into_exprs(dct["columns"]),
-            **rm_na(
-                strict=dct.get("strict", NA),
-            ),
-        )
+    row_local = True
 
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
-        return df.drop(
-            *batch_to_polars_into_exprs(self.columns),
-            **rm_na(
-                strict=self.strict,
-            ),
-        )
+    def compile(self) -> T.Callable[[T_FRAME], T_FRAME]:
+        columns = batch_to_polars_into_exprs(self.columns)
+        kwargs = rm_na(strict=self.strict)
+
+        def drop(df: T_FRAME) -> T_FRAME:
+            return df.drop(*columns, **kwargs)
+
+        return drop
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
+        return self.compile()(df)
 
 
 dfop_enum_to_klass_mapping[DfopEnum.drop.value] = Drop
 
 
+@slotted
 @dataclasses.dataclass
 class WithColumns(BaseDfop):
     """
@@ -108,25 +107,25 @@ class WithColumns(BaseDfop):
     exprs: T.List["IntoExpr"] = dataclasses.field(default_factory=list)
     named_exprs: T.Dict[str, "IntoExpr"] = dataclasses.field(default_factory=dict)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            exprs=batch_to_jsonpolars_into_exprs(dct.get("exprs", list())),
-            named_exprs=batch_to_jsonpolars_named_into_exprs(
-                dct.get("named_exprs", dict())
-            ),
-        )
+    row_local = True
 
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
-        return df.with_columns(
-            *batch_to_polars_into_exprs(self.exprs),
-            **batch_to_polars_named_into_exprs(self.named_exprs),
-        )
+    def compile(self) -> T.Callable[[T_FRAME], T_FRAME]:
+        exprs = batch_to_polars_into_exprs(self.exprs)
+        named_exprs = batch_to_polars_named_into_exprs(self.named_exprs)
+
+        def with_columns(df: T_FRAME) -> T_FRAME:
+            return df.with_columns(*exprs, **named_exprs)
+
+        return with_columns
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
+        return self.compile()(df)
 
 
 dfop_enum_to_klass_mapping[DfopEnum.with_columns.value] = WithColumns
 
 
+@slotted
 @dataclasses.dataclass
 class Head(BaseDfop):
     """
@@ -136,13 +135,14 @@ class Head(BaseDfop):
     type: str = dataclasses.field(default=DfopEnum.head.value)
     n: int = dataclasses.field(default=NA)
 
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
         return df.head(**rm_na(n=self.n))
 
 
 dfop_enum_to_klass_mapping[DfopEnum.head.value] = Head
 
 
+@slotted
 @dataclasses.dataclass
 class Tail(BaseDfop):
     """
@@ -152,13 +152,17 @@ class Tail(BaseDfop):
     type: str = dataclasses.field(default=DfopEnum.tail.value)
     n: int = dataclasses.field(default=NA)
 
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
+    # tail has to see the end of the input before it can emit any row
+    streaming_supported = False
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
         return df.tail(**rm_na(n=self.n))
 
 
 dfop_enum_to_klass_mapping[DfopEnum.tail.value] = Tail
 
 
+@slotted
 @dataclasses.dataclass
 class Sort(BaseDfop):
     """
@@ -172,29 +176,28 @@ class Sort(BaseDfop):
     multithreaded: bool = dataclasses.field(default=NA)
     maintain_order: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["by"] = batch_to_jsonpolars_into_exprs(
-            batch_to_jsonpolars_into_exprs(dct["by"])
-        )
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
-        return df.sort(
-            *batch_to_polars_into_exprs(self.by),
-            **rm_na(
-                descending=self.descending,
-                nulls_last=self.nulls_last,
-                multithreaded=self.multithreaded,
-                maintain_order=self.maintain_order,
-            ),
+    def compile(self) -> T.Callable[[T_FRAME], T_FRAME]:
+        by = batch_to_polars_into_exprs(self.by)
+        kwargs = rm_na(
+            descending=self.descending,
+            nulls_last=self.nulls_last,
+            multithreaded=self.multithreaded,
+            maintain_order=self.maintain_order,
         )
 
+        def sort(df: T_FRAME) -> T_FRAME:
+            return df.sort(*by, **kwargs)
+
+        return sort
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
+        return self.compile()(df)
+
 
 dfop_enum_to_klass_mapping[DfopEnum.sort.value] = Sort
 
 
+@slotted
 @dataclasses.dataclass
 class DropNulls(BaseDfop):
     """
@@ -204,18 +207,60 @@ class DropNulls(BaseDfop):
     type: str = dataclasses.field(default=DfopEnum.drop_nulls.value)
     subset: T.List["ColumnNameOrSelector"] = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        if "subset" in opt_kwargs:
-            opt_kwargs["subset"] = batch_to_jsonpolars_into_exprs(opt_kwargs["subset"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
+    row_local = True
 
-    def to_polars(self, df: pl.DataFrame) -> pl.DataFrame:
+    def compile(self) -> T.Callable[[T_FRAME], T_FRAME]:
         kwargs = dict()
         if isinstance(self.subset, list):
             kwargs["subset"] = batch_to_polars_into_exprs(self.subset)
-        return df.drop_nulls(**kwargs)
+
+        def drop_nulls(df: T_FRAME) -> T_FRAME:
+            return df.drop_nulls(**kwargs)
+
+        return drop_nulls
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
+        return self.compile()(df)
 
 
 dfop_enum_to_klass_mapping[DfopEnum.drop_nulls.value] = DropNulls
+
+
+@slotted
+@dataclasses.dataclass
+class Filter(BaseDfop):
+    """
+    Keep the rows where all the predicates are True.
+
+    On a lazy scan, see :mod:`jsonpolars.dfop.io`, polars pushes the
+    predicates down into the reader, the Parquet reader skips the row groups
+    whose statistics cannot match.
+
+    Ref: https://docs.pola.rs/api/python/stable/reference/dataframe/api/polars.DataFrame.filter.html
+
+    :param predicates: the boolean expressions, a ``str`` is the name of a
+        boolean column.
+    :param constraints: ``{"column name": value}``, keep the rows where the
+        column equals the value.
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.filter.value)
+    predicates: T.List["IntoExprColumn"] = dataclasses.field(default_factory=list)
+    constraints: T.Dict[str, T.Any] = dataclasses.field(default_factory=dict)
+
+    row_local = True
+
+    def compile(self) -> T.Callable[[T_FRAME], T_FRAME]:
+        predicates = batch_to_polars_into_exprs(self.predicates)
+        constraints = dict(self.constraints)
+
+        def filter(df: T_FRAME) -> T_FRAME:
+            return df.filter(*predicates, **constraints)
+
+        return filter
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
+        return self.compile()(df)
+
+
+dfop_enum_to_klass_mapping[DfopEnum.filter.value] = Filter
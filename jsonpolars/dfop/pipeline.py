@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+import typing as T
+import dataclasses
+
+import polars as pl
+
+from ..exc import ParamError, LazyFrameNotSupportedError
+from ..model import slotted
+from ..utils_dfop import to_dfop_list
+from ..base_dfop import DfopEnum, BaseDfop, dfop_enum_to_klass_mapping, T_FRAME
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .api import T_DFOP
+
+
+@slotted
+@dataclasses.dataclass
+class Pipeline(BaseDfop):
+    """
+    An ordered list of dfops that is lowered onto one ``pl.LazyFrame`` and
+    collected only once. It allows the polars query optimizer to fuse the
+    projections, push down the predicates and skip the intermediate frames
+    that would be built if we apply each dfop on an eager ``pl.DataFrame``.
+
+    Passing a ``pl.LazyFrame`` to ``to_polars`` gives back the uncollected
+    ``pl.LazyFrame``, so the pipeline can be appended to other lazy queries.
+
+    A pipeline that starts with a source dfop, for example
+    :class:`~jsonpolars.dfop.io.ScanParquet`, doesn't need an input frame,
+    ``to_polars()`` gives back the collected ``pl.DataFrame``. The content of
+    a given input frame is ignored, only its type decides the return type.
+
+    A pipeline that ends with a sink dfop, for example
+    :class:`~jsonpolars.dfop.io.SinkParquet`, is run with the terminal
+    :meth:`sink` method, it writes the result without collecting it into the
+    memory. ``to_polars`` writes the result too and keeps the dual mode
+    contract, a ``pl.LazyFrame`` input gives back the ``pl.LazyFrame``,
+    otherwise the result is collected once, written and given back.
+
+    Ref: https://docs.pola.rs/api/python/stable/reference/lazyframe/index.html
+    """
+
+    type: str = dataclasses.field(default=DfopEnum.pipeline.value)
+    dfops: T.List["T_DFOP"] = dataclasses.field(default_factory=list)
+
+    def _ensure_lazy_supported(self):
+        eager_only = [
+            dfop.__class__.__name__ for dfop in self.dfops if not dfop.lazy_supported
+        ]
+        if eager_only:
+            raise LazyFrameNotSupportedError(
+                f"these dfops cannot be lowered onto a pl.LazyFrame: {eager_only}"
+            )
+
+    def _to_lazy_input(
+        self,
+        df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]],
+    ) -> T.Optional[pl.LazyFrame]:
+        # the source dfop starts the lazy query, the input frame is ignored
+        if self.is_source:
+            return None
+        if df is None:
+            raise ParamError(
+                "the pipeline doesn't start with a source dfop, "
+                "an input frame is required."
+            )
+        return df.lazy()
+
+    def _split_sink(self) -> T.Tuple[T.List["T_DFOP"], T.Optional["T_DFOP"]]:
+        """
+        Split the flattened dfops into the dfops to lower and the sink dfop.
+        Nested pipelines are flattened, so a nested source pipeline stays lazy.
+
+        :raises ParamError: if a source dfop is not the first dfop, or a sink
+            dfop is not the last dfop.
+        """
+        dfops = to_dfop_list(self.dfops)
+        for ith, dfop in enumerate(dfops[1:], start=2):
+            if dfop.is_source:
+                raise ParamError(
+                    f"the source dfop {dfop.__class__.__name__} ({dfop.type!r}) "
+                    f"must be the first dfop of the pipeline, but it is the #{ith}."
+                )
+        for ith, dfop in enumerate(dfops[:-1], start=1):
+            if dfop.is_sink:
+                raise ParamError(
+                    f"the sink dfop {dfop.__class__.__name__} ({dfop.type!r}) "
+                    f"must be the last dfop of the pipeline, but it is the #{ith}."
+                )
+        if dfops and dfops[-1].is_sink:
+            return dfops[:-1], dfops[-1]
+        return dfops, None
+
+    def to_lazyframe(
+        self,
+        df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]] = None,
+    ) -> pl.LazyFrame:
+        """
+        Lower all dfops onto a single ``pl.LazyFrame`` without collecting it.
+
+        :param df: the input frame, leave it None if the pipeline starts with
+            a source dfop.
+
+        :raises LazyFrameNotSupportedError: if any dfop in the pipeline
+            cannot be applied on a ``pl.LazyFrame``.
+        :raises ParamError: if the pipeline ends with a sink dfop, use
+            :meth:`sink` to run it.
+        """
+        dfops, sink = self._split_sink()
+        if sink is not None:
+            raise ParamError(
+                "the pipeline ends with a sink dfop, use sink to run it."
+            )
+        return self._lower(df, dfops)
+
+    def _lower(
+        self,
+        df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]],
+        dfops: T.List["T_DFOP"],
+    ) -> pl.LazyFrame:
+        self._ensure_lazy_supported()
+        lf = self._to_lazy_input(df)
+        for dfop in dfops:
+            lf = dfop.to_polars(lf)
+        return lf
+
+    @property
+    def lazy_supported(self) -> bool:
+        return all(dfop.lazy_supported for dfop in self.dfops)
+
+    @property
+    def streaming_supported(self) -> bool:
+        return all(dfop.streaming_supported for dfop in self.dfops)
+
+    @property
+    def is_source(self) -> bool:
+        return bool(self.dfops) and self.dfops[0].is_source
+
+    @property
+    def is_sink(self) -> bool:
+        return bool(self.dfops) and self.dfops[-1].is_sink
+
+    def to_polars(self, df: T.Optional[T_FRAME] = None) -> T_FRAME:
+        dfops, sink = self._split_sink()
+        lf = self._lower(df, dfops)
+        return self._finish(df, lf, None if sink is None else sink.to_polars)
+
+    @staticmethod
+    def _finish(
+        df: T.Optional[T_FRAME],
+        lf: pl.LazyFrame,
+        sink_func: T.Optional[T.Callable[[T_FRAME], T_FRAME]],
+    ) -> T_FRAME:
+        if isinstance(df, pl.LazyFrame):
+            return lf if sink_func is None else sink_func(lf)
+        result = lf.collect()
+        # the collected result is written, the plan doesn't run twice
+        return result if sink_func is None else sink_func(result)
+
+    def sink(self, df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]] = None):
+        """
+        Run a pipeline that ends with a sink dfop. The result is written with
+        ``pl.LazyFrame.sink_*`` without collecting it into the memory.
+
+        :param df: the input frame, leave it None if the pipeline starts with
+            a source dfop.
+
+        :raises ParamError: if the pipeline doesn't end with a sink dfop.
+        """
+        dfops, sink = self._split_sink()
+        if sink is None:
+            raise ParamError(
+                "the pipeline doesn't end with a sink dfop, use to_polars to run it."
+            )
+        sink.sink(self._lower(df, dfops))
+
+    def compile(self) -> T.Callable[[T_FRAME], T_FRAME]:
+        self._ensure_lazy_supported()
+        dfops, sink = self._split_sink()
+        funcs = [dfop.compile() for dfop in dfops]
+        sink_func = None if sink is None else sink.compile()
+
+        def pipeline(df: T.Optional[T_FRAME] = None) -> T_FRAME:
+            lf = self._to_lazy_input(df)
+            for func in funcs:
+                lf = func(lf)
+            return self._finish(df, lf, sink_func)
+
+        return pipeline
+
+dfop_enum_to_klass_mapping[DfopEnum.pipeline.value] = Pipeline
@@ -2,3 +2,10 @@
 
 class ParamError(Exception):
     pass
+
+
+class LazyFrameNotSupportedError(TypeError):
+    """
+    Raised when a dfop is applied on a ``pl.LazyFrame`` but the underlying
+    polars method only exists on the eager ``pl.DataFrame``.
+    """
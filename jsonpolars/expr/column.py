@@ -5,13 +5,15 @@ import dataclasses
 
 import polars as pl
 
-from ..arg import REQ, NA, rm_na, T_KWARGS
-from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping, parse_expr
+from ..arg import REQ
+from ..model import slotted
+from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .api import T_EXPR
 
 
+@slotted
 @dataclasses.dataclass
 class Column(BaseExpr):
     """
@@ -28,6 +30,7 @@ class Column(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.column.value] = Column
 
 
+@slotted
 @dataclasses.dataclass
 class Alias(BaseExpr):
     """
@@ -38,13 +41,6 @@ class Alias(BaseExpr):
     name: str = dataclasses.field(default=REQ)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            name=dct["name"],
-            expr=parse_expr(dct["expr"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return self.expr.to_polars().alias(self.name)
 
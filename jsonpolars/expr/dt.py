@@ -6,9 +6,9 @@ from datetime import timedelta
 
 import polars as pl
 
-from ..arg import REQ, NA, rm_na, T_KWARGS
-from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping, parse_expr
-from ..utils_expr import to_jsonpolars_other_expr
+from ..arg import REQ, NA, rm_na
+from ..model import slotted
+from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping
 
 
 if T.TYPE_CHECKING:  # pragma: no cover
@@ -22,6 +22,7 @@ def ensure_datetime(expr: "T_EXPR") -> pl.Expr:
         return expr.to_polars().dt
 
 
+@slotted
 @dataclasses.dataclass
 class Datetime(BaseExpr):
     """
@@ -31,10 +32,6 @@ class Datetime(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr)
 
@@ -42,6 +39,7 @@ class Datetime(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt.value] = Datetime
 
 
+@slotted
 @dataclasses.dataclass
 class DtToString(BaseExpr):
     """
@@ -52,13 +50,6 @@ class DtToString(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     format: str = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            format=dct["format"],
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).to_string(format=self.format)
 
@@ -66,6 +57,7 @@ class DtToString(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_to_string.value] = DtToString
 
 
+@slotted
 @dataclasses.dataclass
 class DtYear(BaseExpr):
     """
@@ -75,10 +67,6 @@ class DtYear(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_year.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).year()
 
@@ -86,6 +74,7 @@ class DtYear(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_year.value] = DtYear
 
 
+@slotted
 @dataclasses.dataclass
 class DtQuarter(BaseExpr):
     """
@@ -95,10 +84,6 @@ class DtQuarter(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_quarter.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).quarter()
 
@@ -106,6 +91,7 @@ class DtQuarter(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_quarter.value] = DtQuarter
 
 
+@slotted
 @dataclasses.dataclass
 class DtMonth(BaseExpr):
     """
@@ -115,10 +101,6 @@ class DtMonth(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_month.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: REQ):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).month()
 
@@ -126,6 +108,7 @@ class DtMonth(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_month.value] = DtMonth
 
 
+@slotted
 @dataclasses.dataclass
 class DtDay(BaseExpr):
     """
@@ -135,10 +118,6 @@ class DtDay(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_day.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: REQ):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).day()
 
@@ -146,6 +125,7 @@ class DtDay(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_day.value] = DtDay
 
 
+@slotted
 @dataclasses.dataclass
 class DtHour(BaseExpr):
     """
@@ -155,10 +135,6 @@ class DtHour(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_hour.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: REQ):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).hour()
 
@@ -166,6 +142,7 @@ class DtHour(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_hour.value] = DtHour
 
 
+@slotted
 @dataclasses.dataclass
 class DtMinute(BaseExpr):
     """
@@ -175,10 +152,6 @@ class DtMinute(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_minute.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: REQ):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).minute()
 
@@ -186,6 +159,7 @@ class DtMinute(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_minute.value] = DtMinute
 
 
+@slotted
 @dataclasses.dataclass
 class DtSecond(BaseExpr):
     """
@@ -195,10 +169,6 @@ class DtSecond(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_second.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: REQ):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).second()
 
@@ -206,6 +176,7 @@ class DtSecond(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_second.value] = DtSecond
 
 
+@slotted
 @dataclasses.dataclass
 class DtNanoSecond(BaseExpr):
     """
@@ -215,10 +186,6 @@ class DtNanoSecond(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_nanosecond.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).nanosecond()
 
@@ -226,6 +193,7 @@ class DtNanoSecond(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_nanosecond.value] = DtNanoSecond
 
 
+@slotted
 @dataclasses.dataclass
 class DtEpoch(BaseExpr):
     """
@@ -236,12 +204,6 @@ class DtEpoch(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     time_unit: str = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).epoch(**rm_na(time_unit=self.time_unit))
 
@@ -249,6 +211,7 @@ class DtEpoch(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_epoch.value] = DtEpoch
 
 
+@slotted
 @dataclasses.dataclass
 class DtTimestamp(BaseExpr):
     """
@@ -259,12 +222,6 @@ class DtTimestamp(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     time_unit: str = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).timestamp(**rm_na(time_unit=self.time_unit))
 
@@ -272,6 +229,7 @@ class DtTimestamp(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_timestamp.value] = DtTimestamp
 
 
+@slotted
 @dataclasses.dataclass
 class DtTotalDays(BaseExpr):
     """
@@ -281,10 +239,6 @@ class DtTotalDays(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_total_days.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).total_days()
 
@@ -292,6 +246,7 @@ class DtTotalDays(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_total_days.value] = DtTotalDays
 
 
+@slotted
 @dataclasses.dataclass
 class DtTotalHours(BaseExpr):
     """
@@ -301,10 +256,6 @@ class DtTotalHours(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_total_hours.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).total_hours()
 
@@ -312,6 +263,7 @@ class DtTotalHours(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_total_hours.value] = DtTotalHours
 
 
+@slotted
 @dataclasses.dataclass
 class DtTotalMinutes(BaseExpr):
     """
@@ -321,10 +273,6 @@ class DtTotalMinutes(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_total_minutes.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).total_minutes()
 
@@ -332,6 +280,7 @@ class DtTotalMinutes(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_total_minutes.value] = DtTotalMinutes
 
 
+@slotted
 @dataclasses.dataclass
 class DtTotalSeconds(BaseExpr):
     """
@@ -341,10 +290,6 @@ class DtTotalSeconds(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_total_seconds.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).total_seconds()
 
@@ -352,6 +297,7 @@ class DtTotalSeconds(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_total_seconds.value] = DtTotalSeconds
 
 
+@slotted
 @dataclasses.dataclass
 class DtTotalMilliSeconds(BaseExpr):
     """
@@ -361,10 +307,6 @@ class DtTotalMilliSeconds(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_total_milliseconds.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).total_milliseconds()
 
@@ -372,6 +314,7 @@ class DtTotalMilliSeconds(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_total_milliseconds.value] = DtTotalMilliSeconds
 
 
+@slotted
 @dataclasses.dataclass
 class DtTotalMicroSeconds(BaseExpr):
     """
@@ -381,10 +324,6 @@ class DtTotalMicroSeconds(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_total_microseconds.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).total_microseconds()
 
@@ -392,6 +331,7 @@ class DtTotalMicroSeconds(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_total_microseconds.value] = DtTotalMicroSeconds
 
 
+@slotted
 @dataclasses.dataclass
 class DtTotalNanoSeconds(BaseExpr):
     """
@@ -401,10 +341,6 @@ class DtTotalNanoSeconds(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.dt_total_nanoseconds.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(expr=parse_expr(dct["expr"]))
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).total_nanoseconds()
 
@@ -412,6 +348,7 @@ class DtTotalNanoSeconds(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.dt_total_nanoseconds.value] = DtTotalNanoSeconds
 
 
+@slotted
 @dataclasses.dataclass
 class DtTruncate(BaseExpr):
     """
@@ -422,13 +359,6 @@ class DtTruncate(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     every: T.Union[str, timedelta, "T_EXPR"] = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            every=to_jsonpolars_other_expr(dct["every"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_datetime(self.expr).truncate(every=self.every)
 
@@ -7,13 +7,11 @@ import polars as pl
 from simpletype.api import json_type_to_simple_type
 
 from ..arg import REQ, NA, rm_na, T_KWARGS
-from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping, parse_expr
+from ..model import slotted
+from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping
 from ..utils_expr import (
-    batch_to_jsonpolars_into_exprs,
-    batch_to_jsonpolars_named_into_exprs,
     batch_to_polars_into_exprs,
     batch_to_polars_named_into_exprs,
-    to_jsonpolars_other_expr,
     str_to_polars_dtype_mapping,
     polars_dtype_to_str_mapping,
 )
@@ -23,6 +21,7 @@ if T.TYPE_CHECKING:  # pragma: no cover
     from ..typehint import IntoExpr, DatetimeElementExpr
 
 
+@slotted
 @dataclasses.dataclass
 class Lit(BaseExpr):
     """
@@ -36,8 +35,7 @@ class Lit(BaseExpr):
     )
     allow_object: bool = dataclasses.field(default=NA)
 
-    def to_dict(self) -> T_KWARGS:
-        dct = super().to_dict()
+    def _post_to_dict(self, dct: T_KWARGS) -> T_KWARGS:
         if "dtype" in dct:
             if isinstance(self.dtype, str):
                 dtype = self.dtype
@@ -66,6 +64,7 @@ class Lit(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.func_lit.value] = Lit
 
 
+@slotted
 @dataclasses.dataclass
 class ConcatStr(BaseExpr):
     """
@@ -77,14 +76,6 @@ class ConcatStr(BaseExpr):
     separator: str = dataclasses.field(default=NA)
     ignore_nulls: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        opt_kwargs["exprs"] = batch_to_jsonpolars_into_exprs(
-            opt_kwargs.get("exprs", [])
-        )
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return pl.concat_str(
             exprs=batch_to_polars_into_exprs(self.exprs),
@@ -98,6 +89,7 @@ class ConcatStr(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.func_concat_str.value] = ConcatStr
 
 
+@slotted
 @dataclasses.dataclass
 class ConcatList(BaseExpr):
     """
@@ -107,12 +99,6 @@ class ConcatList(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.func_concat_list.value)
     exprs: T.List["IntoExpr"] = dataclasses.field(default_factory=list)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        return cls(
-            exprs=batch_to_jsonpolars_into_exprs(dct.get("exprs", list())),
-        )
-
     def to_polars(self) -> pl.Expr:
         return pl.concat_list(
             exprs=batch_to_polars_into_exprs(self.exprs),
@@ -122,6 +108,7 @@ class ConcatList(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.func_concat_list.value] = ConcatList
 
 
+@slotted
 @dataclasses.dataclass
 class FuncStruct(BaseExpr):
     """
@@ -134,17 +121,6 @@ class FuncStruct(BaseExpr):
     schema: T.Optional[T.Dict[str, T.Dict[str, T.Any]]] = dataclasses.field(default=NA)
     eager: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        opt_kwargs["exprs"] = batch_to_jsonpolars_into_exprs(
-            opt_kwargs.get("exprs", [])
-        )
-        opt_kwargs["named_exprs"] = batch_to_jsonpolars_named_into_exprs(
-            opt_kwargs.get("named_exprs", {})
-        )
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         kwargs = {}
         if isinstance(self.schema, dict):
@@ -162,6 +138,7 @@ class FuncStruct(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.func_struct.value] = FuncStruct
 
 
+@slotted
 @dataclasses.dataclass
 class Format(BaseExpr):
     """
@@ -172,14 +149,6 @@ class Format(BaseExpr):
     f_string: str = dataclasses.field(default=REQ)
     exprs: T.List["IntoExpr"] = dataclasses.field(default_factory=list)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        opt_kwargs["exprs"] = batch_to_jsonpolars_into_exprs(
-            opt_kwargs.get("exprs", [])
-        )
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return pl.format(
             self.f_string,
@@ -190,6 +159,7 @@ class Format(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.func_format.value] = Format
 
 
+@slotted
 @dataclasses.dataclass
 class FuncDate(BaseExpr):
     """
@@ -212,6 +182,7 @@ class FuncDate(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.func_date.value] = FuncDate
 
 
+@slotted
 @dataclasses.dataclass
 class FuncDatetime(BaseExpr):
     """
@@ -250,6 +221,7 @@ class FuncDatetime(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.func_datetime.value] = FuncDatetime
 
 
+@slotted
 @dataclasses.dataclass
 class Element(BaseExpr):
     """
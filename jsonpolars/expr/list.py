@@ -5,8 +5,9 @@ import dataclasses
 
 import polars as pl
 
-from ..arg import REQ, NA, rm_na, T_KWARGS
-from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping, parse_expr
+from ..arg import REQ, NA, rm_na
+from ..model import slotted
+from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .api import T_EXPR
@@ -19,6 +20,7 @@ def ensure_list(expr: "T_EXPR") -> pl.Expr:
         return expr.to_polars().list
 
 
+@slotted
 @dataclasses.dataclass
 class List(BaseExpr):
     """
@@ -28,12 +30,6 @@ class List(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.list.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_list(self.expr)
 
@@ -41,6 +37,7 @@ class List(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.list.value] = List
 
 
+@slotted
 @dataclasses.dataclass
 class ListGet(BaseExpr):
     """
@@ -52,19 +49,6 @@ class ListGet(BaseExpr):
     index: T.Union[int, "T_EXPR"] = dataclasses.field(default=REQ)
     null_on_oob: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        index = req_kwargs["index"]
-        if isinstance(index, int):
-            pass
-        elif isinstance(index, dict):
-            req_kwargs["index"] = parse_expr(index)
-        else:  # pragma: no cover
-            raise ValueError(f"Unknown index type: {index}")
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         expr = ensure_list(self.expr)
         if isinstance(self.index, int):
@@ -79,6 +63,7 @@ class ListGet(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.list_get.value] = ListGet
 
 
+@slotted
 @dataclasses.dataclass
 class ListEval(BaseExpr):
     """
@@ -90,13 +75,6 @@ class ListEval(BaseExpr):
     expr_to_run: "T_EXPR" = dataclasses.field(default=REQ)
     parallel: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        req_kwargs["expr_to_run"] = parse_expr(req_kwargs["expr_to_run"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         expr = ensure_list(self.expr)
         return expr.eval(self.expr_to_run.to_polars(), **rm_na(parallel=self.parallel))
@@ -5,14 +5,16 @@ import dataclasses
 
 import polars as pl
 
-from ..arg import REQ, NA, rm_na, T_KWARGS
-from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping, parse_expr
+from ..arg import REQ, T_KWARGS
+from ..model import slotted
+from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping
 from ..utils_expr import str_to_polars_dtype_mapping, polars_dtype_to_str_mapping
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .api import T_EXPR
 
 
+@slotted
 @dataclasses.dataclass
 class Cast(BaseExpr):
     """
@@ -25,8 +27,7 @@ class Cast(BaseExpr):
         default=REQ
     )
 
-    def to_dict(self) -> T_KWARGS:
-        dct = super().to_dict()
+    def _post_to_dict(self, dct: T_KWARGS) -> T_KWARGS:
         if "dtype" in dct:
             if isinstance(self.dtype, str):
                 dtype = self.dtype
@@ -38,12 +39,6 @@ class Cast(BaseExpr):
             dct["dtype"] = dtype
         return dct
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         if isinstance(self.dtype, str):
             dtype = str_to_polars_dtype_mapping[self.dtype]
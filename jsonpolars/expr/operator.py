@@ -5,9 +5,9 @@ import dataclasses
 
 import polars as pl
 
-from ..arg import REQ, NA, rm_na, T_KWARGS
-from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping, parse_expr
-from ..utils_expr import to_jsonpolars_other_expr
+from ..arg import REQ
+from ..model import slotted
+from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .api import T_EXPR
@@ -33,6 +33,7 @@ def _other_expr_to_polars(other_expr: "OtherExpr"):
         return other_expr
 
 
+@slotted
 @dataclasses.dataclass
 class Plus(BaseExpr):
     """
@@ -43,13 +44,6 @@ class Plus(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) + _other_expr_to_polars(self.right)
 
@@ -57,6 +51,7 @@ class Plus(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.add.value] = Plus
 
 
+@slotted
 @dataclasses.dataclass
 class Minus(BaseExpr):
     """
@@ -67,13 +62,6 @@ class Minus(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) - _other_expr_to_polars(self.right)
 
@@ -81,6 +69,7 @@ class Minus(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.sub.value] = Minus
 
 
+@slotted
 @dataclasses.dataclass
 class Multiply(BaseExpr):
     """
@@ -91,13 +80,6 @@ class Multiply(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) * _other_expr_to_polars(self.right)
 
@@ -105,6 +87,7 @@ class Multiply(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.mul.value] = Multiply
 
 
+@slotted
 @dataclasses.dataclass
 class TrueDiv(BaseExpr):
     """
@@ -115,13 +98,6 @@ class TrueDiv(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) / _other_expr_to_polars(self.right)
 
@@ -129,6 +105,7 @@ class TrueDiv(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.truediv.value] = TrueDiv
 
 
+@slotted
 @dataclasses.dataclass
 class FloorDiv(BaseExpr):
     """
@@ -139,13 +116,6 @@ class FloorDiv(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) // _other_expr_to_polars(self.right)
 
@@ -153,6 +123,7 @@ class FloorDiv(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.floordiv.value] = FloorDiv
 
 
+@slotted
 @dataclasses.dataclass
 class Negative(BaseExpr):
     """
@@ -162,12 +133,6 @@ class Negative(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.neg.value)
     expr: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=to_jsonpolars_other_expr(dct["expr"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return -_other_expr_to_polars(self.expr)
 
@@ -175,6 +140,7 @@ class Negative(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.neg.value] = Negative
 
 
+@slotted
 @dataclasses.dataclass
 class Pow(BaseExpr):
     """
@@ -185,13 +151,6 @@ class Pow(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) ** _other_expr_to_polars(self.right)
 
@@ -199,6 +158,7 @@ class Pow(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.pow.value] = Pow
 
 
+@slotted
 @dataclasses.dataclass
 class Equal(BaseExpr):
     """
@@ -209,13 +169,6 @@ class Equal(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) == _other_expr_to_polars(self.right)
 
@@ -223,6 +176,7 @@ class Equal(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.eq.value] = Equal
 
 
+@slotted
 @dataclasses.dataclass
 class NotEqual(BaseExpr):
     """
@@ -233,13 +187,6 @@ class NotEqual(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) != _other_expr_to_polars(self.right)
 
@@ -247,6 +194,7 @@ class NotEqual(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.ne.value] = NotEqual
 
 
+@slotted
 @dataclasses.dataclass
 class GreatThan(BaseExpr):
     """
@@ -257,13 +205,6 @@ class GreatThan(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) > _other_expr_to_polars(self.right)
 
@@ -271,6 +212,7 @@ class GreatThan(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.gt.value] = GreatThan
 
 
+@slotted
 @dataclasses.dataclass
 class GreatThanOrEqual(BaseExpr):
     """
@@ -281,13 +223,6 @@ class GreatThanOrEqual(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) >= _other_expr_to_polars(self.right)
 
@@ -295,6 +230,7 @@ class GreatThanOrEqual(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.ge.value] = GreatThanOrEqual
 
 
+@slotted
 @dataclasses.dataclass
 class LessThan(BaseExpr):
     """
@@ -305,13 +241,6 @@ class LessThan(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) < _other_expr_to_polars(self.right)
 
@@ -319,6 +248,7 @@ class LessThan(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.lt.value] = LessThan
 
 
+@slotted
 @dataclasses.dataclass
 class LessThanOrEqual(BaseExpr):
     """
@@ -329,13 +259,6 @@ class LessThanOrEqual(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) <= _other_expr_to_polars(self.right)
 
@@ -343,6 +266,7 @@ class LessThanOrEqual(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.le.value] = LessThanOrEqual
 
 
+@slotted
 @dataclasses.dataclass
 class LogicalAnd(BaseExpr):
     """
@@ -353,13 +277,6 @@ class LogicalAnd(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) & _other_expr_to_polars(self.right)
 
@@ -367,6 +284,7 @@ class LogicalAnd(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.and_.value] = LogicalAnd
 
 
+@slotted
 @dataclasses.dataclass
 class LogicalOr(BaseExpr):
     """
@@ -377,13 +295,6 @@ class LogicalOr(BaseExpr):
     left: "OtherExpr" = dataclasses.field(default=REQ)
     right: "OtherExpr" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            left=to_jsonpolars_other_expr(dct["left"]),
-            right=to_jsonpolars_other_expr(dct["right"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return _other_expr_to_polars(self.left) | _other_expr_to_polars(self.right)
 
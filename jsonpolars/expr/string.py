@@ -5,9 +5,10 @@ import dataclasses
 
 import polars as pl
 
-from ..arg import REQ, NA, rm_na, T_KWARGS
-from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping, parse_expr
-from ..utils_expr import to_jsonpolars_other_expr, to_polars_other_expr
+from ..arg import REQ, NA, rm_na
+from ..model import slotted
+from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping
+from ..utils_expr import to_polars_other_expr
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .api import T_EXPR
@@ -20,6 +21,7 @@ def ensure_string(expr: "T_EXPR") -> pl.Expr:
         return expr.to_polars().str
 
 
+@slotted
 @dataclasses.dataclass
 class String(BaseExpr):
     """
@@ -29,12 +31,6 @@ class String(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.string.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr)
 
@@ -42,6 +38,7 @@ class String(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.string.value] = String
 
 
+@slotted
 @dataclasses.dataclass
 class Split(BaseExpr):
     """
@@ -53,12 +50,6 @@ class Split(BaseExpr):
     by: str = dataclasses.field(default=REQ)
     inclusive: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).split(
             by=self.by,
@@ -69,6 +60,7 @@ class Split(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_split.value] = Split
 
 
+@slotted
 @dataclasses.dataclass
 class StrJoin(BaseExpr):
     """
@@ -80,11 +72,7 @@ class StrJoin(BaseExpr):
     delimiter: str = dataclasses.field(default=NA)
     ignore_nulls: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
+    row_local = False
 
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).join(
@@ -98,6 +86,7 @@ class StrJoin(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_join.value] = StrJoin
 
 
+@slotted
 @dataclasses.dataclass
 class StrContains(BaseExpr):
     """
@@ -110,13 +99,6 @@ class StrContains(BaseExpr):
     literal: bool = dataclasses.field(default=NA)
     strict: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        req_kwargs["pattern"] = to_jsonpolars_other_expr(req_kwargs["pattern"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).contains(
             pattern=to_polars_other_expr(self.pattern),
@@ -130,6 +112,7 @@ class StrContains(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_contains.value] = StrContains
 
 
+@slotted
 @dataclasses.dataclass
 class StrDecode(BaseExpr):
     """
@@ -141,12 +124,6 @@ class StrDecode(BaseExpr):
     encoding: str = dataclasses.field(default=REQ)
     strict: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).decode(
             encoding=self.encoding,
@@ -159,6 +136,7 @@ class StrDecode(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_decode.value] = StrDecode
 
 
+@slotted
 @dataclasses.dataclass
 class StrEncode(BaseExpr):
     """
@@ -169,13 +147,6 @@ class StrEncode(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     encoding: str = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            encoding=dct["encoding"],
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).encode(encoding=self.encoding)
 
@@ -183,6 +154,7 @@ class StrEncode(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_encode.value] = StrEncode
 
 
+@slotted
 @dataclasses.dataclass
 class StrStartsWith(BaseExpr):
     """
@@ -193,13 +165,6 @@ class StrStartsWith(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     prefix: T.Union[str, "T_EXPR"] = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            prefix=to_jsonpolars_other_expr(dct["prefix"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).starts_with(
             prefix=to_polars_other_expr(self.prefix)
@@ -209,6 +174,7 @@ class StrStartsWith(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_starts_with.value] = StrStartsWith
 
 
+@slotted
 @dataclasses.dataclass
 class StrEndsWith(BaseExpr):
     """
@@ -219,13 +185,6 @@ class StrEndsWith(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     suffix: T.Union[str, "T_EXPR"] = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            suffix=to_jsonpolars_other_expr(dct["suffix"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).ends_with(
             suffix=to_polars_other_expr(self.suffix)
@@ -235,6 +194,7 @@ class StrEndsWith(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_ends_with.value] = StrEndsWith
 
 
+@slotted
 @dataclasses.dataclass
 class StrToDatetime(BaseExpr):
     """
@@ -251,12 +211,6 @@ class StrToDatetime(BaseExpr):
     cache: bool = dataclasses.field(default=NA)
     ambiguous: str = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).to_datetime(
             **rm_na(
@@ -274,6 +228,7 @@ class StrToDatetime(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_to_datetime.value] = StrToDatetime
 
 
+@slotted
 @dataclasses.dataclass
 class StrToDate(BaseExpr):
     """
@@ -287,12 +242,6 @@ class StrToDate(BaseExpr):
     exact: bool = dataclasses.field(default=NA)
     cache: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).to_date(
             **rm_na(
@@ -307,6 +256,7 @@ class StrToDate(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_to_date.value] = StrToDate
 
 
+@slotted
 @dataclasses.dataclass
 class StrZfill(BaseExpr):
     """
@@ -317,13 +267,6 @@ class StrZfill(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     length: int = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            length=dct["length"],
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).zfill(length=self.length)
 
@@ -331,6 +274,7 @@ class StrZfill(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_zfill.value] = StrZfill
 
 
+@slotted
 @dataclasses.dataclass
 class StrPadStart(BaseExpr):
     """
@@ -342,12 +286,6 @@ class StrPadStart(BaseExpr):
     length: int = dataclasses.field(default=REQ)
     fill_char: str = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).pad_start(
             length=self.length,
@@ -360,6 +298,7 @@ class StrPadStart(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_pad_start.value] = StrPadStart
 
 
+@slotted
 @dataclasses.dataclass
 class StrPadEnd(BaseExpr):
     """
@@ -371,12 +310,6 @@ class StrPadEnd(BaseExpr):
     length: int = dataclasses.field(default=REQ)
     fill_char: str = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).pad_end(
             length=self.length,
@@ -389,6 +322,7 @@ class StrPadEnd(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_pad_end.value] = StrPadEnd
 
 
+@slotted
 @dataclasses.dataclass
 class StrToLowerCase(BaseExpr):
     """
@@ -398,12 +332,6 @@ class StrToLowerCase(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.str_to_lowercase.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).to_lowercase()
 
@@ -411,6 +339,7 @@ class StrToLowerCase(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_to_lowercase.value] = StrToLowerCase
 
 
+@slotted
 @dataclasses.dataclass
 class StrToUpperCase(BaseExpr):
     """
@@ -420,12 +349,6 @@ class StrToUpperCase(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.str_to_uppercase.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).to_uppercase()
 
@@ -433,6 +356,7 @@ class StrToUpperCase(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_to_uppercase.value] = StrToUpperCase
 
 
+@slotted
 @dataclasses.dataclass
 class StrToTitleCase(BaseExpr):
     """
@@ -442,12 +366,6 @@ class StrToTitleCase(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.str_to_titlecase.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).to_titlecase()
 
@@ -455,6 +373,7 @@ class StrToTitleCase(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_to_titlecase.value] = StrToTitleCase
 
 
+@slotted
 @dataclasses.dataclass
 class StrHead(BaseExpr):
     """
@@ -465,13 +384,6 @@ class StrHead(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     n: int = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            n=dct["n"],
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).head(n=self.n)
 
@@ -479,6 +391,7 @@ class StrHead(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_head.value] = StrHead
 
 
+@slotted
 @dataclasses.dataclass
 class StrTail(BaseExpr):
     """
@@ -489,13 +402,6 @@ class StrTail(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     n: int = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            n=dct["n"],
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).tail(n=self.n)
 
@@ -503,6 +409,7 @@ class StrTail(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_tail.value] = StrTail
 
 
+@slotted
 @dataclasses.dataclass
 class StrSlice(BaseExpr):
     """
@@ -514,14 +421,6 @@ class StrSlice(BaseExpr):
     offset: int = dataclasses.field(default=REQ)
     length: int = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            offset=dct["offset"],
-            length=dct["length"],
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).slice(
             offset=self.offset,
@@ -532,6 +431,7 @@ class StrSlice(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_slice.value] = StrSlice
 
 
+@slotted
 @dataclasses.dataclass
 class StrReplace(BaseExpr):
     """
@@ -545,14 +445,6 @@ class StrReplace(BaseExpr):
     literal: bool = dataclasses.field(default=NA)
     n: int = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        req_kwargs["pattern"] = to_jsonpolars_other_expr(req_kwargs["pattern"])
-        req_kwargs["value"] = to_jsonpolars_other_expr(req_kwargs["value"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).replace(
             pattern=to_polars_other_expr(self.pattern),
@@ -567,6 +459,7 @@ class StrReplace(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.str_replace.value] = StrReplace
 
 
+@slotted
 @dataclasses.dataclass
 class StrReplaceAll(BaseExpr):
     """
@@ -579,14 +472,6 @@ class StrReplaceAll(BaseExpr):
     value: T.Union[str, "T_EXPR"] = dataclasses.field(default=REQ)
     literal: bool = dataclasses.field(default=NA)
 
-    @classmethod
-    def from_dict(cls, dct: T.Dict[str, T.Any]):
-        req_kwargs, opt_kwargs = cls._split_req_opt(dct)
-        req_kwargs["expr"] = parse_expr(req_kwargs["expr"])
-        req_kwargs["pattern"] = to_jsonpolars_other_expr(req_kwargs["pattern"])
-        req_kwargs["value"] = to_jsonpolars_other_expr(req_kwargs["value"])
-        return cls(**req_kwargs, **rm_na(**opt_kwargs))
-
     def to_polars(self) -> pl.Expr:
         return ensure_string(self.expr).replace_all(
             pattern=to_polars_other_expr(self.pattern),
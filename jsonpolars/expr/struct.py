@@ -5,16 +5,10 @@ import dataclasses
 
 import polars as pl
 
-from ..arg import REQ, NA, rm_na, T_KWARGS
-from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping, parse_expr
-from ..utils_expr import (
-    batch_to_jsonpolars_into_exprs,
-    batch_to_jsonpolars_named_into_exprs,
-    batch_to_polars_into_exprs,
-    batch_to_polars_named_into_exprs,
-    to_jsonpolars_other_expr,
-    to_polars_other_expr,
-)
+from ..arg import REQ
+from ..model import slotted
+from ..base_expr import ExprEnum, BaseExpr, expr_enum_to_klass_mapping
+from ..utils_expr import batch_to_polars_into_exprs, batch_to_polars_named_into_exprs
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .api import T_EXPR
@@ -28,6 +22,7 @@ def ensure_struct(expr: "T_EXPR") -> pl.Expr:
         return expr.to_polars().struct
 
 
+@slotted
 @dataclasses.dataclass
 class Struct(BaseExpr):
     """
@@ -37,12 +32,6 @@ class Struct(BaseExpr):
     type: str = dataclasses.field(default=ExprEnum.struct.value)
     expr: "T_EXPR" = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_struct(self.expr)
 
@@ -50,6 +39,7 @@ class Struct(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.struct.value] = Struct
 
 
+@slotted
 @dataclasses.dataclass
 class StructField(BaseExpr):
     """
@@ -61,17 +51,6 @@ class StructField(BaseExpr):
     name: T.Union[str, T.List[str]] = dataclasses.field(default=REQ)
     more_names: T.List[str] = dataclasses.field(default_factory=list)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        kwargs = dict(
-            name=dct["name"],
-            more_names=dct.get("more_names", []),
-        )
-        expr = dct["expr"]
-        if expr is not None:
-            kwargs["expr"] = to_jsonpolars_other_expr(dct["expr"])
-        return cls(**kwargs)
-
     def to_polars(self) -> pl.Expr:
         if self.expr is None:
             if isinstance(self.name, str):
@@ -87,6 +66,7 @@ class StructField(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.struct_field.value] = StructField
 
 
+@slotted
 @dataclasses.dataclass
 class StructRenameFields(BaseExpr):
     """
@@ -97,13 +77,6 @@ class StructRenameFields(BaseExpr):
     expr: "T_EXPR" = dataclasses.field(default=REQ)
     names: T.List[str] = dataclasses.field(default=REQ)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            names=dct["names"],
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_struct(self.expr).rename_fields(names=self.names)
 
@@ -111,6 +84,7 @@ class StructRenameFields(BaseExpr):
 expr_enum_to_klass_mapping[ExprEnum.struct_rename_fields.value] = StructRenameFields
 
 
+@slotted
 @dataclasses.dataclass
 class StructWithFields(BaseExpr):
     """
@@ -122,16 +96,6 @@ class StructWithFields(BaseExpr):
     exprs: T.List["IntoExpr"] = dataclasses.field(default_factory=list)
     named_exprs: T.Dict[str, "IntoExpr"] = dataclasses.field(default_factory=dict)
 
-    @classmethod
-    def from_dict(cls, dct: T_KWARGS):
-        return cls(
-            expr=parse_expr(dct["expr"]),
-            exprs=batch_to_jsonpolars_into_exprs(dct.get("exprs", list())),
-            named_exprs=batch_to_jsonpolars_named_into_exprs(
-                dct.get("named_exprs", dict())
-            ),
-        )
-
     def to_polars(self) -> pl.Expr:
         return ensure_struct(self.expr).with_fields(
             *batch_to_polars_into_exprs(self.exprs),
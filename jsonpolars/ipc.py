@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run jsonpolars plans on a memory-mapped Arrow IPC (Feather v2) file.
+
+When many plans, or many worker processes, reuse the same large frame, each
+process maps the file with ``pl.read_ipc(..., memory_map=True)`` once and
+keeps the mapping in a per-process cache. The data stays in the OS page cache
+and is shared read-only by all processes, no process copies it into its own
+memory.
+
+Example::
+
+    >>> from multiprocessing import get_context
+    >>> from concurrent.futures import ProcessPoolExecutor
+    >>> from jsonpolars.ipc import MappedIpc
+    >>> source = MappedIpc(path="/data/events.arrow")
+    >>> df = source.run([{"type": "head", "n": 3}])
+    >>> # the instance pickles as its path, each worker maps the file once
+    >>> with ProcessPoolExecutor(mp_context=get_context("spawn")) as executor:
+    ...     dfs = list(executor.map(source.run, plans))
+
+.. note::
+
+    The zero-copy mapping only works with an uncompressed IPC file, polars
+    has to decompress a compressed file into the memory. Write the file with
+    ``df.write_ipc(path, compression="uncompressed")``. To update a mapped
+    file, write a new file and ``os.replace`` it, never overwrite it in place.
+"""
+
+import typing as T
+import os
+import threading
+import dataclasses
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+
+from .utils_dfop import T_PLAN, to_dfop_list
+from .streaming import _parse_version
+from .dfop.api import Pipeline
+
+# path -> ((mtime_ns, size), mapped frame)
+_mapped_frames: T.Dict[str, T.Tuple[T.Tuple[int, int], pl.DataFrame]] = dict()
+_mapped_frames_lock = threading.Lock()
+
+# a rechunk copies the mapped data into the memory, polars 1.43 deprecated the
+# ``rechunk`` parameter of ``read_ipc`` and no longer rechunks by default.
+_read_ipc_kwargs = (
+    dict() if _parse_version(pl.__version__) >= (1, 43) else dict(rechunk=False)
+)
+
+
+def map_ipc(path: T.Union[str, os.PathLike]) -> pl.DataFrame:
+    """
+    Memory-map an Arrow IPC file as a read-only ``pl.DataFrame``.
+
+    The mapped frame is cached per process, a file is mapped again only if
+    its modification time or size changed.
+    """
+    path = os.path.abspath(os.fspath(path))
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _mapped_frames_lock:
+        cached = _mapped_frames.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        df = pl.read_ipc(path, memory_map=True, **_read_ipc_kwargs)
+        _mapped_frames[path] = (version, df)
+        return df
+
+
+def clear_ipc_cache():
+    """
+    Drop all mapped frames of this process. A file stays mapped until no
+    frame derived from it is alive.
+    """
+    with _mapped_frames_lock:
+        _mapped_frames.clear()
+
+
+def run_plan(
+    plan: T_PLAN,
+    df: T.Union[pl.DataFrame, pl.LazyFrame],
+) -> T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]]:
+    """
+    Run a plan on a frame. The plan is lowered onto one ``pl.LazyFrame`` if
+    all dfops support it, otherwise the dfops are applied one by one.
+    """
+    dfops = to_dfop_list(plan)
+    pipeline = Pipeline(dfops=dfops)
+    if pipeline.lazy_supported:
+        return pipeline.to_polars(df)
+    for dfop in dfops:
+        df = dfop.to_polars(df)
+    return df
+
+
+@dataclasses.dataclass(frozen=True)
+class MappedIpc:
+    """
+    A memory-mapped Arrow IPC file to run plans on. It only holds the path,
+    so it is cheap to pickle and send to worker processes, the file is mapped
+    on first use in each process, see :func:`map_ipc`.
+
+    :param path: the path of the IPC file.
+    """
+
+    path: str = dataclasses.field()
+
+    @property
+    def df(self) -> pl.DataFrame:
+        return map_ipc(self.path)
+
+    def run(self, plan: T_PLAN) -> T.Optional[pl.DataFrame]:
+        """
+        Run a plan on the mapped frame, see :func:`run_plan`.
+        """
+        return run_plan(plan, self.df)
+
+    def run_many(
+        self,
+        plans: T.Iterable[T_PLAN],
+        workers: T.Optional[int] = None,
+    ) -> T.List[T.Optional[pl.DataFrame]]:
+        """
+        Run many plans in a process pool, the results are in the order of
+        the plans. Each worker maps the file only once.
+
+        The workers are spawned instead of forked, a forked child can
+        deadlock on the polars thread pool of the parent.
+
+        :param workers: the number of worker processes, default is the number
+            of CPUs. 0 or 1 runs in the current process.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            return [self.run(plan) for plan in plans]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            return list(executor.map(self.run, plans))
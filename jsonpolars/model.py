@@ -1,46 +1,882 @@
 # -*- coding: utf-8 -*-
 
 import typing as T
+import re
+import types
+import collections.abc
+import hashlib
 import dataclasses
 
 from .exc import ParamError
-from .arg import _REQUIRED, REQ, rm_na, T_KWARGS
+from .arg import _REQUIRED, _NOTHING, REQ, T_KWARGS
+
+
+#: the names of the type hints that hold child nodes, and the kind of the
+#: child nodes, see :data:`node_klass_mappings`. A ``str`` field that is a
+#: column name or a python literal, for example ``DatetimeElementExpr``, is
+#: not a child node.
+node_type_hints: T.Dict[str, str] = {
+    "T_EXPR": "expr",
+    "IntoExpr": "expr",
+    "IntoExprColumn": "expr",
+    "OtherExpr": "expr",
+    "ColumnNameOrSelector": "expr",
+    "T_DFOP": "dfop",
+}
+
+_p_identifier = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+T_NODE_HINT = T.Optional[T.Tuple[str, str]]
+
+
+def _find_node_hint(tp: T.Any) -> T_NODE_HINT:
+    """
+    Find out how a field holds its child nodes from its type hint. The type
+    hint is walked with ``typing.get_origin`` and ``typing.get_args``, the
+    names in :data:`node_type_hints` are only imported under
+    ``T.TYPE_CHECKING``, so they stay as forward references.
+
+    :return: None if the field doesn't hold child nodes, otherwise the shape
+        ``"one"``, ``"list"`` or ``"dict"`` and the kind of the child nodes.
+
+    :raises TypeError: if the type hint is ambiguous, for example a
+        ``T.Union`` of a single node and a list of nodes, a nested list of
+        nodes, or a string of a complex type hint that mentions a node.
+    """
+    if isinstance(tp, T.ForwardRef):
+        tp = tp.__forward_arg__
+    if isinstance(tp, str):
+        name = tp.strip()
+        if name in node_type_hints:
+            return ("one", node_type_hints[name])
+        if any(n in node_type_hints for n in _p_identifier.findall(name)):
+            raise TypeError(
+                f"cannot tell how {tp!r} holds the child nodes, only quote "
+                f"the node type names, e.g. T.List['IntoExpr']."
+            )
+        return None
+
+    origin = T.get_origin(tp)
+    if origin is None:
+        return None
+    args = T.get_args(tp)
+    if origin is T.Union:
+        hints = {_find_node_hint(arg) for arg in args} - {None}
+        if len(hints) > 1:
+            raise TypeError(f"{tp} mixes child node shapes {sorted(hints)}.")
+        return hints.pop() if hints else None
+
+    if origin in (list, tuple, set, frozenset, collections.abc.Sequence):
+        item_args = [arg for arg in args if arg is not Ellipsis]
+        shape = "list"
+    elif origin in (dict, collections.abc.Mapping):
+        if len(args) == 2 and _find_node_hint(args[0]) is not None:
+            raise TypeError(f"{tp} has child nodes as dict keys.")
+        item_args = args[1:]
+        shape = "dict"
+    else:  # for example T.Callable[[arg, ...], result]
+        item_args = [
+            a for arg in args for a in (arg if isinstance(arg, list) else [arg])
+        ]
+        shape = None
+    hints = {_find_node_hint(arg) for arg in item_args} - {None}
+    if not hints:
+        return None
+    if shape is None:
+        raise TypeError(f"{tp} holds child nodes in an unsupported container.")
+    if len(hints) > 1 or next(iter(hints))[0] != "one":
+        raise TypeError(f"{tp} holds nested child nodes, it is not supported.")
+    return (shape, next(iter(hints))[1])
+
+
+@dataclasses.dataclass(frozen=True)
+class FieldSpec:
+    """
+    The precomputed field layout of a ``BaseModel`` subclass. It is built
+    once per class on first use, so that the hot path of parsing, validating
+    and serializing doesn't have to call ``dataclasses.fields`` again.
+
+    :param names: all field names, in definition order.
+    :param req_names: names of the required fields, the default is ``REQ``.
+    :param opt_names: names of the optional fields.
+    :param node_names: names of the fields that may hold child nodes,
+        detected from the type hint of the field, see :func:`_find_node_hint`.
+    :param node_shapes: how each field in ``node_names`` holds its child
+        nodes, ``"one"``, ``"list"`` or ``"dict"``.
+    :param node_kinds: the kind of child nodes of each field in
+        ``node_names``, ``"expr"`` or ``"dfop"``, see :data:`node_parsers`.
+    """
+
+    names: T.Tuple[str, ...] = dataclasses.field()
+    req_names: T.Tuple[str, ...] = dataclasses.field()
+    opt_names: T.Tuple[str, ...] = dataclasses.field()
+    node_names: T.Tuple[str, ...] = dataclasses.field()
+    node_shapes: T.Tuple[str, ...] = dataclasses.field()
+    node_kinds: T.Tuple[str, ...] = dataclasses.field()
+
+    @classmethod
+    def from_class(cls, klass: T.Type["BaseModel"]) -> "FieldSpec":
+        names, req_names, opt_names = [], [], []
+        node_names, node_shapes, node_kinds = [], [], []
+        for field in dataclasses.fields(klass):
+            names.append(field.name)
+            if isinstance(field.default, _REQUIRED):
+                req_names.append(field.name)
+            else:
+                opt_names.append(field.name)
+            hint = _find_node_hint(field.type)
+            if hint is not None:
+                node_names.append(field.name)
+                node_shapes.append(hint[0])
+                node_kinds.append(hint[1])
+        return cls(
+            names=tuple(names),
+            req_names=tuple(req_names),
+            opt_names=tuple(opt_names),
+            node_names=tuple(node_names),
+            node_shapes=tuple(node_shapes),
+            node_kinds=tuple(node_kinds),
+        )
+
+
+_field_spec_cache: T.Dict[T.Type["BaseModel"], FieldSpec] = dict()
+
+#: the class mapping of each kind of child node, for example ``"expr"`` maps
+#: to :data:`jsonpolars.base_expr.expr_enum_to_klass_mapping`.
+node_klass_mappings: T.Dict[str, T.Dict[str, T.Type["BaseModel"]]] = dict()
+
+T_DECODER = T.Callable[[T_KWARGS], "BaseModel"]
+
+# maps the intern key to the shared instance, see :func:`decode`
+T_INTERN_TABLE = T.Dict[T.Any, "BaseModel"]
+
+_decoder_cache: T.Dict[T.Type["BaseModel"], T_DECODER] = dict()
+
+
+T_CONVERT = T.Callable[[T_KWARGS, str], "BaseModel"]
+
+
+def _convert_children(value: T.Any, shape: str, kind: str, convert: T_CONVERT):
+    """
+    Convert the child node dicts of a node field to nodes, other values such
+    as column names and python literals are kept as they are.
+    """
+    if shape == "one":
+        if value.__class__ is dict:
+            return convert(value, kind)
+    elif shape == "list":
+        if value.__class__ is list or value.__class__ is tuple:
+            return [convert(v, kind) if v.__class__ is dict else v for v in value]
+    elif value.__class__ is dict:
+        return {
+            k: convert(v, kind) if v.__class__ is dict else v
+            for k, v in value.items()
+        }
+    return value
+
+
+class Decoder:
+    """
+    The precompiled decoder of a ``BaseModel`` subclass. The field layout
+    and the child node fields are resolved only once, so decoding a dict is
+    just a few dict lookups and one constructor call.
+
+    Child node dicts are decoded recursively, which is the fastest. Sub trees
+    below :data:`MAX_RECURSION_DEPTH` are decoded in post order with an
+    explicit stack instead, so a plan of any depth can be parsed in linear
+    time.
+    """
+
+    def __init__(self, klass: T.Type["BaseModel"]):
+        spec = klass.get_field_spec()
+        node_fields = {
+            name: (shape, kind)
+            for name, shape, kind in zip(
+                spec.node_names, spec.node_shapes, spec.node_kinds
+            )
+        }
+        self.klass = klass
+        self.req_fields = tuple(
+            (name, *node_fields.get(name, (None, None))) for name in spec.req_names
+        )
+        self.opt_fields = tuple(
+            (name, *node_fields.get(name, (None, None))) for name in spec.opt_names
+        )
+        self.node_fields = tuple(
+            zip(spec.node_names, spec.node_shapes, spec.node_kinds)
+        )
+
+    def iter_children(self, dct: T_KWARGS) -> T.Iterable[T.Tuple[T_KWARGS, str]]:
+        """
+        Yield the child node dicts of ``dct`` and their kind.
+        """
+        for name, shape, kind in self.node_fields:
+            value = dct.get(name)
+            if value.__class__ is dict:
+                if shape == "dict":
+                    for v in value.values():
+                        if v.__class__ is dict:
+                            yield v, kind
+                elif shape == "one":
+                    yield value, kind
+            elif shape == "list" and (
+                value.__class__ is list or value.__class__ is tuple
+            ):
+                for v in value:
+                    if v.__class__ is dict:
+                        yield v, kind
+
+    def build(self, dct: T_KWARGS, convert: T_CONVERT) -> "BaseModel":
+        """
+        Create the instance, ``convert`` turns a child node dict and its kind
+        into the child node.
+        """
+        kwargs = dict()
+        for name, shape, kind in self.req_fields:
+            try:
+                value = dct[name]
+            except KeyError:
+                raise ParamError(
+                    f"{name!r} is a required parameter for {self.klass}!"
+                )
+            if shape is not None:
+                value = _convert_children(value, shape, kind, convert)
+            kwargs[name] = value
+        for name, shape, kind in self.opt_fields:
+            try:
+                value = dct[name]
+            except KeyError:
+                continue
+            if value.__class__ is not _NOTHING:
+                if shape is not None:
+                    value = _convert_children(value, shape, kind, convert)
+                kwargs[name] = value
+        return self.klass(**kwargs)
+
+    def __call__(self, dct: T_KWARGS) -> "BaseModel":
+        return self.build(dct, _recursive_convert)
+
+    def decode_iteratively(
+        self,
+        root: T_KWARGS,
+        intern_table: T.Optional[T_INTERN_TABLE] = None,
+    ) -> "BaseModel":
+        """
+        Decode with an explicit stack, child node dicts are decoded in post
+        order before their parent.
+
+        :param intern_table: optional, see :func:`decode`.
+        """
+        results: T.Dict[int, "BaseModel"] = dict()
+
+        def convert(dct: T_KWARGS, kind: str) -> "BaseModel":
+            return results[id(dct)]
+
+        # (node dict, its kind, its decoder, whether its children are decoded)
+        stack = [(root, None, self, False)]
+        while stack:
+            dct, kind, decoder, expanded = stack.pop()
+            if expanded:
+                node = decoder.build(dct, convert)
+            else:
+                if decoder is None:
+                    decoder = node_klass_mappings[kind][dct["type"]].get_decoder()
+                if decoder.__class__ is Decoder:
+                    stack.append((dct, kind, decoder, True))
+                    for child, child_kind in decoder.iter_children(dct):
+                        stack.append((child, child_kind, None, False))
+                    continue
+                node = decoder(dct)  # the class has its own from_dict
+            if intern_table is not None:
+                node = _intern(node, intern_table)
+            results[id(dct)] = node
+        return results[id(root)]
+
+
+def decode(
+    dct: T_KWARGS,
+    kind: str,
+    intern: T.Union[bool, T_INTERN_TABLE] = False,
+) -> "BaseModel":
+    """
+    Decode a node dict of the given kind, for example ``"expr"``, see
+    :data:`node_klass_mappings`.
+
+    :param intern: if True, structurally equal sub trees are decoded into the
+        same shared instance, it is also known as hash-consing. It saves
+        memory when the same sub trees repeat a lot, and a shared sub tree is
+        lowered to ``pl.Expr`` only once, see
+        :func:`jsonpolars.base_expr.lowering_scope`. Pass a dict to share the
+        instances across many calls, the dict holds the shared instances.
+
+    .. note::
+
+        The shared instances are frozen, see :meth:`BaseModel.freeze`,
+        assigning a field raises ``dataclasses.FrozenInstanceError``. Use
+        ``dataclasses.replace`` to create a modified copy.
+    """
+    decoder = node_klass_mappings[kind][dct["type"]].get_decoder()
+    if intern is False:
+        return decoder(dct)
+    intern_table = dict() if intern is True else intern
+    if decoder.__class__ is Decoder:
+        return decoder.decode_iteratively(dct, intern_table)
+    return _intern(decoder(dct), intern_table)
+
+
+def _freeze(value: T.Any) -> T.Hashable:
+    if isinstance(value, BaseModel):
+        # the child nodes are already interned, the identity is enough
+        return id(value)
+    elif isinstance(value, (list, tuple)):
+        return (type(value), tuple([_freeze(v) for v in value]))
+    elif isinstance(value, dict):
+        return (dict, tuple([(k, _freeze(v)) for k, v in value.items()]))
+    else:
+        # ``1``, ``1.0`` and ``True`` are equal but not the same literal
+        return (type(value), value)
+
+
+def _intern(node: "BaseModel", intern_table: T_INTERN_TABLE) -> "BaseModel":
+    """
+    Return the shared instance that is structurally equal to ``node``.
+    """
+    key = (
+        node.__class__,
+        tuple([_freeze(getattr(node, name)) for name in node.get_field_spec().names]),
+    )
+    try:
+        node = intern_table.setdefault(key, node)
+    except TypeError:  # a field value is not hashable
+        return node
+    # the shared instance is frozen, mutating it would change all its parents
+    return node.freeze()
+
+
+#: sub trees deeper than this are processed with an explicit stack instead of
+#: recursion. Recursion is faster, the explicit stack never hits the
+#: ``RecursionError``.
+MAX_RECURSION_DEPTH = 64
+
+
+def _make_recursive_convert(depth: int) -> T_CONVERT:
+    def convert(dct: T_KWARGS, kind: str) -> "BaseModel":
+        decoder = node_klass_mappings[kind][dct["type"]].get_decoder()
+        if decoder.__class__ is not Decoder:  # the class has its own from_dict
+            return decoder(dct)
+        if depth > MAX_RECURSION_DEPTH:
+            return decoder.decode_iteratively(dct)
+        return decoder.build(dct, next_convert)
+
+    if depth <= MAX_RECURSION_DEPTH:
+        next_convert = _make_recursive_convert(depth + 1)
+    return convert
+
+
+# the convert function of each depth is created once, so that decoding doesn't
+# have to create a closure per node
+_recursive_convert = _make_recursive_convert(1)
+
+
+_LEAF_TYPES = {str, int, float, bool, type(None)}
+
+
+def to_dict(inst: T.Any) -> T.Any:
+    """
+    Convert a ``BaseModel`` instance, or a list / tuple / dict of them, to
+    python builtin objects. The ``NA`` values are removed.
+    """
+    return _to_dict(inst, 0)
+
+
+def _node_to_dict(node: "BaseModel", depth: int) -> T_KWARGS:
+    dct = dict()
+    for name in node.get_field_spec().names:
+        value = getattr(node, name)
+        if value.__class__ in _LEAF_TYPES:
+            dct[name] = value
+        elif value.__class__ is not _NOTHING:
+            dct[name] = _to_dict(value, depth)
+    return node._post_to_dict(dct)
+
+
+def _to_dict(obj: T.Any, depth: int) -> T.Any:
+    if obj.__class__ in _LEAF_TYPES:
+        return obj
+    if depth > MAX_RECURSION_DEPTH:
+        return _to_dict_iteratively(obj)
+    depth += 1
+    if isinstance(obj, BaseModel):
+        if obj.__class__.to_dict is not BaseModel.to_dict:
+            return obj.to_dict()
+        return _node_to_dict(obj, depth)
+    elif isinstance(obj, (list, tuple)):
+        return type(obj)([_to_dict(v, depth) for v in obj])
+    elif isinstance(obj, dict):
+        dct = dict()
+        for k, v in obj.items():
+            v = _to_dict(v, depth)
+            if v.__class__ is not _NOTHING:
+                dct[k] = v
+        return dct
+    else:
+        return obj
+
+
+def _to_dict_iteratively(inst: T.Any) -> T.Any:
+    holder = [None]
+    # an item is either (value, output list, output index),
+    # or (source object, dict keys, converted values, output list, output index)
+    # that is pushed before the children of the source object
+    stack = [(inst, holder, 0)]
+    while stack:
+        item = stack.pop()
+        if len(item) == 5:  # all children of the source object are converted
+            obj, keys, values, out, i = item
+            if keys is None:
+                out[i] = type(obj)(values)
+            else:
+                dct = {
+                    k: v for k, v in zip(keys, values) if v.__class__ is not _NOTHING
+                }
+                if isinstance(obj, BaseModel):
+                    dct = obj._post_to_dict(dct)
+                out[i] = dct
+            continue
+        obj, out, i = item
+        if isinstance(obj, BaseModel):
+            if obj.__class__.to_dict is not BaseModel.to_dict:
+                out[i] = obj.to_dict()
+                continue
+            keys = list(obj.get_field_spec().names)
+            values = [getattr(obj, name) for name in keys]
+        elif isinstance(obj, (list, tuple)):
+            keys, values = None, list(obj)
+        elif isinstance(obj, dict):
+            keys, values = list(obj), list(obj.values())
+        else:
+            out[i] = obj
+            continue
+        stack.append((obj, keys, values, out, i))
+        for j, child in enumerate(values):
+            if child.__class__ not in _LEAF_TYPES:
+                stack.append((child, values, j))
+    return holder[0]
+
+
+def iter_child_nodes(node: "BaseModel") -> T.Iterable["BaseModel"]:
+    """
+    Yield the ``BaseModel`` instances held by the fields of ``node``,
+    including the ones in a list / tuple / dict.
+    """
+    stack = [getattr(node, name) for name in reversed(node.get_field_spec().names)]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, BaseModel):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            stack.extend(reversed(value))
+        elif isinstance(value, dict):
+            stack.extend(reversed(list(value.values())))
+
+
+def iter_post_order(
+    root: "BaseModel",
+    is_done: T.Optional[T.Callable[["BaseModel"], bool]] = None,
+) -> T.Iterable["BaseModel"]:
+    """
+    Yield ``root`` and all of its descendant nodes in post order, children
+    first. A node that is shared by many parents is yielded only once.
+
+    :param is_done: optional, a node that ``is_done`` returns True for is
+        skipped together with its descendants.
+    """
+    seen = set()
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node
+            continue
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if is_done is not None and is_done(node):
+            continue
+        stack.append((node, True))
+        for child in iter_child_nodes(node):
+            if id(child) not in seen:
+                stack.append((child, False))
+
+
+def _replace_children(value: T.Any, new_nodes: T.Dict[int, "BaseModel"]) -> T.Any:
+    if isinstance(value, BaseModel):
+        return new_nodes.get(id(value), value)
+    if isinstance(value, (list, tuple)):
+        new_value = [_replace_children(v, new_nodes) for v in value]
+        if all(a is b for a, b in zip(new_value, value)):
+            return value
+        return type(value)(new_value)
+    if isinstance(value, dict):
+        new_value = {k: _replace_children(v, new_nodes) for k, v in value.items()}
+        if all(new_value[k] is v for k, v in value.items()):
+            return value
+        return new_value
+    return value
+
+
+def rewrite(
+    root: "BaseModel",
+    func: T.Callable[["BaseModel"], "BaseModel"],
+    is_done: T.Optional[T.Callable[["BaseModel"], bool]] = None,
+) -> "BaseModel":
+    """
+    Rewrite a tree bottom up. ``func`` is called on each node after its
+    children are rewritten, and gives back the node itself or its
+    replacement.
+
+    The nodes are never modified, a node whose children changed is copied.
+    A node that is shared by many parents is rewritten only once.
+
+    :param is_done: optional, ``func`` is called on a node that ``is_done``
+        returns True for as it is, its descendants are not rewritten.
+    """
+    new_nodes: T.Dict[int, "BaseModel"] = dict()
+
+    def _is_done(node: "BaseModel") -> bool:
+        if is_done(node):
+            new_nodes[id(node)] = func(node)
+            return True
+        return False
+
+    for node in iter_post_order(root, None if is_done is None else _is_done):
+        changes = dict()
+        for name in node.get_field_spec().names:
+            value = getattr(node, name)
+            new_value = _replace_children(value, new_nodes)
+            if new_value is not value:
+                changes[name] = new_value
+        new_node = dataclasses.replace(node, **changes) if changes else node
+        new_nodes[id(node)] = func(new_node)
+    return new_nodes[id(root)]
+
+
+def _has_fingerprint(node: "BaseModel") -> bool:
+    return getattr(node, "_fingerprint", None) is not None
+
+
+def _fingerprint_value(value: T.Any, fps: T.Dict[int, str]) -> str:
+    """
+    :param fps: the fingerprints of the unfrozen descendant nodes by id, a
+        frozen node uses its memoized one.
+    """
+    if isinstance(value, BaseModel):
+        fp = getattr(value, "_fingerprint", None)
+        return fps[id(value)] if fp is None else fp
+    elif isinstance(value, list):
+        return "[" + ",".join([_fingerprint_value(v, fps) for v in value]) + "]"
+    elif isinstance(value, tuple):
+        return "(" + ",".join([_fingerprint_value(v, fps) for v in value]) + ")"
+    elif isinstance(value, dict):
+        # the key order matters, for example the order of ``named_exprs``
+        # decides the column order of the output DataFrame
+        return (
+            "{"
+            + ",".join(
+                [f"{k!r}:{_fingerprint_value(v, fps)}" for k, v in value.items()]
+            )
+            + "}"
+        )
+    else:
+        return f"{type(value).__name__}:{value!r}"
+
+
+def _iter_functions(value: T.Any) -> T.Iterable[T.Callable]:
+    if isinstance(value, (classmethod, staticmethod)):
+        value = value.__func__
+    if isinstance(value, property):
+        yield from (f for f in (value.fget, value.fset, value.fdel) if f is not None)
+        return
+    while value is not None:
+        yield value
+        value = getattr(value, "__wrapped__", None)
+
+
+_HAS_FACTORY = object()
+
+
+def _make_init(cls: T.Type["BaseModel"]) -> T.Optional[T.Callable]:
+    """
+    Create the same ``__init__`` as the one generated by
+    ``@dataclasses.dataclass`` for a slotted class, but assign the fields with
+    the ``__set__`` of the slot descriptors. It skips the frozen check of
+    :meth:`BaseModel.__setattr__`, a new instance is never frozen, and it is
+    faster than ``object.__setattr__``.
+
+    Return None if the class has a field that this function doesn't handle.
+    """
+    namespace = {"_HAS_FACTORY": _HAS_FACTORY}
+    params, lines = list(), list()
+    for field in dataclasses.fields(cls):
+        name = field.name
+        slot = getattr(cls, name, None)
+        if (
+            field.init is False
+            or name == "self"
+            or not isinstance(slot, types.MemberDescriptorType)
+        ):  # pragma: no cover
+            return None
+        namespace[f"_set_{name}"] = slot.__set__
+        if field.default is not dataclasses.MISSING:
+            namespace[f"_default_{name}"] = field.default
+            params.append(f"{name}=_default_{name}")
+            value = name
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"_factory_{name}"] = field.default_factory
+            params.append(f"{name}=_HAS_FACTORY")
+            value = f"_factory_{name}() if {name} is _HAS_FACTORY else {name}"
+        else:
+            params.append(name)
+            value = name
+        lines.append(f"    _set_{name}(self, {value})")
+    lines.append("    self.__post_init__()")
+    source = f"def __init__(self, {', '.join(params)}):\n" + "\n".join(lines)
+    exec(source, namespace)
+    init = namespace["__init__"]
+    init.__qualname__ = f"{cls.__qualname__}.__init__"
+    return init
+
+
+def slotted(cls: T.Type["BaseModel"]) -> T.Type["BaseModel"]:
+    """
+    Class decorator to recreate a dataclass with ``__slots__``, so the
+    instances don't carry a per instance ``__dict__``. It is the backport of
+    ``@dataclasses.dataclass(slots=True)`` that requires Python 3.10+. Put
+    it above ``@dataclasses.dataclass``.
+
+    Example::
+
+        @slotted
+        @dataclasses.dataclass
+        class Column(BaseExpr):
+            ...
+    """
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        inherited.update(base.__dict__.get("__slots__", ()))
+    names = [field.name for field in dataclasses.fields(cls)]
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = tuple(name for name in names if name not in inherited)
+    new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    new_cls.__qualname__ = cls.__qualname__
+    init = _make_init(new_cls)
+    if init is not None:
+        new_cls.__init__ = init
+    # the zero argument ``super()`` looks up the class from the ``__class__``
+    # cell of the method, point it to the new class.
+    for value in namespace.values():
+        for func in _iter_functions(value):
+            for cell in getattr(func, "__closure__", None) or ():
+                try:
+                    if cell.cell_contents is cls:
+                        cell.cell_contents = new_cls
+                except ValueError:  # empty cell
+                    pass
+    return new_cls
 
 
 @dataclasses.dataclass
 class BaseModel:
+    __slots__ = ("_fingerprint",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # ``@dataclasses.dataclass`` would generate a field by field ``__eq__``
+        # and set ``__hash__`` to None on every subclass. Setting them before
+        # the decorator runs keeps the structural equality and hash.
+        if "__eq__" not in cls.__dict__:
+            cls.__eq__ = BaseModel.__eq__
+        if "__hash__" not in cls.__dict__:
+            cls.__hash__ = BaseModel.__hash__
+
+    @classmethod
+    def get_field_spec(cls) -> FieldSpec:
+        try:
+            return _field_spec_cache[cls]
+        except KeyError:
+            spec = FieldSpec.from_class(cls)
+            _field_spec_cache[cls] = spec
+            return spec
+
     def _validate(self):
-        for field in dataclasses.fields(self.__class__):
-            if field.init:
-                k = field.name
-                if getattr(self, k) is REQ:  # pragma: no cover
-                    raise ParamError(f"Field {k!r} is required for {self.__class__}.")
+        for k in self.get_field_spec().req_names:
+            if getattr(self, k) is REQ:  # pragma: no cover
+                raise ParamError(f"Field {k!r} is required for {self.__class__}.")
 
     def __post_init__(self):
         self._validate()
 
+    def __setattr__(self, name: str, value: T.Any):
+        if getattr(self, "_fingerprint", None) is not None:
+            raise dataclasses.FrozenInstanceError(
+                f"cannot assign to field {name!r}, {self.__class__.__name__} "
+                f"is frozen, use dataclasses.replace to create a modified copy."
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        if getattr(self, "_fingerprint", None) is not None:
+            raise dataclasses.FrozenInstanceError(
+                f"cannot delete field {name!r}, "
+                f"{self.__class__.__name__} is frozen."
+            )
+        object.__delattr__(self, name)
+
+    def __setstate__(self, state):
+        # pickle and copy restore the fields of a frozen node together with
+        # its memoized fingerprint, bypass the frozen check
+        if isinstance(state, tuple):
+            dict_state, slots_state = state
+        else:
+            dict_state, slots_state = state, None
+        for dct in (dict_state, slots_state):
+            if dct:
+                for k, v in dct.items():
+                    object.__setattr__(self, k, v)
+
+    @property
+    def is_frozen(self) -> bool:
+        return getattr(self, "_fingerprint", None) is not None
+
+    def freeze(self) -> "BaseModel":
+        """
+        Make this node and all of its descendant nodes immutable and memoize
+        their fingerprints, assigning a field of a frozen node raises
+        ``dataclasses.FrozenInstanceError``. Returns the node itself.
+
+        Interned nodes (see :func:`decode`) are shared by many parents and
+        are always frozen. Only a frozen node is hashable, :meth:`__hash__`
+        raises ``TypeError`` on a mutable node.
+
+        .. note::
+
+            The list / dict values of a frozen node must not be mutated in
+            place either, they are part of the memoized fingerprint.
+        """
+        if getattr(self, "_fingerprint", None) is None:
+            # freeze the descendants first, so that the fingerprint of each
+            # node only looks at the memoized ones of its children.
+            for node in iter_post_order(self, _has_fingerprint):
+                object.__setattr__(node, "_fingerprint", node._compute_fingerprint())
+        return self
+
+    def fingerprint(self) -> str:
+        """
+        Return a stable structural fingerprint of this node.
+
+        The fingerprint of a node combines the value of each field, child
+        nodes contribute their own fingerprint. It is consistent across
+        processes, so it can be used as a cache key, to dedup sub trees, or to
+        detect the change of a plan.
+
+        The fingerprint of a frozen node is memoized, see :meth:`freeze`. A
+        mutable node is fingerprinted again on each call, so it always
+        reflects the current field values.
+        """
+        fp = getattr(self, "_fingerprint", None)
+        if fp is not None:
+            return fp
+        fps: T.Dict[int, str] = dict()
+        for node in iter_post_order(self, _has_fingerprint):
+            fps[id(node)] = node._compute_fingerprint(fps)
+        return fps[id(self)]
+
+    def _compute_fingerprint(self, fps: T.Optional[T.Dict[int, str]] = None) -> str:
+        if fps is None:
+            fps = dict()
+        parts = list()
+        for name in self.get_field_spec().names:
+            value = getattr(self, name)
+            parts.append(f"{name}={_fingerprint_value(value, fps)}")
+        text = "\x00".join(parts)
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.fingerprint() == other.fingerprint()
+
+    def __hash__(self):
+        # a hashed node must not change, otherwise it is lost in the set or
+        # dict that holds it, so only a frozen node is hashable.
+        fp = getattr(self, "_fingerprint", None)
+        if fp is None:
+            raise TypeError(
+                f"unhashable mutable {self.__class__.__name__}, "
+                f"call freeze() before using it as a set item or a dict key."
+            )
+        return hash(fp)
+
+    @classmethod
+    def get_decoder(cls) -> T_DECODER:
+        """
+        Get the function that creates an instance of this class from a dict.
+
+        If the class doesn't override :meth:`from_dict`, it is a decoder
+        precompiled from the :class:`FieldSpec` of the class. It parses the
+        child node dicts in the node fields and drops the ``NA`` values.
+        """
+        try:
+            return _decoder_cache[cls]
+        except KeyError:
+            if cls.from_dict.__func__ is BaseModel.from_dict.__func__:
+                decoder = Decoder(cls)
+            else:
+                decoder = cls.from_dict
+            _decoder_cache[cls] = decoder
+            return decoder
+
     def to_dict(self) -> T_KWARGS:
-        raise NotImplementedError
+        """
+        Convert the instance to a dict. This dict can be used in the
+        ``from_dict`` method to create a identical instance.
+        """
+        return _node_to_dict(self, 1)
+
+    def _post_to_dict(self, dct: T_KWARGS) -> T_KWARGS:
+        """
+        Adjust the dict created by :meth:`to_dict`, for example to convert a
+        polars data type to its name. Override this method instead of
+        ``to_dict``, so that serializing a deep tree doesn't recurse.
+        """
+        return dct
 
     @classmethod
     def from_dict(cls, dct: T_KWARGS):
-        raise NotImplementedError
+        """
+        Create an instance from either a human created dict, or a dict created
+        by the ``to_dict`` method.
+        """
+        return cls.get_decoder()(dct)
 
     @classmethod
     def _split_req_opt(cls, kwargs: T_KWARGS) -> T.Tuple[T_KWARGS, T_KWARGS]:
+        spec = cls.get_field_spec()
         req_kwargs, opt_kwargs = dict(), dict()
-        for field in dataclasses.fields(cls):
-            if isinstance(field.default, _REQUIRED):
-                try:
-                    req_kwargs[field.name] = kwargs[field.name]
-                except KeyError:
-                    raise ParamError(
-                        f"{field.name!r} is a required parameter for {cls}!"
-                    )
-            else:
-                try:
-                    opt_kwargs[field.name] = kwargs[field.name]
-                except KeyError:
-                    pass
-        opt_kwargs = rm_na(**opt_kwargs)
+        for name in spec.req_names:
+            try:
+                req_kwargs[name] = kwargs[name]
+            except KeyError:
+                raise ParamError(f"{name!r} is a required parameter for {cls}!")
+        for name in spec.opt_names:
+            try:
+                value = kwargs[name]
+            except KeyError:
+                continue
+            if value.__class__ is not _NOTHING:
+                opt_kwargs[name] = value
         return req_kwargs, opt_kwargs
@@ -0,0 +1,518 @@
+# -*- coding: utf-8 -*-
+
+"""
+Optimizer passes that rewrite a jsonpolars tree into a smaller equivalent
+tree. A pass never modifies its input, it gives back a new tree that
+serializes with ``to_dict`` like any other tree.
+
+Example::
+
+    >>> from jsonpolars.optimize import fold_constants, eliminate_common_subexprs
+    >>> fold_constants(Plus(left=Lit(value=1), right=Lit(value=2)))
+    Lit(value=3)
+    >>> eliminate_common_subexprs([WithColumns(named_exprs={"a": x, "b": x})])
+    [WithColumns(named_exprs={"__cse_...": x}), WithColumns(...), Drop(...)]
+    >>> merge_adjacent_dfops([WithColumns(named_exprs={"a": x}), WithColumns(named_exprs={"b": y})])
+    [WithColumns(named_exprs={"a": x, "b": y})]
+"""
+
+import typing as T
+import math
+from collections import Counter
+
+import polars as pl
+
+from .arg import NA
+from .model import BaseModel, iter_child_nodes, iter_post_order, rewrite
+from .base_expr import ExprEnum, BaseExpr
+from .base_dfop import DfopEnum
+from .utils_expr import polars_dtype_to_str_mapping
+from .utils_dfop import T_PLAN, to_dfop_list
+from .expr.function import Lit
+from .expr.column import Column, Alias
+from .dfop.manipulation import Select, WithColumns, Drop
+from .analysis import find_expr_columns
+from .slices import _is_row_local_dfop
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .expr.api import T_EXPR
+    from .dfop.api import T_DFOP
+
+T_NODE = T.TypeVar("T_NODE", bound=BaseModel)
+
+# a folded value must serialize to JSON
+_JSON_SCALAR_TYPES = {bool, int, float, str, type(None)}
+
+# these never evaluate without an input frame
+_NOT_CONSTANT_TYPES = {
+    ExprEnum.column.value,
+    ExprEnum.func_element.value,
+    ExprEnum.func_lit.value,
+}
+
+# the expressions that always give back a boolean
+_BOOLEAN_TYPES = {
+    ExprEnum.eq.value,
+    ExprEnum.ne.value,
+    ExprEnum.gt.value,
+    ExprEnum.ge.value,
+    ExprEnum.lt.value,
+    ExprEnum.le.value,
+    ExprEnum.and_.value,
+    ExprEnum.or_.value,
+    ExprEnum.str_contains.value,
+    ExprEnum.str_starts_with.value,
+    ExprEnum.str_ends_with.value,
+}
+
+
+def _is_lit(value: T.Any) -> bool:
+    return isinstance(value, BaseExpr) and value.type == ExprEnum.func_lit.value
+
+
+def _is_bool_lit(value: T.Any, flag: bool) -> bool:
+    if value is flag:
+        return True
+    return (
+        _is_lit(value)
+        and value.value is flag
+        and value.dtype in (NA, "Boolean", pl.Boolean)
+    )
+
+
+def _output_name(node: "T_EXPR") -> T.Optional[str]:
+    try:
+        return node.to_polars().meta.output_name(raise_if_undetermined=False)
+    except Exception:  # pragma: no cover
+        return None
+
+
+def _evaluate(node: "T_EXPR") -> T.Optional[Lit]:
+    """
+    Evaluate a node of literals with polars, and give back the equivalent
+    ``Lit``, or None if it cannot be folded.
+    """
+    try:
+        series = pl.select(node.to_polars()).to_series()
+    except Exception:
+        return None
+    if len(series) != 1 or series.name != "literal":
+        return None
+    value = series[0]
+    if value.__class__ not in _JSON_SCALAR_TYPES:
+        return None
+    # inf and nan are not valid JSON numbers
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    # a Lit without dtype is a dynamic literal, it takes the type of the
+    # other operand, so the dtype is kept if it was fixed by the sub tree
+    pinned = node.type == ExprEnum.cast.value or any(
+        child.dtype is not NA for child in iter_child_nodes(node) if _is_lit(child)
+    )
+    lit = Lit(value=value)
+    if pinned or pl.select(lit.to_polars()).to_series().dtype != series.dtype:
+        dtype_name = polars_dtype_to_str_mapping.get(series.dtype.base_type())
+        if dtype_name is None or series.dtype.is_nested():
+            return None
+        lit = Lit(value=value, dtype=getattr(dtype_name, "value", dtype_name))
+        if pl.select(lit.to_polars()).to_series().dtype != series.dtype:
+            return None
+    return lit
+
+
+def _simplify_logical(node: "T_EXPR") -> "T_EXPR":
+    """
+    ``x & True`` and ``x | False`` are ``x`` if ``x`` is a boolean.
+    """
+    if node.type == ExprEnum.and_.value:
+        identity = True
+    elif node.type == ExprEnum.or_.value:
+        identity = False
+    else:
+        return node
+    for this, other in [(node.left, node.right), (node.right, node.left)]:
+        if (
+            _is_bool_lit(this, identity)
+            and isinstance(other, BaseExpr)
+            and other.type in _BOOLEAN_TYPES
+        ):
+            name = _output_name(node)
+            if name is not None and _output_name(other) != name:
+                return Alias(name=name, expr=other)
+            return other
+    return node
+
+
+def _fold_node(node: BaseModel) -> BaseModel:
+    if not isinstance(node, BaseExpr):
+        return node
+    node = _simplify_logical(node)
+    if (
+        node.type in _NOT_CONSTANT_TYPES
+        or node.row_local is False
+        or not all(_is_lit(child) for child in iter_child_nodes(node))
+    ):
+        return node
+    lit = _evaluate(node)
+    return node if lit is None else lit
+
+
+def fold_constants(node: T_NODE) -> T_NODE:
+    """
+    Fold the sub trees made only of literals into a single ``Lit``, and
+    simplify ``x & True`` and ``x | False`` of a boolean ``x`` into ``x``.
+
+    A sub tree is folded only if polars evaluates it to one JSON serializable
+    value of the same type, so the folded tree gives back the same result.
+
+    :param node: an expression, or a dfop whose expressions are folded.
+    """
+    return rewrite(node, _fold_node)
+
+
+# a sub tree of these is never worth a temporary column
+_TRIVIAL_TYPES = {
+    ExprEnum.column.value,
+    ExprEnum.func_lit.value,
+    ExprEnum.alias.value,
+}
+
+#: the prefix of the temporary columns of :func:`eliminate_common_subexprs`
+CSE_PREFIX = "__cse_"
+
+
+def _iter_exprs(dfop: "T_DFOP") -> T.Iterable["T_EXPR"]:
+    for ex in list(dfop.exprs) + list(dfop.named_exprs.values()):
+        if isinstance(ex, BaseExpr):
+            yield ex
+
+
+def _iter_occurrences(
+    root: "T_EXPR",
+    is_done: T.Callable[["T_EXPR"], bool],
+) -> T.Iterable["T_EXPR"]:
+    """
+    Yield each occurrence of the sub trees in pre order, a shared node is
+    yielded each time it occurs. The descendants of a node that ``is_done``
+    returns True for, and of a ``ListEval``, are skipped.
+    """
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        if is_done(node) or node.type == ExprEnum.list_eval.value:
+            continue
+        stack.extend(
+            child for child in iter_child_nodes(node) if isinstance(child, BaseExpr)
+        )
+
+
+def _get_fingerprints(root: BaseModel) -> T.Callable[[BaseModel], str]:
+    fps: T.Dict[int, str] = dict()
+    for node in iter_post_order(root, lambda n: n.is_frozen):
+        fps[id(node)] = node._compute_fingerprint(fps)
+    return lambda node: node.fingerprint() if node.is_frozen else fps[id(node)]
+
+
+def _is_cse_candidate(node: "T_EXPR") -> bool:
+    """
+    Only a row-local sub tree that reads a column is moved to a temporary
+    column, a temporary column of an aggregation or a literal is broadcast to
+    all the rows and would change the height of a ``Select``.
+    """
+    if node.type in _TRIVIAL_TYPES:
+        return False
+    reads_column = False
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if n.row_local is False or n.type == ExprEnum.func_element.value:
+            return False
+        if n.type == ExprEnum.column.value:
+            reads_column = True
+        if n.type == ExprEnum.list_eval.value:
+            # the expression to run is evaluated per list element
+            children = [n.expr]
+        else:
+            children = iter_child_nodes(n)
+        stack.extend(child for child in children if isinstance(child, BaseExpr))
+    return reads_column
+
+
+def _find_common_subexprs(
+    dfop: "T_DFOP",
+    get_fp: T.Callable[[BaseModel], str],
+) -> T.Dict[str, "T_EXPR"]:
+    """
+    Find the largest sub trees that occur more than once in the expressions
+    of a dfop, by fingerprint.
+    """
+    counts = Counter(
+        get_fp(node)
+        for ex in _iter_exprs(dfop)
+        for node in _iter_occurrences(ex, lambda n: False)
+    )
+    excluded = set()
+    while True:
+        chosen: T.Dict[str, T.List["T_EXPR"]] = dict()
+
+        def is_chosen(node: "T_EXPR") -> bool:
+            fp = get_fp(node)
+            if counts[fp] < 2 or fp in excluded or not _is_cse_candidate(node):
+                return False
+            chosen.setdefault(fp, []).append(node)
+            return True
+
+        for ex in _iter_exprs(dfop):
+            for _ in _iter_occurrences(ex, is_chosen):
+                pass
+        # a sub tree that only occurs once outside the chosen ones is not
+        # worth it, look into its children instead
+        single = {fp for fp, nodes in chosen.items() if len(nodes) < 2}
+        if not single:
+            return {fp: nodes[0] for fp, nodes in chosen.items()}
+        excluded.update(single)
+
+
+def _eliminate_in_dfop(dfop: "T_DFOP") -> T.List["T_DFOP"]:
+    if dfop.type not in (DfopEnum.select.value, DfopEnum.with_columns.value):
+        return [dfop]
+    # a wildcard or a regex would also pick the temporary columns
+    if any(
+        find_expr_columns(ex).all_columns
+        for ex in list(dfop.exprs) + list(dfop.named_exprs.values())
+    ):
+        return [dfop]
+    get_fp = _get_fingerprints(dfop)
+    common = _find_common_subexprs(dfop, get_fp)
+    replacements: T.Dict[str, "T_EXPR"] = dict()
+    temp_exprs: T.Dict[str, "T_EXPR"] = dict()
+    for fp, node in common.items():
+        name = _output_name(node)
+        if name is None:
+            continue
+        temp_name = f"{CSE_PREFIX}{fp[:16]}"
+        temp_exprs[temp_name] = node
+        # the alias keeps the output name, for example of a struct field
+        replacements[fp] = Alias(name=name, expr=Column(name=temp_name))
+    if not temp_exprs:
+        return [dfop]
+
+    # the original nodes to replace by id, rewrite passes them to replace as
+    # they are, the other nodes passed to replace may be new copies.
+    done: T.Dict[int, BaseModel] = dict()
+
+    def is_done(node: BaseModel) -> bool:
+        if not isinstance(node, BaseExpr):
+            return False
+        replacement = replacements.get(get_fp(node))
+        if replacement is not None:
+            done[id(node)] = replacement
+            return True
+        if node.type == ExprEnum.list_eval.value:
+            done[id(node)] = node
+            return True
+        return False
+
+    def replace(node: BaseModel) -> BaseModel:
+        return done.get(id(node), node)
+
+    new_dfops = [WithColumns(named_exprs=temp_exprs), rewrite(dfop, replace, is_done)]
+    if dfop.type == DfopEnum.with_columns.value:
+        new_dfops.append(Drop(columns=list(temp_exprs)))
+    return new_dfops
+
+
+def eliminate_common_subexprs(plan: T_PLAN) -> T.List["T_DFOP"]:
+    """
+    Compute the sub trees that occur more than once in the expressions of a
+    ``WithColumns`` or ``Select`` only once.
+
+    Each common sub tree is computed as a temporary column by a
+    ``WithColumns`` inserted before the dfop, the dfop reads the temporary
+    column instead, and a ``Drop`` after a ``WithColumns`` removes the
+    temporary columns again, so the result is the same.
+
+    Only the row-local sub trees that read a column are eliminated, and the
+    sub trees of a ``ListEval`` are left alone, they are evaluated per list
+    element. A dfop that reads ``"*"`` or a ``^...$`` regex is left alone,
+    it would also read the temporary columns.
+
+    .. note::
+
+        Polars already eliminates the common sub expressions of
+        ``DataFrame.with_columns``, ``DataFrame.select`` and of a lazy query
+        with the default optimizations, there the pass gives no speedup. It
+        only helps where the polars optimization is off, for example a lazy
+        query collected with ``comm_subexpr_elim=False``, or to make the
+        plan itself smaller.
+    """
+    new_dfops = list()
+    for dfop in to_dfop_list(plan):
+        new_dfops.extend(_eliminate_in_dfop(dfop))
+    return new_dfops
+
+
+def _get_output_names(dfop: "T_DFOP") -> T.Optional[T.List[str]]:
+    """
+    The output names of the expressions of a ``Select`` or ``WithColumns`` in
+    the output order, None if any of them is undetermined or duplicated.
+    """
+    names = [ex if isinstance(ex, str) else _output_name(ex) for ex in dfop.exprs]
+    names.extend(dfop.named_exprs)
+    if None in names or len(set(names)) != len(names):
+        return None
+    return names
+
+
+def _to_aliased_exprs(dfop: "T_DFOP") -> T.List[T.Union[str, "T_EXPR"]]:
+    """
+    The expressions of a dfop with the named expressions as ``Alias``, in the
+    output order.
+    """
+    exprs = list(dfop.exprs)
+    for name, ex in dfop.named_exprs.items():
+        if isinstance(ex, str):
+            ex = Column(name=ex)
+        exprs.append(Alias(name=name, expr=ex))
+    return exprs
+
+
+def _merge_with_columns(
+    first: "T_DFOP",
+    second: "T_DFOP",
+) -> T.Optional["T_DFOP"]:
+    """
+    Merge two ``WithColumns`` if the second one doesn't read nor replace a
+    column of the first one.
+    """
+    first_names = _get_output_names(first)
+    second_names = _get_output_names(second)
+    if first_names is None or second_names is None:
+        return None
+    if set(first_names).intersection(second_names):
+        return None
+    for ex in list(second.exprs) + list(second.named_exprs.values()):
+        expr_columns = find_expr_columns(ex)
+        if expr_columns.all_columns or expr_columns.columns.intersection(
+            first_names
+        ):
+            return None
+    # ``with_columns`` adds the positional expressions before the named ones
+    if first.named_exprs and second.exprs:
+        return WithColumns(
+            exprs=_to_aliased_exprs(first) + list(second.exprs),
+            named_exprs=dict(second.named_exprs),
+        )
+    return WithColumns(
+        exprs=list(first.exprs) + list(second.exprs),
+        named_exprs={**first.named_exprs, **second.named_exprs},
+    )
+
+
+def _rename_expr(expr_like: T.Union[str, "T_EXPR"], name: str) -> "T_EXPR":
+    if isinstance(expr_like, str):
+        return Alias(name=name, expr=Column(name=expr_like))
+    if expr_like.type == ExprEnum.alias.value:
+        return Alias(name=name, expr=expr_like.expr)
+    return Alias(name=name, expr=expr_like)
+
+
+def _fold_rename(select: "T_DFOP", rename: "T_DFOP") -> T.Optional["T_DFOP"]:
+    """
+    Fold a ``Rename`` into the aliases of the preceding ``Select``.
+    """
+    if not isinstance(rename.mapping, dict):
+        return None
+    names = _get_output_names(select)
+    # polars raises on a missing column, the error is kept
+    if names is None or not set(rename.mapping).issubset(names):
+        return None
+    new_names = [rename.mapping.get(name, name) for name in names]
+    if len(set(new_names)) != len(new_names):
+        return None
+    exprs = [
+        _rename_expr(ex, rename.mapping[name]) if name in rename.mapping else ex
+        for ex, name in zip(select.exprs, names)
+    ]
+    named_exprs = {
+        rename.mapping.get(name, name): ex for name, ex in select.named_exprs.items()
+    }
+    return Select(exprs=exprs, named_exprs=named_exprs)
+
+
+def _get_drop_names(drop: "T_DFOP") -> T.Optional[T.Set[str]]:
+    names = set()
+    for column in drop.columns:
+        if isinstance(column, BaseExpr) and column.type == ExprEnum.column.value:
+            column = column.name
+        if not isinstance(column, str) or column == "*" or column.startswith("^"):
+            return None
+        names.add(column)
+    return names
+
+
+def _collapse_drop(select: "T_DFOP", drop: "T_DFOP") -> T.Optional["T_DFOP"]:
+    """
+    Collapse a ``Drop`` into the preceding ``Select``, by removing the dropped
+    expressions from it.
+    """
+    names = _get_output_names(select)
+    drop_names = _get_drop_names(drop)
+    # polars raises on a missing column, the error is kept
+    if names is None or drop_names is None or not drop_names.issubset(names):
+        return None
+    new_select = Select(
+        exprs=[ex for ex, name in zip(select.exprs, names) if name not in drop_names],
+        named_exprs={
+            name: ex
+            for name, ex in select.named_exprs.items()
+            if name not in drop_names
+        },
+    )
+    # a dropped expression may decide the height of the frame, for example
+    # the other expressions are broadcast literals or aggregations
+    if not (_is_row_local_dfop(select) and _is_row_local_dfop(new_select)):
+        return None
+    return new_select
+
+
+def _merge_pair(first: "T_DFOP", second: "T_DFOP") -> T.Optional["T_DFOP"]:
+    if first.type == DfopEnum.with_columns.value:
+        if second.type == DfopEnum.with_columns.value:
+            return _merge_with_columns(first, second)
+    elif first.type == DfopEnum.select.value:
+        if second.type == DfopEnum.rename.value:
+            return _fold_rename(first, second)
+        if second.type == DfopEnum.drop.value:
+            return _collapse_drop(first, second)
+    return None
+
+
+def merge_adjacent_dfops(plan: T_PLAN) -> T.List["T_DFOP"]:
+    """
+    Merge adjacent dfops into fewer equivalent dfops, each of them runs as a
+    separate frame operation:
+
+    - consecutive ``WithColumns`` are merged if the second one doesn't read
+      nor replace a column of the first one.
+    - a ``Rename`` after a ``Select`` is folded into the aliases of the
+      ``Select``. A ``Rename`` after a ``WithColumns`` is not folded, even
+      if it only renames the columns the ``WithColumns`` computes: without
+      the input schema it is unknown whether such a column replaces an
+      input column, which keeps its position and would be left behind
+      under the old name by the folded ``WithColumns``.
+    - a ``Drop`` after a ``Select`` is collapsed into the ``Select``, if all
+      the expressions are row-local.
+
+    The dfops are merged from left to right, so a merged dfop is merged again
+    with the next one.
+    """
+    new_dfops: T.List["T_DFOP"] = list()
+    for dfop in to_dfop_list(plan):
+        merged = _merge_pair(new_dfops[-1], dfop) if new_dfops else None
+        if merged is None:
+            new_dfops.append(dfop)
+        else:
+            new_dfops[-1] = merged
+    return new_dfops
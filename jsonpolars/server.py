@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+"""
+A small HTTP daemon on localhost that serves precompiled plans.
+
+A plan is registered once by id, the daemon parses and compiles it and keeps
+the compiled callable in memory. A client posts an Arrow IPC stream to run
+the plan on, and gets back the result as an Arrow IPC stream, so a short
+lived client doesn't pay the parse and compile cost. The client
+:class:`jsonpolars.client.PlanClient` only imports the standard library,
+with :meth:`~jsonpolars.client.PlanClient.run_ipc` it doesn't pay the import
+time of polars either.
+
+The endpoints:
+
+- ``PUT /plans/{plan_id}``, the body is the JSON plan, a dfop dict or a list
+  of dfop dicts.
+- ``GET /plans``, the JSON list of the registered plan ids.
+- ``DELETE /plans/{plan_id}``
+- ``POST /plans/{plan_id}/run``, the body is the Arrow IPC stream of the
+  input frame, leave it empty if the plan starts with a source dfop. The
+  response is the Arrow IPC stream of the result.
+
+An error response has a JSON body ``{"error": "..."}``.
+
+Example::
+
+    $ python -m jsonpolars.server --port 8765
+
+    >>> from jsonpolars.client import PlanClient
+    >>> client = PlanClient(port=8765)
+    >>> client.register("top3", [{"type": "head", "n": 3}])
+    >>> client.run("top3", df)
+
+.. note::
+
+    The daemon has no authentication, it only listens on localhost, but any
+    local user can register and run plans. So the plans with source and sink
+    dfops, that read and write files, are rejected unless the daemon runs
+    with ``--allow-io``, then any local user can read and write any path the
+    daemon can reach.
+"""
+
+import typing as T
+import io
+import json
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import polars as pl
+
+from .exc import ParamError
+from .base_dfop import T_FRAME
+from .utils_dfop import T_PLAN, to_dfop_list
+from .dfop import api as dfop
+from .client import ARROW_STREAM_MIME, JSON_MIME
+from .client import PlanClient as PlanClient  # noqa: F401, re-export
+
+
+class PlanRegistry:
+    """
+    Thread safe mapping of plan id to the compiled plan.
+
+    :param allow_io: allow the plans with source and sink dfops, they read
+        and write any path the daemon can reach.
+    """
+
+    def __init__(self, allow_io: bool = False):
+        self.allow_io = allow_io
+        self._plans: T.Dict[str, T.Callable[[T_FRAME], T_FRAME]] = dict()
+        self._lock = threading.Lock()
+
+    def register(self, plan_id: str, plan: T_PLAN):
+        """
+        Parse and compile the plan, replace the plan of the same id.
+
+        :raises ParamError: if the plan has a source or sink dfop, and
+            ``allow_io`` is False.
+        """
+        dfops = to_dfop_list(plan)
+        if self.allow_io is False:
+            io_types = [op.type for op in dfops if op.is_source or op.is_sink]
+            if io_types:
+                raise ParamError(
+                    f"source and sink dfops are not allowed, got {io_types}"
+                )
+        func = dfop.Pipeline(dfops=dfops).compile()
+        with self._lock:
+            self._plans[plan_id] = func
+
+    def unregister(self, plan_id: str) -> bool:
+        with self._lock:
+            return self._plans.pop(plan_id, None) is not None
+
+    def list_ids(self) -> T.List[str]:
+        with self._lock:
+            return list(self._plans)
+
+    def __contains__(self, plan_id: str) -> bool:
+        with self._lock:
+            return plan_id in self._plans
+
+    def run(
+        self,
+        plan_id: str,
+        df: T.Optional[pl.DataFrame] = None,
+    ) -> pl.DataFrame:
+        """
+        :raises KeyError: if the plan id is not registered.
+        """
+        with self._lock:
+            func = self._plans[plan_id]
+        return func(df)
+
+
+def _split_path(path: str) -> T.List[str]:
+    return [part for part in path.split("?", 1)[0].split("/") if part]
+
+
+class PlanRequestHandler(BaseHTTPRequestHandler):
+    """
+    The request handler of :class:`PlanServer`.
+    """
+
+    server: "PlanServer"
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: T.Any):
+        self._send(status, json.dumps(data).encode("utf-8"), JSON_MIME)
+
+    def _send_error(self, status: int, e: T.Union[str, Exception]):
+        if isinstance(e, Exception):
+            e = f"{type(e).__name__}: {e}"
+        self._send_json(status, {"error": e})
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        if _split_path(self.path) == ["plans"]:
+            self._send_json(200, self.server.registry.list_ids())
+        else:
+            self._send_error(404, f"not found: {self.path}")
+
+    def do_PUT(self):
+        parts = _split_path(self.path)
+        if len(parts) != 2 or parts[0] != "plans":
+            self._send_error(404, f"not found: {self.path}")
+            return
+        try:
+            self.server.registry.register(parts[1], json.loads(self._read_body()))
+        except Exception as e:
+            self._send_error(400, e)
+            return
+        self._send_json(201, {"plan_id": parts[1]})
+
+    def do_DELETE(self):
+        parts = _split_path(self.path)
+        if (
+            len(parts) != 2
+            or parts[0] != "plans"
+            or not self.server.registry.unregister(parts[1])
+        ):
+            self._send_error(404, f"not found: {self.path}")
+            return
+        self._send_json(200, {"plan_id": parts[1]})
+
+    def do_POST(self):
+        parts = _split_path(self.path)
+        if len(parts) != 3 or parts[0] != "plans" or parts[2] != "run":
+            self._send_error(404, f"not found: {self.path}")
+            return
+        body = self._read_body()
+        if parts[1] not in self.server.registry:
+            self._send_error(404, f"plan not found: {parts[1]}")
+            return
+        try:
+            df = pl.read_ipc_stream(io.BytesIO(body)) if body else None
+            result = self.server.registry.run(parts[1], df)
+        except Exception as e:
+            self._send_error(400, e)
+            return
+        try:
+            buffer = io.BytesIO()
+            result.write_ipc_stream(buffer)
+        except Exception as e:
+            self._send_error(500, e)
+            return
+        self._send(200, buffer.getvalue(), ARROW_STREAM_MIME)
+
+    def log_message(self, format: str, *args: T.Any):  # pragma: no cover
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PlanServer(ThreadingHTTPServer):
+    """
+    The plan serving HTTP daemon, each request is handled in a thread.
+
+    :param host: the host to listen on, only a loopback address is allowed.
+    :param port: the port to listen on, 0 picks a free port.
+    :param allow_io: allow the plans with source and sink dfops, see
+        :class:`PlanRegistry`. Ignored if a registry is given.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        registry: T.Optional[PlanRegistry] = None,
+        verbose: bool = False,
+        allow_io: bool = False,
+    ):
+        if host not in ("127.0.0.1", "localhost", "::1"):
+            raise ParamError(f"the server only listens on localhost, got {host!r}")
+        if registry is None:
+            registry = PlanRegistry(allow_io=allow_io)
+        self.registry = registry
+        self.verbose = verbose
+        super().__init__((host, port), PlanRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main(argv: T.Optional[T.List[str]] = None):  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m jsonpolars.server",
+        description="Serve precompiled jsonpolars plans on localhost.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument(
+        "--allow-io",
+        action="store_true",
+        help="allow the plans to read and write files, any local user can "
+        "then read and write any path the daemon can reach",
+    )
+    args = parser.parse_args(argv)
+    with PlanServer(
+        host=args.host,
+        port=args.port,
+        verbose=args.verbose,
+        allow_io=args.allow_io,
+    ) as server:
+        print(f"serving plans on {server.url}")
+        server.serve_forever()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
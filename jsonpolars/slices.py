@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run a row-local plan over fixed-size slices of the input frame.
+
+A plan is row-local if each output row only depends on the input row at the
+same position, so the result of the whole frame is the concatenation of the
+results of its slices. Only ``Select``, ``WithColumns``, ``Rename``,
+``Drop``, ``DropNulls`` and ``Filter`` of non-aggregating expressions are
+row-local, see :func:`is_row_local`.
+
+The intermediate frames of the plan are never bigger than a slice, and the
+slices can be processed in parallel by a thread pool, polars releases the
+GIL while it computes. A ``pl.DataFrame`` input is sliced zero-copy, a
+``pl.LazyFrame`` input runs once on the streaming engine and is consumed
+batch by batch with ``LazyFrame.collect_batches``, so the peak memory is
+bounded by ``slice_size`` as far as the upstream query streams. With a
+polars version without ``collect_batches`` the lazy input is collected
+first.
+
+Example::
+
+    >>> import polars as pl
+    >>> from jsonpolars.slices import iter_slices
+    >>> plan = [{"type": "drop", "columns": ["b"]}]
+    >>> for df in iter_slices(plan, pl.scan_parquet("big.parquet"), 100_000):
+    ...     df.write_parquet(...)
+"""
+
+import typing as T
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+
+import polars as pl
+
+from .model import iter_post_order
+from .base_expr import ExprEnum, BaseExpr
+from .base_dfop import DfopEnum
+from .utils_dfop import T_PLAN, to_dfop_list
+from .dfop.pipeline import Pipeline
+from .expr import api as _expr_api  # noqa: F401, registers the expr types
+from .dfop import api as _dfop_api  # noqa: F401, registers the dfop types
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .dfop.api import T_DFOP
+
+
+def _is_row_local_dfop(dfop: "T_DFOP") -> bool:
+    if dfop.row_local is False:
+        return False
+    for node in iter_post_order(dfop):
+        if isinstance(node, BaseExpr) and node.row_local is False:
+            return False
+    # a select of literals only gives back one row per slice
+    if dfop.type == DfopEnum.select.value:
+        exprs = list(dfop.exprs) + list(dfop.named_exprs.values())
+        return any(_reads_column(ex) for ex in exprs)
+    return True
+
+
+def _reads_column(expr_like: T.Any) -> bool:
+    if isinstance(expr_like, str):
+        return True
+    if isinstance(expr_like, BaseExpr):
+        return any(
+            node.type == ExprEnum.column.value
+            or node.type == ExprEnum.func_element.value
+            for node in iter_post_order(expr_like)
+        )
+    return False
+
+
+def is_row_local(plan: T_PLAN) -> bool:
+    """
+    Check if each output row of the plan only depends on the input row at the
+    same position. See :attr:`jsonpolars.base_dfop.BaseDfop.row_local` and
+    :attr:`jsonpolars.base_expr.BaseExpr.row_local`.
+    """
+    return all(_is_row_local_dfop(dfop) for dfop in to_dfop_list(plan))
+
+
+def _iter_input_slices(
+    df: T.Union[pl.DataFrame, pl.LazyFrame],
+    slice_size: int,
+) -> T.Iterable[pl.DataFrame]:
+    """
+    Yield at least one slice, so an empty input still gives back the schema of
+    the result.
+    """
+    if isinstance(df, pl.DataFrame):
+        if df.height == 0:
+            yield df
+            return
+        # the slices are zero-copy views of the frame
+        yield from df.iter_slices(n_rows=slice_size)
+        return
+    # the query runs once on the streaming engine, slicing the lazy frame
+    # would run the whole upstream query again for each slice
+    if not hasattr(df, "collect_batches"):  # pragma: no cover, polars < 1.32
+        yield from _iter_input_slices(df.collect(), slice_size)
+        return
+    empty = True
+    for df_slice in df.collect_batches(chunk_size=slice_size):
+        empty = False
+        yield df_slice
+    if empty:
+        yield pl.DataFrame(schema=df.collect_schema())
+
+
+def iter_slices(
+    plan: T_PLAN,
+    df: T.Union[pl.DataFrame, pl.LazyFrame],
+    slice_size: int = 100_000,
+    workers: int = 1,
+) -> T.Iterable[pl.DataFrame]:
+    """
+    Run a plan over fixed-size slices of the input frame, and yield the
+    result of each slice in order.
+
+    A plan that is not row-local cannot be split, it runs on the whole frame
+    and the result is yielded as one chunk.
+
+    :param df: the input frame. A ``pl.LazyFrame`` runs once on the
+        streaming engine and is collected batch by batch.
+    :param slice_size: the number of rows in a slice.
+    :param workers: the number of slices processed in parallel by a thread
+        pool, at most ``workers * 2`` slices are in flight.
+    """
+    dfops = to_dfop_list(plan)
+    func = Pipeline(dfops=dfops).compile()
+    if not is_row_local(dfops):
+        yield func(df.lazy()).collect()
+        return
+    slices = _iter_input_slices(df, slice_size)
+    if workers <= 1:
+        for df_slice in slices:
+            yield func(df_slice)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures: T.Deque[Future] = deque()
+        for df_slice in slices:
+            futures.append(executor.submit(func, df_slice))
+            if len(futures) >= workers * 2:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+
+def run_sliced(
+    plan: T_PLAN,
+    df: T.Union[pl.DataFrame, pl.LazyFrame],
+    slice_size: int = 100_000,
+    workers: int = 1,
+) -> pl.DataFrame:
+    """
+    Run a plan over fixed-size slices of the input frame, and concatenate the
+    results, see :func:`iter_slices`.
+    """
+    chunks = list(iter_slices(plan, df, slice_size=slice_size, workers=workers))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pl.concat(chunks, rechunk=False)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run a jsonpolars plan with the polars streaming engine, so that the plan can
+process datasets that are bigger than the memory.
+
+The plan is split into segments of consecutive dfops. A streaming segment
+only contains dfops that the streaming engine can execute batch by batch,
+a fallback segment contains at least one dfop that cannot. The segments are
+used to report the fallback dfops, the whole plan still stays one lazy query.
+The polars streaming engine falls back to the in-memory engine only for the
+query nodes of the fallback dfops, so for example ``[ScanParquet, Tail]``
+keeps only the tail rows in the memory. The frame is only materialized before
+a dfop that cannot be applied on a ``pl.LazyFrame`` at all.
+
+Example::
+
+    >>> import polars as pl
+    >>> from jsonpolars.streaming import StreamingPlan
+    >>> plan = StreamingPlan.from_plan([{"type": "head", "n": 3}])
+    >>> plan.non_streaming_dfops
+    []
+    >>> df = plan.collect(pl.scan_parquet("data/*.parquet"))
+"""
+
+import typing as T
+import dataclasses
+
+import polars as pl
+
+from .exc import ParamError
+from .utils_dfop import T_PLAN, to_dfop_list
+from .expr import api as _expr_api  # noqa: F401, registers the expr types
+from .dfop import api as _dfop_api  # noqa: F401, registers the dfop types
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .dfop.api import T_DFOP
+
+
+def _parse_version(version: str) -> T.Tuple[int, ...]:
+    parts = list()
+    for part in version.split(".")[:2]:
+        digits = "".join(c for c in part if c.isdigit())
+        parts.append(int(digits) if digits else 0)
+    return tuple(parts)
+
+
+# polars 1.23 introduced the new streaming engine via ``engine="streaming"``,
+# older versions use the ``streaming=True`` flag.
+IS_STREAMING_ENGINE = _parse_version(pl.__version__) >= (1, 23)
+
+
+def collect_streaming(lf: pl.LazyFrame) -> pl.DataFrame:
+    """
+    Collect a ``pl.LazyFrame`` with the polars streaming engine.
+    """
+    if IS_STREAMING_ENGINE:
+        return lf.collect(engine="streaming")
+    else:  # pragma: no cover
+        return lf.collect(streaming=True)
+
+
+@dataclasses.dataclass
+class Segment:
+    """
+    A list of consecutive dfops that run on the same engine.
+
+    :param dfops: the dfops in this segment.
+    :param streaming: if True, this segment runs on the streaming engine.
+    """
+
+    dfops: T.List["T_DFOP"] = dataclasses.field()
+    streaming: bool = dataclasses.field()
+
+    def to_lazyframe(self, lf: pl.LazyFrame) -> pl.LazyFrame:
+        for dfop in self.dfops:
+            if dfop.lazy_supported:
+                lf = dfop.to_polars(lf)
+            else:
+                lf = dfop.to_polars(collect_streaming(lf)).lazy()
+        return lf
+
+
+def split_segments(dfops: T.Iterable["T_DFOP"]) -> T.List[Segment]:
+    """
+    Split dfops into segments of consecutive streaming / non-streaming dfops.
+    """
+    segments: T.List[Segment] = list()
+    for dfop in dfops:
+        streaming = bool(dfop.streaming_supported and dfop.lazy_supported)
+        if segments and segments[-1].streaming is streaming:
+            segments[-1].dfops.append(dfop)
+        else:
+            segments.append(Segment(dfops=[dfop], streaming=streaming))
+    return segments
+
+
+@dataclasses.dataclass
+class StreamingPlan:
+    """
+    A plan that is ready to run with the polars streaming engine.
+
+    :param segments: see :func:`split_segments`.
+    """
+
+    segments: T.List[Segment] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_plan(cls, plan: T_PLAN) -> "StreamingPlan":
+        return cls(segments=split_segments(to_dfop_list(plan)))
+
+    @property
+    def dfops(self) -> T.List["T_DFOP"]:
+        return [dfop for segment in self.segments for dfop in segment.dfops]
+
+    @property
+    def non_streaming_dfops(self) -> T.List["T_DFOP"]:
+        """
+        The dfops that cannot run in streaming mode, polars runs them with
+        the in-memory engine.
+        """
+        return [
+            dfop
+            for segment in self.segments
+            if segment.streaming is False
+            for dfop in segment.dfops
+        ]
+
+    def collect(
+        self,
+        df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]] = None,
+    ) -> T.Optional[pl.DataFrame]:
+        """
+        Run the plan as one lazy query with the streaming engine, the
+        fallback dfops are part of the query, see the module docstring.
+
+        :param df: the input frame, leave it None if the plan starts with a
+            source dfop, it is ignored then.
+
+        :return: the result ``pl.DataFrame``, or None if the plan ends with a
+            sink dfop, the sink writes the result without collecting it.
+        """
+        dfops = self.dfops
+        if any(dfop.is_source for dfop in dfops[1:]):
+            raise ParamError("a source dfop must be the first dfop of the plan.")
+        if any(dfop.is_sink for dfop in dfops[:-1]):
+            raise ParamError("a sink dfop must be the last dfop of the plan.")
+        if dfops and dfops[0].is_source:
+            # the source dfop starts the lazy query, the input frame is ignored
+            lf = None
+        elif df is None:
+            raise ParamError(
+                "the plan doesn't start with a source dfop, "
+                "an input frame is required."
+            )
+        else:
+            lf = df.lazy()
+        for segment in self.segments:
+            lf = segment.to_lazyframe(lf)
+        if dfops and dfops[-1].is_sink:
+            return None
+        return collect_streaming(lf)
+
+
+def run_streaming(
+    plan: T_PLAN,
+    df: T.Optional[T.Union[pl.DataFrame, pl.LazyFrame]] = None,
+) -> T.Optional[pl.DataFrame]:
+    """
+    Run a plan with the polars streaming engine, see :class:`StreamingPlan`.
+    """
+    return StreamingPlan.from_plan(plan).collect(df)
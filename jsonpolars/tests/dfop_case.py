@@ -45,3 +45,10 @@ class Case:
         print("---------- expected_output_records ----------")
         rprint(self.expected_output_records)
         assert output_records == self.expected_output_records
+
+        lf1 = self.dfop.to_polars(df.lazy())
+        print("---------- lazy output ----------")
+        print(lf1)
+        assert isinstance(lf1, pl.LazyFrame)
+        output_records = lf1.collect().to_dicts()
+        assert output_records == self.expected_output_records
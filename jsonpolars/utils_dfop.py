@@ -1,13 +1,65 @@
 # -*- coding: utf-8 -*-
 
+"""
+这个模块中有一系列的用于 dfop serde 的函数.
+"""
+
 import typing as T
-import polars as pl
 
-from .base_expr import BaseExpr, parse_expr
-from .base_dfop import BaseDfop, parse_dfop
-from .typehint import IntoExpr
+from .base_dfop import DfopEnum, BaseDfop, parse_dfop
 
 
 if T.TYPE_CHECKING:  # pragma: no cover
-    from .expr.api import T_EXPR
     from .dfop.api import T_DFOP
+
+T_PLAN = T.Union[
+    dict,
+    "T_DFOP",
+    T.List[T.Union[dict, "T_DFOP"]],
+]
+
+
+def to_jsonpolars_dfop(
+    dfop_like: T.Union[dict, "T_DFOP"],
+) -> "T_DFOP":
+    if isinstance(dfop_like, dict):
+        return parse_dfop(dfop_like)
+    elif isinstance(dfop_like, BaseDfop):
+        return dfop_like
+    else:  # pragma: no cover
+        raise NotImplementedError(f"Unsupported type: {type(dfop_like)}")
+
+
+def batch_to_jsonpolars_dfops(
+    dfops: T.Iterable[T.Union[dict, "T_DFOP"]],
+) -> T.List["T_DFOP"]:
+    """
+    .. note::
+
+        Intentionally not using list comprehension here. So that it tells you
+        which dfop is causing the error.
+    """
+    new_dfops = list()
+    for dfop in dfops:
+        new_dfops.append(to_jsonpolars_dfop(dfop))
+    return new_dfops
+
+
+def to_dfop_list(plan: T_PLAN) -> T.List["T_DFOP"]:
+    """
+    Normalize a plan into a flat list of dfops.
+
+    A plan can be a dfop, a ``Pipeline``, a list of dfops, or the dict / list
+    of dicts form of them. Nested ``Pipeline`` are flattened.
+    """
+    if isinstance(plan, (list, tuple)):
+        dfops = batch_to_jsonpolars_dfops(plan)
+    else:
+        dfops = [to_jsonpolars_dfop(plan)]
+    flat_dfops = list()
+    for dfop in dfops:
+        if dfop.type == DfopEnum.pipeline.value:
+            flat_dfops.extend(to_dfop_list(dfop.dfops))
+        else:
+            flat_dfops.append(dfop)
+    return flat_dfops
@@ -11,7 +11,7 @@ import typing as T
 
 import polars as pl
 
-from .base_expr import BaseExpr, parse_expr
+from .base_expr import BaseExpr, parse_expr, lowering_scope
 from .typehint import (
     PythonLiteral,
     IntoExpr,
@@ -85,8 +85,9 @@ def batch_to_polars_into_exprs(
         which expression is causing the error.
     """
     new_exprs = list()
-    for ex in exprs:
-        new_exprs.append(to_polars_into_expr(ex))
+    with lowering_scope():
+        for ex in exprs:
+            new_exprs.append(to_polars_into_expr(ex))
     return new_exprs
 
 
@@ -100,8 +101,9 @@ def batch_to_polars_named_into_exprs(
         which expression is causing the error.
     """
     new_named_exprs = dict()
-    for name, ex in named_exprs.items():
-        new_named_exprs[name] = to_polars_into_expr(ex)
+    with lowering_scope():
+        for name, ex in named_exprs.items():
+            new_named_exprs[name] = to_polars_into_expr(ex)
     return new_named_exprs
 
 
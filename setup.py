@@ -159,6 +159,8 @@ if __name__ == "__main__":
     except:
         print("'requirements-test.txt' not found!")
 
+    EXTRA_REQUIRE["arrow"] = ["pyarrow>=11.0.0"]
+
     try:
         EXTRA_REQUIRE["docs"] = read_requirements_file("requirements-doc.txt")
     except:
@@ -185,6 +187,11 @@ if __name__ == "__main__":
         python_requires=">=3.8",
         install_requires=REQUIRES,
         extras_require=EXTRA_REQUIRE,
+        entry_points={
+            "console_scripts": [
+                "jsonpolars = jsonpolars.cli:main",
+            ],
+        },
     )
 
 """
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import time
+import asyncio
+
+import polars as pl
+import pytest
+
+from jsonpolars.dfop import api as dfop
+from jsonpolars.aio import collect_async
+
+
+class EagerHead(dfop.Head):
+    lazy_supported = False
+
+
+class Sleep(dfop.Head):
+    def to_polars(self, df):
+        time.sleep(1)
+        return super().to_polars(df)
+
+
+def test_collect_async(tmp_path):
+    df = pl.DataFrame({"a": [3, 1, 2]})
+
+    async def main():
+        return await asyncio.gather(
+            collect_async([dfop.Sort(by=["a"])], df),
+            collect_async([dfop.Head(n=1)], df.lazy(), timeout=10),
+            collect_async([EagerHead(n=2)], df.lazy()),
+            collect_async([dfop.Head(n=2), EagerHead(n=1)], df),
+            collect_async(
+                [dfop.Head(n=2), dfop.SinkCsv(path=str(tmp_path / "a.csv"))], df
+            ),
+            collect_async(
+                [EagerHead(n=2), dfop.SinkCsv(path=str(tmp_path / "b.csv"))], df
+            ),
+        )
+
+    res = asyncio.run(main())
+    assert res[0]["a"].to_list() == [1, 2, 3]
+    assert res[1]["a"].to_list() == [3]
+    assert res[2]["a"].to_list() == [3, 1]
+    assert res[3]["a"].to_list() == [3]
+    assert res[4] is None
+    assert res[5] is None
+    assert pl.read_csv(tmp_path / "a.csv")["a"].to_list() == [3, 1]
+    assert pl.read_csv(tmp_path / "b.csv")["a"].to_list() == [3, 1]
+
+
+def test_timeout():
+    df = pl.DataFrame({"a": [3, 1, 2]})
+
+    async def main():
+        await collect_async([Sleep(n=1)], df, timeout=0.1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(main())
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.aio", preview=False)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.jskit import dot_field
+from jsonpolars.analysis import find_expr_columns, analyze_columns
+
+col_a = expr.Column(name="a")
+col_b = expr.Column(name="b")
+
+
+def test_find_expr_columns():
+    res = find_expr_columns("a")
+    assert res.columns == {"a"}
+    assert res.struct_fields == {}
+    assert res.all_columns is False
+
+    res = find_expr_columns(expr.Plus(left=col_a, right=col_b))
+    assert res.columns == {"a", "b"}
+
+    # a str of a python literal is not a column name
+    res = find_expr_columns(expr.StrContains(expr=col_a, pattern="b"))
+    assert res.columns == {"a"}
+
+    # a struct field chain reads the fields of the root column
+    res = find_expr_columns(dot_field("user", ["address", "city"]))
+    assert res.columns == {"user"}
+    assert res.struct_fields == {"user": {("address", "city")}}
+    res = find_expr_columns(
+        expr.StructField(expr=expr.Column(name="user"), name=["id", "name"])
+    )
+    assert res.struct_fields == {"user": {("id",), ("name",)}}
+    # the whole column is read too
+    res = find_expr_columns(
+        expr.Plus(
+            left=dot_field("user", ["id"]),
+            right=expr.Cast(expr=expr.Column(name="user"), dtype="String"),
+        )
+    )
+    assert res.struct_fields == {"user": {("id",), ()}}
+
+    res = find_expr_columns(expr.Column(name="*"))
+    assert res.columns == set()
+    assert res.all_columns is True
+    assert find_expr_columns(expr.Column(name="^a.*$")).all_columns is True
+
+
+def test_analyze_columns():
+    # the computed columns are not input columns
+    res = analyze_columns(
+        [
+            dfop.WithColumns(named_exprs={"b": dot_field("user", ["id"])}),
+            dfop.Select(exprs=["a", "b"]),
+        ]
+    )
+    assert res.columns == {"a", "user"}
+    assert res.struct_fields == {"user": {("id",)}}
+    assert res.all_columns is False
+    assert [(step.reads, step.produces) for step in res.steps] == [
+        ({"user"}, ["b"]),
+        ({"a", "b"}, ["a", "b"]),
+    ]
+
+    # the dict form, a rename is followed back to the input column
+    res = analyze_columns(
+        [
+            {"type": "rename", "mapping": {"a": "x"}},
+            {"type": "select", "exprs": [{"type": "column", "name": "x"}]},
+        ]
+    )
+    assert res.columns == {"a"}
+    assert res.all_columns is False
+
+    # without a select, all the input columns are kept in the output
+    res = analyze_columns(
+        [
+            dfop.Sort(by=["c"]),
+            dfop.Drop(columns=["d"]),
+            dfop.Head(n=3),
+        ]
+    )
+    assert res.columns == {"c", "d"}
+    assert res.all_columns is True
+
+    # a dropped column is not the input column anymore
+    res = analyze_columns(
+        [
+            dfop.WithColumns(named_exprs={"a": expr.Plus(left=col_b, right=1)}),
+            dfop.Drop(columns=["b"]),
+            dfop.Select(exprs=[col_a, col_b]),
+        ]
+    )
+    assert res.columns == {"b"}
+
+    # drop nulls without a subset reads all the columns
+    res = analyze_columns([dfop.DropNulls(), dfop.Select(exprs=["a"])])
+    assert res.steps[0].all_columns is True
+    assert res.all_columns is True
+    res = analyze_columns([dfop.Select(exprs=["a", "b"]), dfop.DropNulls()])
+    assert res.columns == {"a", "b"}
+    assert res.all_columns is False
+    res = analyze_columns([dfop.DropNulls(subset=["a"]), dfop.Select(exprs=["b"])])
+    assert res.columns == {"a", "b"}
+    assert res.all_columns is False
+
+    # a filter reads the predicate and the constraint columns
+    res = analyze_columns(
+        [
+            dfop.Filter(
+                predicates=[expr.GreatThan(left=col_a, right=1)],
+                constraints={"c": "x"},
+            ),
+            dfop.Select(exprs=["b"]),
+        ]
+    )
+    assert res.columns == {"a", "b", "c"}
+    assert res.all_columns is False
+
+    # a count reads all the columns, the output columns are computed
+    res = analyze_columns([dfop.Select(exprs=["a", "b"]), dfop.Count()])
+    assert res.columns == {"a", "b"}
+    assert res.steps[1].all_columns is True
+    assert res.all_columns is False
+
+    # a wildcard select keeps the schema open
+    res = analyze_columns([dfop.Select(exprs=[expr.Column(name="*")])])
+    assert res.all_columns is True
+
+    # a source dfop starts a new frame
+    res = analyze_columns(
+        [
+            dfop.ScanParquet(source="data.parquet"),
+            dfop.Select(exprs=["a"]),
+            dfop.SinkParquet(path="out.parquet"),
+        ]
+    )
+    assert res.columns == {"a"}
+    assert res.all_columns is False
+    assert len(res.steps) == 3
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.analysis", preview=False)
@@ -14,6 +14,41 @@ def test():
     _ = api.parse_dfop
     _ = api.T_DFOP
     _ = api.dfop
+    _ = api.T_PLAN
+    _ = api.to_dfop_list
+    _ = api.StreamingPlan
+    _ = api.run_streaming
+    _ = api.CompileCache
+    _ = api.compile_cache
+    _ = api.compile_expr
+    _ = api.compile_dfop
+    _ = api.LineError
+    _ = api.LoadResult
+    _ = api.load_plans
+    _ = api.MappedIpc
+    _ = api.map_ipc
+    _ = api.run_plan
+    _ = api.is_row_local
+    _ = api.iter_slices
+    _ = api.run_sliced
+    _ = api.run_arrow
+    _ = api.iter_arrow_batches
+    _ = api.run_arrow_reader
+    _ = api.collect_async
+    _ = api.JobResult
+    _ = api.BatchResult
+    _ = api.run_batch
+    _ = api.PlanRegistry
+    _ = api.PlanServer
+    _ = api.PlanClient
+    _ = api.fold_constants
+    _ = api.eliminate_common_subexprs
+    _ = api.merge_adjacent_dfops
+    _ = api.ExprColumns
+    _ = api.StepColumns
+    _ = api.PlanColumns
+    _ = api.find_expr_columns
+    _ = api.analyze_columns
     _ = api.chain
     _ = api.PRE
     _ = api.jskit
@@ -103,7 +138,17 @@ def test():
     _ = api.dfop.Tail
     _ = api.dfop.Sort
     _ = api.dfop.DropNulls
+    _ = api.dfop.Filter
     _ = api.dfop.Count
+    _ = api.dfop.Pipeline
+    _ = api.dfop.ScanParquet
+    _ = api.dfop.ScanCsv
+    _ = api.dfop.ScanNdjson
+    _ = api.dfop.ScanIpc
+    _ = api.dfop.SinkParquet
+    _ = api.dfop.SinkIpc
+    _ = api.dfop.SinkCsv
+    _ = api.dfop.SinkNdjson
 
     # --- jskit ---
     _ = api.jskit.dot_field
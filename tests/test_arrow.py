@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+
+pa = pytest.importorskip("pyarrow")
+
+from jsonpolars.arrow import run_arrow, iter_arrow_batches, run_arrow_reader
+
+
+def make_table():
+    return pa.table({"a": list(range(10)), "b": [str(i) for i in range(10)]})
+
+
+def make_plan():
+    return [
+        dfop.WithColumns(
+            named_exprs={
+                "c": expr.Plus(left=expr.Column(name="a"), right=expr.Lit(value=1)),
+            }
+        ),
+        dfop.Drop(columns=["b"]),
+    ]
+
+
+def make_reader(table):
+    return pa.RecordBatchReader.from_batches(
+        table.schema, table.to_batches(max_chunksize=4)
+    )
+
+
+def test_run_arrow():
+    table = make_table()
+    res = run_arrow(make_plan(), table)
+    assert isinstance(res, pa.Table)
+    assert res.column_names == ["a", "c"]
+    assert res["c"].to_pylist() == list(range(1, 11))
+
+    res = run_arrow(make_plan(), table.to_batches()[0])
+    assert res["c"].to_pylist() == list(range(1, 11))
+
+
+def test_iter_arrow_batches():
+    table = make_table()
+    batches = list(iter_arrow_batches(make_plan(), make_reader(table)))
+    assert [batch.num_rows for batch in batches] == [4, 4, 2]
+    assert pa.Table.from_batches(batches)["c"].to_pylist() == list(range(1, 11))
+
+    # a plan that is not row-local reads all the batches first
+    plan = [dfop.Sort(by=["a"], descending=True)]
+    batches = list(iter_arrow_batches(plan, make_reader(table)))
+    assert len(batches) == 1
+    assert batches[0]["a"].to_pylist() == list(range(10))[::-1]
+
+
+def test_run_arrow_reader():
+    table = make_table()
+    reader = run_arrow_reader(make_plan(), make_reader(table))
+    assert reader.schema.names == ["a", "c"]
+    res = reader.read_all()
+    assert res["c"].to_pylist() == list(range(1, 11))
+
+    # an empty stream still gives back the schema
+    reader = run_arrow_reader(
+        make_plan(), pa.RecordBatchReader.from_batches(table.schema, [])
+    )
+    res = reader.read_all()
+    assert res.column_names == ["a", "c"]
+    assert res.num_rows == 0
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.arrow", preview=False)
@@ -9,9 +9,11 @@ import dataclasses
 from datetime import datetime
 
 import pytest
+import polars as pl
 
 from jsonpolars.exc import ParamError
 from jsonpolars.arg import REQ, NA, rm_na, T_KWARGS
+from jsonpolars.model import slotted
 from jsonpolars.base_expr import BaseExpr, parse_expr, expr_enum_to_klass_mapping
 
 
@@ -117,6 +119,322 @@ def test_to_dict_from_dict():
         Model._split_req_opt({})
 
 
+def test_fingerprint():
+    from jsonpolars.expr import api as expr
+    from jsonpolars.chain import chain
+
+    ex = expr.Plus(left=expr.Column(name="a"), right=expr.Lit(value=1))
+    # consistent across processes
+    assert ex.fingerprint() == "0fa5d1f34c182b459e0ae47578000779"
+    assert ex.is_frozen is False
+    assert ex.freeze() is ex
+    assert ex.is_frozen is True
+    assert ex.left.is_frozen is True
+    assert ex.fingerprint() is ex.fingerprint()
+    assert ex.fingerprint() == "0fa5d1f34c182b459e0ae47578000779"
+
+    ex1 = parse_expr(ex.to_dict())
+    assert ex1 == ex
+    assert hash(ex1.freeze()) == hash(ex)
+    assert len({ex, ex1}) == 1
+
+    assert expr.Lit(value=1) != expr.Lit(value=True)
+    assert expr.Lit(value=1) != expr.Lit(value=1.0)
+    assert expr.Column(name="a") != expr.Alias(name="a", expr=expr.Column(name="a"))
+
+    # the order of the dict matters
+    s1 = expr.FuncStruct(named_exprs={"a": "x", "b": "y"})
+    s2 = expr.FuncStruct(named_exprs={"b": "y", "a": "x"})
+    assert s1 != s2
+
+    # mutation
+    p1 = Person(name="Alice")
+    fp = p1.fingerprint()
+    p1.name = "Bob"
+    assert p1.fingerprint() != fp
+    assert p1 == Person(name="Bob")
+
+    ex = expr.StrToUpperCase(expr=expr.Column(name="a"))
+    ex.fingerprint()
+    ex1 = chain(expr.Column(name="b"), ex)
+    assert ex1 == expr.StrToUpperCase(expr=expr.Column(name="b"))
+    assert ex == expr.StrToUpperCase(expr=expr.Column(name="a"))
+
+
+def test_mutate_then_compare():
+    from jsonpolars.expr import api as expr
+    from jsonpolars.cache import compile_expr, compile_cache
+
+    a = expr.Plus(left=expr.Column(name="a"), right=expr.Lit(value=1))
+    b = expr.Plus(left=expr.Column(name="a"), right=expr.Lit(value=1))
+    assert a == b
+    a.left.name = "zzz"
+    assert a != b
+    assert a == expr.Plus(left=expr.Column(name="zzz"), right=expr.Lit(value=1))
+
+    # the compile cache sees the mutation too
+    df = pl.DataFrame({"a": [1], "zzz": [10]})
+    ex = expr.Column(name="a")
+    assert df.select(compile_expr(ex)).columns == ["a"]
+    ex.name = "zzz"
+    assert df.select(compile_expr(ex)).columns == ["zzz"]
+    compile_cache.clear()
+
+
+def test_frozen():
+    import copy
+    import pickle
+    from jsonpolars.expr import api as expr
+
+    ex = expr.Plus(left=expr.Column(name="a"), right=expr.Lit(value=1))
+    # a mutable node is not hashable
+    with pytest.raises(TypeError):
+        hash(ex)
+    assert ex.is_frozen is False
+    ex.freeze()
+    assert len({ex}) == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        ex.left.name = "b"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        del ex.left
+    ex1 = dataclasses.replace(ex, left=expr.Column(name="b"))
+    assert ex1.is_frozen is False
+    assert ex1.left.name == "b"
+
+    for ex2 in [pickle.loads(pickle.dumps(ex)), copy.deepcopy(ex)]:
+        assert ex2 == ex
+        assert ex2.is_frozen is True
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            ex2.left.name = "b"
+
+    # interned nodes are shared by many parents, they are frozen
+    data = {
+        "type": "add",
+        "left": {"type": "column", "name": "a"},
+        "right": {"type": "column", "name": "a"},
+    }
+    ex = parse_expr(data, intern=True)
+    assert ex.left is ex.right
+    assert ex.left.is_frozen is True
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        ex.left.name = "b"
+    assert ex.right.name == "a"
+
+
+def test_get_decoder():
+    from jsonpolars.expr import api as expr
+
+    # the class doesn't override from_dict, it uses the precompiled decoder
+    decoder = Person.get_decoder()
+    assert decoder is Person.get_decoder()
+    assert decoder is not Person.from_dict
+    assert decoder({"name": "Alice", "gender": NA}) == Person(name="Alice")
+    with pytest.raises(ParamError):
+        decoder({"age": 30})
+
+    # the class overrides from_dict, the decoder is the from_dict
+    assert Record.get_decoder() == Record.from_dict
+
+    # child nodes are parsed by the shape of the field
+    spec = expr.FuncStruct.get_field_spec()
+    assert spec.node_names == ("exprs", "named_exprs")
+    assert spec.node_shapes == ("list", "dict")
+    assert spec.node_kinds == ("expr", "expr")
+    ex = parse_expr(
+        {
+            "type": "func_struct",
+            "exprs": ["a", {"type": "column", "name": "b"}],
+            "named_exprs": {"c": {"type": "column", "name": "c"}},
+        }
+    )
+    assert ex == expr.FuncStruct(
+        exprs=["a", expr.Column(name="b")],
+        named_exprs={"c": expr.Column(name="c")},
+    )
+
+
+def test_find_node_hint():
+    from datetime import timedelta
+    from jsonpolars import typehint
+    from jsonpolars.expr import api as expr
+    from jsonpolars.dfop import api as dfop
+    from jsonpolars.model import node_type_hints, _find_node_hint
+
+    # every registered name is a real type hint
+    for name in node_type_hints:
+        assert any(hasattr(mod, name) for mod in (typehint, expr, dfop))
+
+    cases = [
+        ("T_EXPR", ("one", "expr")),
+        ("OtherExpr", ("one", "expr")),
+        ("DatetimeElementExpr", None),
+        (T.Optional["T_EXPR"], ("one", "expr")),
+        (T.Union[str, "T_EXPR"], ("one", "expr")),
+        (T.Union[int, "T_EXPR"], ("one", "expr")),
+        (T.Union[str, timedelta, "T_EXPR"], ("one", "expr")),
+        (T.List["IntoExpr"], ("list", "expr")),
+        (T.List["ColumnNameOrSelector"], ("list", "expr")),
+        (T.Optional[T.List["IntoExpr"]], ("list", "expr")),
+        (T.Union[None, T.Sequence["IntoExprColumn"]], ("list", "expr")),
+        (T.Tuple["T_EXPR", ...], ("list", "expr")),
+        (T.List["T_DFOP"], ("list", "dfop")),
+        (T.Dict[str, "IntoExpr"], ("dict", "expr")),
+        (T.Optional[T.Dict[str, "IntoExpr"]], ("dict", "expr")),
+        (str, None),
+        (T.List[str], None),
+        (T.Dict[str, T.Any], None),
+        (T.Union[str, "pl.DataType", T.Type["pl.DataType"]], None),
+        (T.Union[T.Dict[str, str], T.Callable[[str], str]], None),
+        (T.Optional[T.Dict[str, T.Dict[str, T.Any]]], None),
+    ]
+    for tp, expected in cases:
+        assert _find_node_hint(tp) == expected, tp
+
+    for tp in [
+        T.Union["T_EXPR", T.List["T_EXPR"]],
+        T.List[T.List["T_EXPR"]],
+        T.Dict[str, T.List["T_EXPR"]],
+        T.Dict["T_EXPR", str],
+        T.Callable[["T_EXPR"], str],
+        "T.List[T_EXPR]",
+    ]:
+        with pytest.raises(TypeError):
+            _find_node_hint(tp)
+
+
+def test_deep_tree():
+    from jsonpolars.expr import api as expr
+    from jsonpolars.model import MAX_RECURSION_DEPTH
+
+    # much deeper than the recursion limit
+    n = 5000
+    ex = expr.Column(name="a")
+    for i in range(n):
+        ex = expr.LogicalAnd(
+            left=expr.Cast(expr=ex, dtype="Boolean"),
+            right=expr.Lit(value=True),
+        )
+    dct = ex.to_dict()
+    assert dct["left"]["dtype"] == "Boolean"
+    ex1 = parse_expr(dct)
+    assert ex1 == ex
+    assert isinstance(ex1.to_polars(), pl.Expr)
+
+    # the result is the same as the recursive lowering
+    n = MAX_RECURSION_DEPTH * 2
+    ex = expr.Column(name="a")
+    for i in range(n):
+        ex = expr.Plus(left=ex, right=expr.Lit(value=1))
+    ex1 = parse_expr(ex.to_dict())
+    assert ex1 == ex
+    df = pl.DataFrame({"a": [1, 2]})
+    assert df.select(ex1.to_polars())["a"].to_list() == [1 + n, 2 + n]
+
+    # a shared node is lowered only once
+    shared = expr.Plus(left=expr.Column(name="a"), right=expr.Lit(value=1))
+    ex = expr.Multiply(left=shared, right=shared)
+    assert df.select(ex.to_polars())["a"].to_list() == [4, 9]
+
+
+def test_slotted():
+    import pickle
+    from jsonpolars.expr import api as expr
+    from jsonpolars.dfop import api as dfop
+
+    ex = expr.Alias(
+        name="b",
+        expr=expr.Plus(left=expr.Column(name="a"), right=expr.Lit(value=1)),
+    )
+    for node in [ex, ex.expr, ex.expr.left, ex.expr.right, dfop.Head(n=1)]:
+        assert hasattr(node, "__dict__") is False
+    with pytest.raises(AttributeError):
+        ex.not_a_field = 1
+
+    # the class attribute of the field default is removed
+    assert expr.Column(name="a").type == "column"
+    assert "name" in expr.Column.__slots__
+    assert "type" not in expr.Column.__slots__
+
+    # the zero argument super() still works
+    @slotted
+    @dataclasses.dataclass
+    class Upper(expr.Column):
+        def to_polars(self) -> pl.Expr:
+            return super().to_polars().str.to_uppercase()
+
+    df = pl.DataFrame({"a": ["x"]})
+    assert df.select(Upper(name="a").to_polars())["a"].to_list() == ["X"]
+
+    ex.fingerprint()
+    ex1 = pickle.loads(pickle.dumps(ex))
+    assert ex1 == ex
+    assert ex1.to_dict() == ex.to_dict()
+
+
+def test_parse_expr_intern():
+    from jsonpolars.expr import api as expr
+    from jsonpolars.dfop import api as dfop
+    from jsonpolars.base_dfop import parse_dfop
+
+    def make_data(i: int) -> dict:
+        return expr.Plus(
+            left=expr.Column(name="user_id"),
+            right=expr.Lit(value=0),
+        ).to_dict()
+
+    # structurally equal sub trees are shared
+    dct = expr.FuncStruct(exprs=[make_data(1), make_data(2)]).to_dict()
+    ex = parse_expr(dct, intern=True)
+    assert ex == parse_expr(dct)
+    assert ex.exprs[0] is ex.exprs[1]
+    assert ex.exprs[0].left is ex.exprs[1].left
+    ex = parse_expr(dct)
+    assert ex.exprs[0] is not ex.exprs[1]
+
+    # share the instances across many calls
+    table = dict()
+    ex1 = parse_expr(make_data(1), intern=table)
+    ex2 = parse_expr(make_data(2), intern=table)
+    assert ex1 is ex2
+    ex3 = parse_expr({"type": "column", "name": "user_id"}, intern=table)
+    assert ex3 is ex1.left
+    lit_1 = parse_expr({"type": "func_lit", "value": 1}, intern=table)
+    lit_true = parse_expr({"type": "func_lit", "value": True}, intern=table)
+    assert lit_1 is not lit_true
+
+    # custom from_dict
+    record = Record(create_time=datetime(2000, 1, 1))
+    dct = record.to_dict()
+    assert parse_expr(dct, intern=table) is parse_expr(dct, intern=table)
+
+    # dfop
+    dct = dfop.WithColumns(
+        named_exprs={"a": make_data(1), "b": make_data(2)},
+    ).to_dict()
+    op = parse_dfop(dct, intern=True)
+    assert op.named_exprs["a"] is op.named_exprs["b"]
+    df = pl.DataFrame({"user_id": [1, 2]})
+    assert op.to_polars(df).to_dicts() == [
+        {"user_id": 1, "a": 1, "b": 1},
+        {"user_id": 2, "a": 2, "b": 2},
+    ]
+
+
+def test_lowering_scope():
+    from jsonpolars.expr import api as expr
+    from jsonpolars.base_expr import lowering_scope
+
+    shared = expr.Column(name="a")
+    ex1 = expr.Plus(left=shared, right=expr.Lit(value=1))
+    ex2 = expr.Plus(left=shared, right=expr.Lit(value=2))
+    with lowering_scope():
+        pl_expr = shared.to_polars()
+        assert ex1.to_polars().meta.eq(pl.col("a") + 1)
+        assert ex2.to_polars().meta.eq(pl.col("a") + 2)
+        assert shared.to_polars() is pl_expr
+    assert shared.to_polars() is not pl_expr
+
+
 class TestRecord:
     def test_to_dict_from_dict(self):
         record = Record(create_time=datetime(2000, 1, 1))
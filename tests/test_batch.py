@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import polars as pl
+
+from jsonpolars.dfop import api as dfop
+from jsonpolars import batch
+from jsonpolars.batch import run_batch
+
+
+def make_jobs(tmp_path):
+    for i in range(3):
+        pl.DataFrame({"a": list(range(i + 3))}).write_parquet(tmp_path / f"{i}.parquet")
+    head = dfop.Head(n=2)
+    drop = [dfop.Drop(columns=["b"]).to_dict()]
+    return [
+        (head.to_dict(), str(tmp_path / "0.parquet"), str(tmp_path / "0.csv")),
+        (head, str(tmp_path / "1.parquet"), str(tmp_path / "1.csv")),
+        (drop, str(tmp_path / "2.parquet"), str(tmp_path / "2.csv")),
+        ([head], str(tmp_path / "2.parquet"), None),
+        (head.to_dict(), str(tmp_path / "2.txt"), None),
+    ]
+
+
+def test_run_batch(tmp_path):
+    jobs = make_jobs(tmp_path)
+    for workers in [0, 2]:
+        batch.plan_cache.clear()
+        res = run_batch(jobs, workers=workers)
+        assert [job.index for job in res.jobs] == [0, 1, 2, 3, 4]
+        assert [job.ok for job in res.jobs] == [True, True, False, True, False]
+        assert [job.rows_out for job in res.jobs] == [2, 2, None, 2, None]
+        assert [job.index for job in res.failed] == [2, 4]
+        assert len(res.succeeded) == 3
+        assert res.jobs[2].error.startswith("ColumnNotFoundError")
+        assert res.jobs[4].error.startswith("ParamError")
+        assert pl.read_csv(tmp_path / "1.csv")["a"].to_list() == [0, 1]
+        assert res.seconds > 0
+        if workers == 0:
+            # each distinct plan is parsed only once
+            info = batch.plan_cache.info()
+            assert info.currsize == 3
+            assert info.hits == 2
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.batch", preview=False)
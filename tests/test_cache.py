@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+import subprocess
+
+import polars as pl
+
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.cache import (
+    fingerprint,
+    is_cacheable,
+    CompileCache,
+    compile_cache,
+    compile_expr,
+    compile_dfop,
+)
+
+
+def test_fingerprint():
+    assert fingerprint({"type": "column", "name": "a"}) == fingerprint(
+        {"name": "a", "type": "column"}
+    )
+    assert fingerprint(expr.Column(name="a")) == expr.Column(name="a").fingerprint()
+    assert fingerprint({"type": "column", "name": "a"}) != fingerprint(
+        {"type": "column", "name": "b"}
+    )
+
+    # the column order of named_exprs is significant
+    assert fingerprint(
+        {"type": "with_columns", "named_exprs": {"b": "a", "c": "a"}}
+    ) != fingerprint({"type": "with_columns", "named_exprs": {"c": "a", "b": "a"}})
+    assert fingerprint(
+        {"named_exprs": {"b": "a", "c": "a"}, "type": "with_columns"}
+    ) == fingerprint({"type": "with_columns", "named_exprs": {"b": "a", "c": "a"}})
+
+    # the field order of the struct schema is significant
+    def make_struct(schema):
+        return {
+            "type": "func_struct",
+            "exprs": [{"type": "column", "name": "a"}],
+            "named_exprs": {"b": {"eager": True, "type": "func_lit", "value": 1}},
+            "schema": schema,
+        }
+
+    schema_1 = {"a": {"type": "int"}, "b": {"type": "int"}}
+    schema_2 = {"b": {"type": "int"}, "a": {"type": "int"}}
+    assert fingerprint(make_struct(schema_1)) != fingerprint(make_struct(schema_2))
+    cache = CompileCache()
+    df = pl.DataFrame({"a": [1]})
+    for schema in [schema_1, schema_2]:
+        ex = cache.compile_expr(make_struct(schema))
+        assert df.select(ex.alias("s"))["s"].struct.fields == list(schema)
+    # the field order of a child node doesn't matter
+    dct = make_struct(schema_1)
+    dct["named_exprs"]["b"] = {"value": 1, "type": "func_lit", "eager": True}
+    assert fingerprint(dct) == fingerprint(make_struct(schema_1))
+
+
+def test_is_cacheable():
+    assert is_cacheable({"type": "column", "name": "a", "n": [1, 2.0, None]}) is True
+    assert is_cacheable(expr.Cast(expr=expr.Column(name="a"), dtype=pl.Int64)) is True
+    assert is_cacheable(dfop.Sort(by=["a"])) is True
+    assert is_cacheable(dfop.Rename(mapping=str.upper)) is False
+    assert is_cacheable({"type": "rename", "mapping": lambda x: x}) is False
+    assert is_cacheable(dfop.Pipeline(dfops=[dfop.Rename(mapping=str.upper)])) is False
+
+
+def test_opaque_value_is_not_cached():
+    cache = CompileCache()
+    df = pl.DataFrame({"a": [1]})
+    # a callable is fingerprinted by its address, a later callable can reuse
+    # the address, so it must not hit the cache
+    for suffix in ["_x", "_y"]:
+        func = cache.compile_dfop(dfop.Rename(mapping=lambda x: x + suffix))
+        assert func(df).columns == [f"a{suffix}"]
+    assert len(cache) == 0
+    assert cache.info().misses == 2
+
+
+def test_cached_none():
+    cache = CompileCache()
+    cache.set("key", None)
+    assert cache.get("key", "default") is None
+    assert cache.info().hits == 1
+
+    calls = list()
+
+    def compile_func(node):
+        calls.append(node)
+        return None
+
+    assert cache._get_or_compile("ns", {"a": 1}, compile_func) is None
+    assert cache._get_or_compile("ns", {"a": 1}, compile_func) is None
+    assert len(calls) == 1
+
+
+def test_compile_cache():
+    cache = CompileCache(maxsize=2)
+    ex1 = cache.compile_expr({"type": "column", "name": "a"})
+    assert isinstance(ex1, pl.Expr)
+    assert cache.compile_expr({"type": "column", "name": "a"}) is ex1
+    assert cache.info().hits == 1
+    assert cache.info().misses == 1
+
+    # LRU eviction
+    cache.compile_expr({"type": "column", "name": "b"})
+    cache.compile_expr({"type": "column", "name": "a"})
+    cache.compile_expr({"type": "column", "name": "c"})
+    assert len(cache) == 2
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (2, 3, 2)
+    assert cache.compile_expr({"type": "column", "name": "a"}) is ex1
+
+    cache.clear()
+    assert cache.info().currsize == 0
+    assert cache.info().hits == 0
+
+    # ttl eviction
+    cache = CompileCache(ttl=0.01)
+    ex1 = cache.compile_expr({"type": "column", "name": "a"})
+    time.sleep(0.02)
+    assert cache.compile_expr({"type": "column", "name": "a"}) is not ex1
+    assert cache.info().misses == 2
+
+    # the expired entries are not counted
+    cache = CompileCache(ttl=0.01)
+    cache.compile_expr({"type": "column", "name": "a"})
+    cache.compile_expr({"type": "column", "name": "b"})
+    assert len(cache) == 2
+    time.sleep(0.02)
+    assert len(cache) == 0
+    assert cache.info().currsize == 0
+
+    # opt out
+    cache = CompileCache(enabled=False)
+    ex1 = cache.compile_expr({"type": "column", "name": "a"})
+    assert cache.compile_expr({"type": "column", "name": "a"}) is not ex1
+    assert len(cache) == 0
+
+
+def test_compile_dfop():
+    df = pl.DataFrame({"a": [1, 2, 3]})
+    dfop_data = {
+        "type": "pipeline",
+        "dfops": [
+            {"type": "with_columns", "named_exprs": {"b": "a"}},
+            {"type": "sort", "by": ["a"], "descending": True},
+            {"type": "drop", "columns": ["a"]},
+            {"type": "drop_nulls", "subset": ["b"]},
+            {"type": "head", "n": 2},
+        ],
+    }
+    func = compile_dfop(dfop_data)
+    assert compile_dfop(dfop_data) is func
+    pipeline = dfop.Pipeline.from_dict(dfop_data)
+    assert compile_dfop(dfop.Pipeline.from_dict(dfop_data)) is compile_dfop(pipeline)
+    assert func(df).to_dicts() == [{"b": 3}, {"b": 2}]
+    assert func(df.lazy()).collect().to_dicts() == [{"b": 3}, {"b": 2}]
+    assert compile_dfop(dfop_data, use_cache=False) is not func
+
+    ex = compile_expr(expr.Column(name="a"))
+    assert compile_expr(expr.Column(name="a")) is ex
+    assert compile_expr(expr.Column(name="a"), use_cache=False) is not ex
+    compile_cache.clear()
+
+
+def test_registers_the_types():
+    # the dict form works without importing jsonpolars.api first
+    code = (
+        "from jsonpolars.cache import compile_expr; "
+        "compile_expr({'type': 'column', 'name': 'a'})"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.cache", preview=False)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import polars as pl
+import pytest
+
+from jsonpolars.dfop import api as dfop
+from jsonpolars.exc import ParamError
+from jsonpolars.cli import build_plan, main
+
+
+def make_files(tmp_path):
+    df = pl.DataFrame({"a": [3, 1, 2, 4], "b": ["x", "y", "z", "w"]})
+    df.write_parquet(tmp_path / "data.parquet")
+    plan = [dfop.Drop(columns=["b"]).to_dict(), dfop.Head(n=3).to_dict()]
+    path_plan = tmp_path / "plan.json"
+    path_plan.write_text(json.dumps(plan), encoding="utf-8")
+    return str(path_plan), str(tmp_path / "data.parquet")
+
+
+def test_build_plan(tmp_path):
+    dfops = build_plan({"type": "head", "n": 1}, "a.csv", "b.parquet")
+    assert isinstance(dfops[0], dfop.ScanCsv)
+    assert isinstance(dfops[-1], dfop.SinkParquet)
+    with pytest.raises(ParamError):
+        build_plan({"type": "head", "n": 1})
+    with pytest.raises(ParamError):
+        build_plan({"type": "head", "n": 1}, "a.txt")
+    with pytest.raises(ParamError):
+        build_plan([dfop.ScanCsv(source="a.csv").to_dict()], "a.csv")
+    with pytest.raises(ParamError):
+        build_plan(
+            [dfop.SinkCsv(path="a.csv").to_dict()], "a.csv", "b.csv"
+        )
+
+
+def test_main(tmp_path, capsys):
+    path_plan, path_input = make_files(tmp_path)
+
+    for i, options in enumerate([[], ["--no-streaming"]]):
+        options = options + ["--count-rows"]
+        path_output = str(tmp_path / f"out{i}.csv")
+        assert main([path_plan, path_input, "-o", path_output] + options) == 0
+        assert pl.read_csv(path_output).to_dict(as_series=False) == {
+            "a": [3, 1, 2]
+        }
+        err = capsys.readouterr().err
+        assert "rows in: 4" in err
+        assert "rows out: 3" in err
+        assert "total: " in err
+
+    # the rows are not counted by default
+    assert main([path_plan, path_input, "-o", str(tmp_path / "out.csv")]) == 0
+    err = capsys.readouterr().err
+    assert "rows in" not in err
+    assert "rows out" not in err
+
+    # without an output, the result is printed
+    assert main([path_plan, path_input]) == 0
+    captured = capsys.readouterr()
+    assert "shape: (3, 1)" in captured.out
+    assert "rows out: 3" in captured.err
+
+    # a bad plan
+    assert main([path_plan, str(tmp_path / "data.txt")]) == 1
+    assert "error: ParamError" in capsys.readouterr().err
+
+    # an unknown dfop type
+    path_bad_plan = tmp_path / "bad_plan.json"
+    path_bad_plan.write_text(json.dumps({"type": "nope"}), encoding="utf-8")
+    assert main([str(path_bad_plan), path_input]) == 1
+    assert "error: KeyError: 'nope'" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.cli", preview=False)
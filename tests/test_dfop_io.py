@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import polars as pl
+
+from jsonpolars.exc import ParamError
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.base_dfop import parse_dfop
+from jsonpolars.streaming import run_streaming
+
+
+records = [
+    {"id": 1, "name": "a", "score": 10},
+    {"id": 2, "name": "b", "score": 20},
+    {"id": 3, "name": "c", "score": 30},
+]
+
+
+@pytest.fixture
+def dir_data(tmp_path):
+    df = pl.DataFrame(records)
+    df.head(2).write_parquet(tmp_path / "1.parquet")
+    df.tail(1).write_parquet(tmp_path / "2.parquet")
+    df.write_csv(tmp_path / "data.csv")
+    df.write_ndjson(tmp_path / "data.ndjson")
+    df.write_ipc(tmp_path / "data.arrow")
+    return tmp_path
+
+
+def test_scan(dir_data):
+    scans = [
+        dfop.ScanParquet(source=str(dir_data / "*.parquet")),
+        dfop.ScanCsv(
+            source=str(dir_data / "data.csv"),
+            schema_overrides={"score": "Float64"},
+        ),
+        dfop.ScanNdjson(
+            source=str(dir_data / "data.ndjson"),
+            schema_overrides={"score": "Float64"},
+        ),
+        dfop.ScanIpc(source=str(dir_data / "data.arrow")),
+    ]
+    for scan in scans:
+        assert scan.is_source is True
+        assert parse_dfop(scan.to_dict()) == scan
+        lf = scan.to_polars()
+        assert isinstance(lf, pl.LazyFrame)
+        assert lf.collect().to_dicts() == records
+
+        # the content of the input frame is ignored, its type is kept
+        df = scan.to_polars(pl.DataFrame({"x": [1]}))
+        assert isinstance(df, pl.DataFrame)
+        assert df.to_dicts() == records
+        lf = scan.to_polars(pl.LazyFrame({"x": [1]}))
+        assert isinstance(lf, pl.LazyFrame)
+        assert lf.collect().to_dicts() == records
+
+        pipeline = dfop.Pipeline(
+            dfops=[
+                scan,
+                dfop.Select(exprs=["id", "name"]),
+                dfop.Sort(by=["id"], descending=True),
+                dfop.Head(n=2),
+            ]
+        )
+        expected = [{"id": 3, "name": "c"}, {"id": 2, "name": "b"}]
+        assert pipeline.is_source is True
+        assert pipeline.to_polars().to_dicts() == expected
+        assert pipeline.compile()().to_dicts() == expected
+        assert run_streaming(pipeline).to_dicts() == expected
+        pipeline1 = parse_dfop(pipeline.to_dict())
+        assert pipeline1.to_polars().to_dicts() == expected
+
+        df = pipeline.to_polars(pl.DataFrame({"x": [1]}))
+        assert df.to_dicts() == expected
+        lf = pipeline.to_polars(pl.LazyFrame({"x": [1]}))
+        assert lf.collect().to_dicts() == expected
+        assert run_streaming(pipeline, pl.DataFrame({"x": [1]})).to_dicts() == expected
+
+        with pytest.raises(ParamError):
+            dfop.Pipeline(dfops=[dfop.Head(n=1), scan]).to_polars(pl.DataFrame())
+        with pytest.raises(ParamError):
+            run_streaming([dfop.Head(n=1), scan], pl.DataFrame())
+
+        # a nested source pipeline stays lazy
+        pipeline2 = dfop.Pipeline(dfops=[pipeline, dfop.Head(n=1)])
+        assert pipeline2.to_polars().to_dicts() == expected[:1]
+
+
+def test_projection_pushdown(tmp_path):
+    pl.DataFrame({f"c{i}": [i] for i in range(400)}).write_parquet(
+        tmp_path / "wide.parquet"
+    )
+    pipeline = dfop.Pipeline(
+        dfops=[
+            dfop.ScanParquet(source=str(tmp_path / "*.parquet")),
+            dfop.Select(exprs=["c1", "c2", expr.Column(name="c3")]),
+        ]
+    )
+    assert "PROJECT 3/400 COLUMNS" in pipeline.to_lazyframe().explain()
+    assert pipeline.to_polars().to_dicts() == [{"c1": 1, "c2": 2, "c3": 3}]
+
+
+def test_predicate_pushdown(tmp_path):
+    pl.DataFrame({"id": list(range(1000)), "v": list(range(1000))}).write_parquet(
+        tmp_path / "events.parquet", row_group_size=100
+    )
+    pipeline = dfop.Pipeline(
+        dfops=[
+            dfop.ScanParquet(source=str(tmp_path / "events.parquet")),
+            dfop.Filter(
+                predicates=[
+                    expr.GreatThanOrEqual(left=expr.Column(name="id"), right=950)
+                ]
+            ),
+            dfop.Select(exprs=["v"]),
+        ]
+    )
+    # the predicate runs in the parquet reader, not after the scan
+    plan = pipeline.to_lazyframe().explain()
+    assert "SELECTION: " in plan
+    assert "FILTER" not in plan
+    assert pipeline.to_polars()["v"].to_list() == list(range(950, 1000))
+
+
+def read_csv(path: str) -> pl.DataFrame:
+    return pl.read_csv(path, separator="|")
+
+
+def test_sink(dir_data):
+    dir_out = dir_data / "out"
+    dir_out.mkdir()
+    source = dfop.ScanParquet(source=str(dir_data / "*.parquet"))
+    select = dfop.Select(exprs=["id", "score"])
+    expected = [{"id": 1, "score": 10}, {"id": 2, "score": 20}, {"id": 3, "score": 30}]
+    sinks = [
+        (
+            dfop.SinkParquet(
+                path=str(dir_out / "out.parquet"),
+                compression="zstd",
+                compression_level=3,
+                statistics=True,
+                row_group_size=2,
+            ),
+            pl.read_parquet,
+        ),
+        (dfop.SinkIpc(path=str(dir_out / "out.arrow"), compression="lz4"), pl.read_ipc),
+        (dfop.SinkCsv(path=str(dir_out / "out.csv"), separator="|"), read_csv),
+        (dfop.SinkNdjson(path=str(dir_out / "out.ndjson")), pl.read_ndjson),
+    ]
+    for sink, read in sinks:
+        assert sink.is_sink is True
+        assert parse_dfop(sink.to_dict()) == sink
+        pipeline = dfop.Pipeline(dfops=[source, select, dfop.Sort(by=["id"]), sink])
+        assert pipeline.is_sink is True
+        # the terminal method writes without collecting
+        assert parse_dfop(pipeline.to_dict()).sink() is None
+        assert read(sink.path).to_dicts() == expected
+
+        assert run_streaming([source, dfop.Sort(by=["id"], descending=True), sink]) is None
+        assert read(sink.path)["id"].to_list() == [3, 2, 1]
+
+        # to_polars writes and gives back the result
+        for run in [pipeline.to_polars, pipeline.compile()]:
+            df = run()
+            assert isinstance(df, pl.DataFrame)
+            assert df.to_dicts() == expected
+            assert read(sink.path).to_dicts() == expected
+
+        lf = dfop.Pipeline(dfops=[select, sink]).to_polars(
+            pl.LazyFrame(records).tail(1)
+        )
+        assert isinstance(lf, pl.LazyFrame)
+        assert lf.collect().to_dicts() == [{"id": 3, "score": 30}]
+        assert read(sink.path)["id"].to_list() == [3]
+
+        df = pl.DataFrame(records).head(1)
+        assert sink.to_polars(df) is df
+        assert read(sink.path)["id"].to_list() == [1]
+
+        with pytest.raises(ParamError):
+            dfop.Pipeline(dfops=[source, select]).sink()
+        with pytest.raises(ParamError):
+            pipeline.to_lazyframe()
+        with pytest.raises(ParamError):
+            dfop.Pipeline(dfops=[source, sink, select]).to_polars()
+        with pytest.raises(ParamError):
+            run_streaming([source, sink, select])
+
+
+def test_sink_partitioned_parquet(tmp_path):
+    dir_out = tmp_path / "out"
+    rows = [
+        {"region": "us", "date": "2024-01-01", "v": 1},
+        {"region": "us", "date": "2024-01-02", "v": 2},
+        {"region": "eu", "date": "2024-01-01", "v": 3},
+        {"region": "us", "date": "2024-01-01", "v": 4},
+    ]
+    sink = dfop.SinkPartitionedParquet(
+        path=str(dir_out),
+        partition_by=["region", "date"],
+        include_key=False,
+        compression="zstd",
+        mkdir=True,
+    )
+    assert sink.is_sink is True
+    assert parse_dfop(sink.to_dict()) == sink
+
+    pipeline = dfop.Pipeline(dfops=[dfop.Sort(by=["v"]), sink])
+    assert pipeline.sink(pl.LazyFrame(rows)) is None
+    files = sorted(
+        path.relative_to(dir_out).parent.as_posix()
+        for path in dir_out.glob("**/*.parquet")
+    )
+    assert files == [
+        "region=eu/date=2024-01-01",
+        "region=us/date=2024-01-01",
+        "region=us/date=2024-01-02",
+    ]
+    assert pl.read_parquet(
+        dir_out / "region=us" / "date=2024-01-01", hive_partitioning=False
+    ).columns == ["v"]
+
+    scan = dfop.ScanParquet(
+        source=str(dir_out / "**" / "*.parquet"),
+        hive_partitioning=True,
+    )
+    df = dfop.Pipeline(dfops=[scan, dfop.Sort(by=["v"])]).to_polars()
+    df = df.select("region", pl.col("date").cast(pl.Utf8), "v")
+    assert df.to_dicts() == rows
+
+
+def test_source_required():
+    pipeline = dfop.Pipeline(dfops=[dfop.Head(n=1)])
+    assert pipeline.is_source is False
+    assert dfop.Pipeline().is_source is False
+    with pytest.raises(ParamError):
+        pipeline.to_polars()
+    with pytest.raises(ParamError):
+        pipeline.compile()()
+    with pytest.raises(ParamError):
+        run_streaming(pipeline)
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.dfop.io", preview=False)
@@ -171,6 +171,39 @@ case_drop_nulls_3 = Case(
         {"id": None, "name": "c"},
     ],
 )
+case_filter_1 = Case(
+    input_records=[
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "b"},
+        {"id": 3, "name": "c"},
+    ],
+    dfop=dfop.Filter(
+        predicates=[
+            expr.LogicalAnd(
+                left=expr.GreatThan(left=expr.Column(name="id"), right=1),
+                right=expr.LessThan(left=expr.Column(name="id"), right=3),
+            ),
+        ],
+    ),
+    expected_output_records=[
+        {"id": 2, "name": "b"},
+    ],
+)
+case_filter_2 = Case(
+    input_records=[
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "b"},
+        {"id": 3, "name": "b"},
+    ],
+    dfop=dfop.Filter(
+        predicates=[expr.GreatThan(left=expr.Column(name="id"), right=1)],
+        constraints={"name": "b"},
+    ),
+    expected_output_records=[
+        {"id": 2, "name": "b"},
+        {"id": 3, "name": "b"},
+    ],
+)
 
 
 def test():
@@ -188,6 +221,8 @@ def test():
     case_drop_nulls_1.run_test()
     case_drop_nulls_2.run_test()
     case_drop_nulls_3.run_test()
+    case_filter_1.run_test()
+    case_filter_2.run_test()
 
 
 if __name__ == "__main__":
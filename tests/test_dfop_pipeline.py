@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import dataclasses
+
+import pytest
+import polars as pl
+
+from jsonpolars.exc import LazyFrameNotSupportedError
+from jsonpolars.base_dfop import BaseDfop, T_FRAME
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.base_dfop import parse_dfop
+from jsonpolars.tests.dfop_case import Case
+
+
+case_pipeline = Case(
+    input_records=[
+        {"id": 3, "name": "c", "score": 30},
+        {"id": 1, "name": "a", "score": None},
+        {"id": 2, "name": "b", "score": 20},
+        {"id": 4, "name": "d", "score": 40},
+    ],
+    dfop=dfop.Pipeline(
+        dfops=[
+            dfop.Select(exprs=["id", "score"]),
+            dfop.WithColumns(
+                named_exprs={
+                    "double": expr.Multiply(
+                        left=expr.Column(name="score"),
+                        right=expr.Lit(value=2),
+                    ),
+                },
+            ),
+            dfop.DropNulls(),
+            dfop.Sort(by=["id"]),
+            dfop.Head(n=2),
+        ]
+    ),
+    expected_output_records=[
+        {"id": 2, "score": 20, "double": 40},
+        {"id": 3, "score": 30, "double": 60},
+    ],
+)
+
+
+def test_pipeline():
+    print("")
+
+    case_pipeline.run_test()
+
+
+def test_to_dict_from_dict():
+    pipeline = dfop.Pipeline(
+        dfops=[
+            dfop.Rename(mapping={"a": "b"}),
+            dfop.Pipeline(dfops=[dfop.Head(n=1)]),
+        ]
+    )
+    dct = pipeline.to_dict()
+    assert dct == {
+        "type": "pipeline",
+        "dfops": [
+            {"type": "rename", "mapping": {"a": "b"}},
+            {"type": "pipeline", "dfops": [{"type": "head", "n": 1}]},
+        ],
+    }
+    assert parse_dfop(dct) == pipeline
+
+
+def test_to_lazyframe():
+    df = pl.DataFrame([{"a": 1}, {"a": 2}])
+    pipeline = dfop.Pipeline(dfops=[dfop.Tail(n=1)])
+    lf = pipeline.to_lazyframe(df)
+    assert isinstance(lf, pl.LazyFrame)
+    assert lf.collect().to_dicts() == [{"a": 2}]
+
+
+@dataclasses.dataclass
+class Transpose(BaseDfop):
+    type: str = dataclasses.field(default="test_transpose")
+
+    lazy_supported = False
+
+    def to_polars(self, df: T_FRAME) -> T_FRAME:
+        self.ensure_eager(df)
+        return df.transpose()
+
+
+def test_lazy_frame():
+    df = pl.DataFrame([{"a": 1}, {"a": 2}])
+    pipeline = dfop.Pipeline(dfops=[dfop.Tail(n=1)])
+    assert pipeline.lazy_supported is True
+    lf = pipeline.to_polars(df.lazy())
+    assert isinstance(lf, pl.LazyFrame)
+    assert lf.collect().to_dicts() == [{"a": 2}]
+
+    transpose = Transpose()
+    assert transpose.to_polars(df).to_dicts() == [
+        {"column_0": 1, "column_1": 2}
+    ]
+    with pytest.raises(LazyFrameNotSupportedError):
+        transpose.to_polars(df.lazy())
+
+    pipeline = dfop.Pipeline(dfops=[dfop.Tail(n=1), transpose])
+    assert pipeline.lazy_supported is False
+    with pytest.raises(LazyFrameNotSupportedError):
+        pipeline.to_polars(df)
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.dfop.pipeline", preview=False)
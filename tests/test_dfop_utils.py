@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+from jsonpolars.dfop import api as dfop
+from jsonpolars.utils_dfop import (
+    to_jsonpolars_dfop,
+    batch_to_jsonpolars_dfops,
+    to_dfop_list,
+)
+
+
+def test_to_jsonpolars_dfop():
+    assert to_jsonpolars_dfop({"type": "head", "n": 1}) == dfop.Head(n=1)
+    assert to_jsonpolars_dfop(dfop.Head(n=1)) == dfop.Head(n=1)
+    assert batch_to_jsonpolars_dfops([{"type": "head"}, dfop.Tail()]) == [
+        dfop.Head(),
+        dfop.Tail(),
+    ]
+
+
+def test_to_dfop_list():
+    assert to_dfop_list({"type": "head", "n": 1}) == [dfop.Head(n=1)]
+    assert to_dfop_list(
+        [
+            dfop.Head(n=2),
+            {
+                "type": "pipeline",
+                "dfops": [
+                    {"type": "tail", "n": 1},
+                    {"type": "pipeline", "dfops": [{"type": "count"}]},
+                ],
+            },
+        ]
+    ) == [dfop.Head(n=2), dfop.Tail(n=1), dfop.Count()]
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.utils_dfop", preview=False)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+
+import polars as pl
+
+from jsonpolars.dfop import api as dfop
+from jsonpolars.ipc import MappedIpc, map_ipc, clear_ipc_cache, run_plan
+
+
+def test_mapped_ipc(tmp_path):
+    path = tmp_path / "data.arrow"
+    df = pl.DataFrame({"id": [3, 1, 2], "name": ["c", "a", "b"]})
+    df.write_ipc(path, compression="uncompressed")
+
+    clear_ipc_cache()
+    assert map_ipc(path) is map_ipc(str(path))
+
+    source = MappedIpc(path=str(path))
+    assert pickle.loads(pickle.dumps(source)) == source
+    plans = [
+        [{"type": "sort", "by": ["id"]}, {"type": "head", "n": 2}],
+        dfop.Select(exprs=["name"]),
+    ]
+    expected = [
+        [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}],
+        [{"name": "c"}, {"name": "a"}, {"name": "b"}],
+    ]
+    assert source.run(plans[0]).to_dicts() == expected[0]
+    for workers in [0, 2]:
+        dfs = source.run_many(plans, workers=workers)
+        assert [df.to_dicts() for df in dfs] == expected
+
+    # a replaced file is mapped again
+    old_df = map_ipc(path)
+    path_new = tmp_path / "new.arrow"
+    df.head(1).write_ipc(path_new, compression="uncompressed")
+    os.replace(path_new, path)
+    new_df = map_ipc(path)
+    assert new_df is not old_df
+    assert new_df.to_dicts() == [{"id": 3, "name": "c"}]
+    assert old_df.height == 3
+
+    assert run_plan(dfop.Head(n=1), df.lazy()).collect().to_dicts() == [
+        {"id": 3, "name": "c"}
+    ]
+    clear_ipc_cache()
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.ipc", preview=False)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor, Future
+
+from jsonpolars import loader
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.loader import LineError, load_plans
+
+
+def make_lines():
+    head = dfop.Head(n=3)
+    select = dfop.Select(exprs=[expr.Column(name="a")])
+    return [
+        json.dumps(head.to_dict()),
+        "{not json",
+        "",
+        json.dumps({"type": "unknown"}),
+        json.dumps([select.to_dict(), head.to_dict()]),
+    ]
+
+
+def test_load_plans(tmp_path):
+    lines = make_lines()
+    path = tmp_path / "plans.ndjson"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    for workers in [0, 2]:
+        res = load_plans(path, workers=workers, chunk_size=2)
+        assert res.line_numbers == [1, 5]
+        assert res.plans[0] == dfop.Head(n=3)
+        assert res.plans[1] == dfop.Pipeline(
+            dfops=[dfop.Select(exprs=[expr.Column(name="a")]), dfop.Head(n=3)]
+        )
+        assert [error.line_number for error in res.errors] == [2, 4]
+        assert all(isinstance(error, LineError) for error in res.errors)
+        assert res.errors[0].error.startswith("JSONDecodeError")
+
+    res = load_plans(io.StringIO("\n".join(lines)), workers=1)
+    assert res.line_numbers == [1, 5]
+    res = load_plans(io.BytesIO("\n".join(lines).encode("utf-8")), workers=1)
+    assert res.line_numbers == [1, 5]
+
+
+def make_deep_plan(depth: int) -> dfop.Select:
+    ex = expr.Column(name="a")
+    for _ in range(depth):
+        ex = expr.Plus(left=ex, right=expr.Lit(value=1))
+    return dfop.Select(exprs=[ex])
+
+
+def test_deep_plan(tmp_path):
+    # a parsed plan this deep cannot be pickled, the worker sends the raw line
+    plan = make_deep_plan(900)
+    lines = make_lines() + [json.dumps(plan.to_dict())]
+    path = tmp_path / "plans.ndjson"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    res = load_plans(path, workers=2, chunk_size=2)
+    assert res.line_numbers == [1, 5, 6]
+    assert res.plans[2] == plan
+    assert [error.line_number for error in res.errors] == [2, 4]
+
+
+def test_decode_chunk(monkeypatch):
+    # the worker only decodes the JSON, the plan is parsed once in the parent
+    calls = list()
+    monkeypatch.setattr(loader, "parse_plan", lambda data: calls.append(data))
+    chunk = list(enumerate(make_lines(), start=1))
+    chunk.pop(2)  # the blank line
+    decoded_chunk = loader._decode_chunk(chunk)
+    assert calls == []
+    assert [type(item) for _, item in decoded_chunk] == [dict, LineError, dict, list]
+    future = Future()
+    future.set_result(decoded_chunk)
+    loader._finish_chunk(chunk, future)
+    assert len(calls) == 3
+
+class FailingExecutor(ProcessPoolExecutor):
+    """
+    The first chunk fails in the worker, the following submits find the pool
+    broken.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.n_submit = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.n_submit += 1
+        if self.n_submit == 1:
+            future = Future()
+            future.set_exception(RecursionError("maximum recursion depth exceeded"))
+            return future
+        if self.n_submit == 2:
+            return super().submit(fn, *args, **kwargs)
+        raise loader.BrokenProcessPool("a worker died")
+
+
+def test_failing_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "ProcessPoolExecutor", FailingExecutor)
+    lines = make_lines() * 3
+    res = load_plans(io.StringIO("\n".join(lines)), workers=2, chunk_size=2)
+    assert res.line_numbers == [1, 5, 6, 10, 11, 15]
+    assert [error.line_number for error in res.errors] == [2, 4, 7, 9, 12, 14]
+    assert res.plans[0] == dfop.Head(n=3)
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.loader", preview=False)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+import polars as pl
+
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.base_expr import parse_expr
+from jsonpolars.base_dfop import parse_dfop
+from jsonpolars.optimize import (
+    fold_constants,
+    eliminate_common_subexprs,
+    merge_adjacent_dfops,
+)
+
+Lit = expr.Lit
+col_a = expr.Column(name="a")
+
+
+def check_fold(ex, expected):
+    df = pl.DataFrame({"a": [1, 2, None]}, schema={"a": pl.Int8})
+    before = ex.to_dict()
+    folded = fold_constants(ex)
+    assert folded == expected
+    # the input is not modified, the folded tree serializes back
+    assert ex.to_dict() == before
+    assert parse_expr(folded.to_dict()) == folded
+    assert df.with_columns(folded.to_polars()).equals(
+        df.with_columns(ex.to_polars())
+    )
+
+
+def test_fold_constants():
+    check_fold(expr.Plus(left=Lit(value=1), right=Lit(value=2)), Lit(value=3))
+    check_fold(expr.Plus(left=1, right=2), Lit(value=3))
+    check_fold(
+        expr.Format(f_string="{}-{}", exprs=[Lit(value="x"), Lit(value=1)]),
+        Lit(value="x-1"),
+    )
+    # the dtype fixed by a cast is kept
+    check_fold(
+        expr.Plus(left=col_a, right=expr.Cast(expr=Lit(value=1), dtype="Int32")),
+        expr.Plus(left=col_a, right=Lit(value=1, dtype="Int32")),
+    )
+    # a dynamic literal stays dynamic
+    check_fold(
+        expr.Plus(left=col_a, right=expr.Multiply(left=Lit(value=2), right=3)),
+        expr.Plus(left=col_a, right=Lit(value=6)),
+    )
+    # a column is never folded
+    ex = expr.Format(f_string="{}-{}", exprs=["a", Lit(value=1)])
+    check_fold(ex, ex)
+    # a date cannot be serialized to JSON
+    ex = expr.StrToDate(expr=Lit(value="2024-01-01"), format="%Y-%m-%d")
+    check_fold(ex, ex)
+    # inf and nan cannot be serialized to JSON
+    for ex in [
+        expr.TrueDiv(left=Lit(value=1), right=Lit(value=0)),
+        expr.TrueDiv(left=Lit(value=0.0), right=Lit(value=0)),
+    ]:
+        assert fold_constants(ex) == ex
+
+
+def test_simplify_logical():
+    gt = expr.GreatThan(left=col_a, right=Lit(value=1))
+    eq = expr.Equal(left=col_a, right=Lit(value=2))
+    check_fold(expr.LogicalAnd(left=gt, right=Lit(value=True)), gt)
+    check_fold(expr.LogicalOr(left=gt, right=False), gt)
+    check_fold(
+        expr.LogicalAnd(
+            left=expr.LogicalAnd(left=gt, right=Lit(value=True)),
+            right=expr.LogicalOr(left=Lit(value=False), right=eq),
+        ),
+        # the output name of the literal on the left is kept
+        expr.LogicalAnd(left=gt, right=expr.Alias(name="literal", expr=eq)),
+    )
+    check_fold(
+        expr.LogicalAnd(left=Lit(value=True), right=Lit(value=False)),
+        Lit(value=False),
+    )
+    # ``x & True`` is a bitwise and if x is not a boolean
+    ex = expr.LogicalAnd(left=col_a, right=Lit(value=True))
+    assert fold_constants(ex) == ex
+
+
+def test_fold_dfop():
+    shared = expr.Plus(left=Lit(value=1), right=Lit(value=2))
+    op = dfop.WithColumns(named_exprs={"b": shared, "c": shared})
+    folded = fold_constants(op)
+    assert folded.named_exprs == {"b": Lit(value=3), "c": Lit(value=3)}
+    assert folded.named_exprs["b"] is folded.named_exprs["c"]
+    assert op.named_exprs["b"] is shared
+    pipeline = dfop.Pipeline(dfops=[op, dfop.Select(exprs=["a", "b"])])
+    assert fold_constants(pipeline).dfops[0] == folded
+
+
+def make_cse_df():
+    return pl.DataFrame(
+        {
+            "s": ["2024-01-01 10:00:00", "2024-01-02 23:00:00", None],
+            "tags": [["a"], ["b", "c"], []],
+        }
+    )
+
+
+def check_cse(plan, n_temp):
+    df = make_cse_df()
+    new_plan = eliminate_common_subexprs(plan)
+    assert dfop.Pipeline(dfops=new_plan).to_polars(df).equals(
+        dfop.Pipeline(dfops=plan).to_polars(df)
+    )
+    # the new plan serializes back
+    new_dicts = [op.to_dict() for op in new_plan]
+    assert [parse_dfop(dct) for dct in new_dicts] == new_plan
+    temp_names = {
+        name
+        for op in new_plan
+        if op.type == "with_columns"
+        for name in op.named_exprs
+        if name.startswith("__cse_")
+    }
+    assert len(temp_names) == n_temp
+    return new_plan
+
+
+def test_eliminate_common_subexprs():
+    dt = expr.StrToDatetime(expr=expr.Column(name="s"), format="%Y-%m-%d %H:%M:%S")
+    hour = expr.DtHour(expr=dt)
+    op = dfop.WithColumns(
+        exprs=[hour],
+        named_exprs={
+            f"c{i}": expr.Plus(left=expr.DtHour(expr=dt), right=Lit(value=i))
+            for i in range(5)
+        },
+    )
+    new_plan = check_cse([op], 1)
+    assert [op.type for op in new_plan] == ["with_columns", "with_columns", "drop"]
+    # the temporary column holds the largest common sub tree
+    assert list(new_plan[0].named_exprs.values()) == [hour]
+
+    # a frozen plan parsed with intern
+    op = parse_dfop(op.to_dict(), intern=True)
+    check_cse([op], 1)
+
+    # the temporary columns of a select are not in the output
+    op = dfop.Select(
+        exprs=[expr.DtDay(expr=dt)],
+        named_exprs={"hour": hour, "hour2": expr.Multiply(left=hour, right=2)},
+    )
+    new_plan = check_cse([op], 1)
+    assert [op.type for op in new_plan] == ["with_columns", "select"]
+
+    # an aggregation is broadcast by a temporary column, it is left alone
+    join = expr.StrJoin(expr=expr.Column(name="s"))
+    check_cse([dfop.Select(exprs=[join], named_exprs={"j": join})], 0)
+    # the sub trees of a list eval are evaluated per list element
+    ev = expr.ListEval(
+        expr=expr.Column(name="tags"),
+        expr_to_run=expr.StrToUpperCase(expr=expr.Element()),
+    )
+    new_plan = check_cse([dfop.WithColumns(named_exprs={"a": ev, "b": ev})], 1)
+    assert new_plan[1].named_exprs["a"].type == "alias"
+    check_cse([dfop.Head(n=1), dfop.WithColumns(exprs=[hour])], 0)
+
+    # a wildcard or a regex would pick the temporary columns too
+    upper = expr.StrToUpperCase(expr=expr.Column(name="s"))
+    for wildcard in ["*", expr.Column(name="*"), expr.Column(name="^.*$")]:
+        op = dfop.Select(exprs=[wildcard], named_exprs={"x": upper, "y": upper})
+        check_cse([op], 0)
+        op = dfop.WithColumns(exprs=[wildcard], named_exprs={"x": upper, "y": upper})
+        check_cse([op], 0)
+
+
+
+def check_merge(plan, expected_types):
+    df = pl.DataFrame({"a": [1, 2, None], "b": [3, 4, 5]})
+    before = [op.to_dict() for op in plan]
+    new_plan = merge_adjacent_dfops(plan)
+    assert [op.type for op in new_plan] == expected_types
+    # the input is not modified, the merged plan serializes back
+    assert [op.to_dict() for op in plan] == before
+    assert [parse_dfop(op.to_dict()) for op in new_plan] == new_plan
+    expected = dfop.Pipeline(dfops=plan).to_polars(df)
+    assert dfop.Pipeline(dfops=new_plan).to_polars(df).equals(expected)
+    return new_plan
+
+
+def test_merge_adjacent_dfops():
+    plus_1 = expr.Plus(left=col_a, right=1)
+    col_b = expr.Column(name="b")
+
+    # independent with columns are merged, the column order is kept
+    new_plan = check_merge(
+        [
+            dfop.WithColumns(named_exprs={"c": plus_1}),
+            dfop.WithColumns(exprs=[expr.Alias(name="d", expr=col_b)]),
+            dfop.WithColumns(named_exprs={"e": expr.Multiply(left=col_b, right=2)}),
+        ],
+        ["with_columns"],
+    )
+    df = new_plan[0].to_polars(pl.DataFrame({"a": [1], "b": [2]}))
+    assert df.columns == ["a", "b", "c", "d", "e"]
+    # the second one reads or replaces a column of the first one
+    check_merge(
+        [
+            dfop.WithColumns(named_exprs={"c": plus_1}),
+            dfop.WithColumns(named_exprs={"d": expr.Column(name="c")}),
+        ],
+        ["with_columns", "with_columns"],
+    )
+    check_merge(
+        [
+            dfop.WithColumns(named_exprs={"c": plus_1}),
+            dfop.WithColumns(named_exprs={"c": col_b}),
+        ],
+        ["with_columns", "with_columns"],
+    )
+
+    # a rename is folded into the aliases of the select
+    new_plan = check_merge(
+        [
+            dfop.Select(
+                exprs=["a", expr.Alias(name="x", expr=plus_1), col_b],
+                named_exprs={"y": plus_1},
+            ),
+            dfop.Rename(mapping={"a": "a1", "x": "x1", "y": "b", "b": "y"}),
+        ],
+        ["select"],
+    )
+    assert new_plan[0].exprs[1] == expr.Alias(name="x1", expr=plus_1)
+    # polars raises on a missing column, they are not merged
+    plan = [dfop.Select(exprs=["a"]), dfop.Rename(mapping={"b": "b1"})]
+    assert len(merge_adjacent_dfops(plan)) == 2
+    # a rename after with columns is not folded, the computed column may
+    # replace an input column
+    plan = [
+        dfop.WithColumns(named_exprs={"b": plus_1}),
+        dfop.Rename(mapping={"b": "b1"}),
+    ]
+    assert merge_adjacent_dfops(plan) == plan
+    df = dfop.Pipeline(dfops=plan).to_polars(pl.DataFrame({"a": [1], "b": [2]}))
+    assert df.columns == ["a", "b1"]
+
+    # a drop is collapsed into the select
+    check_merge(
+        [
+            dfop.WithColumns(named_exprs={"c": plus_1}),
+            dfop.WithColumns(named_exprs={"d": col_b}),
+            dfop.Select(
+                exprs=["a", "b", expr.Column(name="c")],
+                named_exprs={"e": col_b},
+            ),
+            dfop.Rename(mapping={"c": "z"}),
+            dfop.Drop(columns=["a", expr.Column(name="e")]),
+        ],
+        ["with_columns", "select"],
+    )
+    # the literal alone would give back one row
+    check_merge(
+        [
+            dfop.Select(exprs=["a", expr.Alias(name="one", expr=Lit(value=1))]),
+            dfop.Drop(columns=["a"]),
+        ],
+        ["select", "drop"],
+    )
+    plan = [dfop.Select(exprs=["a"]), dfop.Drop(columns=[expr.Column(name="*")])]
+    assert len(merge_adjacent_dfops(plan)) == 2
+
+    # a nested pipeline is flattened, the other dfops are left alone
+    check_merge(
+        [
+            dfop.Pipeline(dfops=[dfop.WithColumns(named_exprs={"c": plus_1})]),
+            dfop.WithColumns(named_exprs={"d": col_b}),
+            dfop.Sort(by=["b"]),
+            dfop.WithColumns(named_exprs={"e": col_b}),
+        ],
+        ["with_columns", "sort", "with_columns"],
+    )
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.optimize", preview=False)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import io
+import sys
+import threading
+import subprocess
+
+import polars as pl
+import pytest
+
+from jsonpolars.exc import ParamError
+from jsonpolars.dfop import api as dfop
+from jsonpolars.server import PlanRegistry, PlanServer
+from jsonpolars.client import PlanClient
+
+
+@pytest.fixture
+def server():
+    server = PlanServer(port=0, allow_io=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_server(server, tmp_path):
+    client = PlanClient(port=server.server_address[1], timeout=10)
+    assert server.url.startswith("http://127.0.0.1:")
+    df = pl.DataFrame({"a": [3, 1, 2]})
+
+    client.register("sort", [dfop.Sort(by=["a"]).to_dict()])
+    client.register("head", dfop.Head(n=1).to_dict())
+    df.write_parquet(tmp_path / "data.parquet")
+    client.register(
+        "scan", [dfop.ScanParquet(source=str(tmp_path / "data.parquet")).to_dict()]
+    )
+    assert client.list_ids() == ["sort", "head", "scan"]
+
+    assert client.run("sort", df)["a"].to_list() == [1, 2, 3]
+    assert client.run("head", df)["a"].to_list() == [3]
+    assert client.run("scan").equals(df)
+
+    client.unregister("head")
+    assert client.list_ids() == ["sort", "scan"]
+
+    with pytest.raises(ParamError, match="HTTP 404"):
+        client.run("head", df)
+    with pytest.raises(ParamError, match="HTTP 404"):
+        client.unregister("head")
+    with pytest.raises(ParamError, match="HTTP 400"):
+        client.register("bad", {"type": "unknown"})
+    with pytest.raises(ParamError, match="HTTP 400"):
+        client.run("sort", pl.DataFrame({"b": [1]}))
+    with pytest.raises(ParamError, match="HTTP 404"):
+        client._request("GET", "/unknown")
+    with pytest.raises(ParamError, match="HTTP 404"):
+        client._request("PUT", "/unknown", b"{}")
+    with pytest.raises(ParamError, match="HTTP 404"):
+        client._request("POST", "/plans/sort", b"")
+
+
+def test_reject_io(tmp_path):
+    registry = PlanRegistry()
+    registry.register("head", [dfop.Head(n=1)])
+    scan = dfop.ScanParquet(source=str(tmp_path / "data.parquet"))
+    sink = dfop.SinkParquet(path=str(tmp_path / "out.parquet"))
+    for plan in [[scan], [dfop.Head(n=1), sink], dfop.Pipeline(dfops=[sink])]:
+        with pytest.raises(ParamError, match="not allowed"):
+            registry.register("io", plan)
+    assert registry.list_ids() == ["head"]
+
+
+def test_write_error(server, monkeypatch):
+    client = PlanClient(port=server.server_address[1], timeout=10)
+    client.register("head", dfop.Head(n=1).to_dict())
+    buffer = io.BytesIO()
+    pl.DataFrame({"a": [1]}).write_ipc_stream(buffer)
+
+    def fail(self, *args, **kwargs):
+        raise ValueError("cannot write")
+
+    monkeypatch.setattr(pl.DataFrame, "write_ipc_stream", fail)
+    with pytest.raises(ParamError, match="HTTP 500: ValueError: cannot write"):
+        client.run_ipc("head", buffer.getvalue())
+
+
+def test_client_imports_no_polars():
+    code = (
+        "import sys; import jsonpolars.client; "
+        "assert 'polars' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_localhost_only():
+    with pytest.raises(ParamError):
+        PlanServer(host="0.0.0.0", port=0)
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.server", preview=False)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import subprocess
+
+import polars as pl
+
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.slices import is_row_local, iter_slices, run_sliced
+
+
+def make_plan():
+    return [
+        dfop.WithColumns(
+            named_exprs={
+                "c": expr.Plus(left=expr.Column(name="a"), right=expr.Lit(value=1)),
+            }
+        ),
+        dfop.DropNulls(subset=["b"]),
+        dfop.Rename(mapping={"c": "d"}),
+        dfop.Drop(columns=["a"]),
+        dfop.Select(exprs=["b", "d"]),
+    ]
+
+
+def test_is_row_local():
+    assert is_row_local(make_plan()) is True
+    assert is_row_local(dfop.Pipeline(dfops=make_plan())) is True
+    assert is_row_local([dfop.Sort(by=["a"])]) is False
+    assert is_row_local([dfop.Head(n=1)]) is False
+    filter_ = dfop.Filter(
+        predicates=[expr.GreatThan(left=expr.Column(name="a"), right=1)]
+    )
+    assert is_row_local([filter_]) is True
+    # an aggregating expression
+    assert (
+        is_row_local(
+            [dfop.Select(exprs=[expr.StrJoin(expr=expr.Column(name="a"))])]
+        )
+        is False
+    )
+    # a select of literals gives back one row
+    assert is_row_local([dfop.Select(exprs=[expr.Lit(value=1)])]) is False
+    assert is_row_local([dfop.WithColumns(exprs=[expr.Lit(value=1)])]) is True
+
+
+def test_iter_slices(tmp_path):
+    df = pl.DataFrame(
+        {
+            "a": list(range(10)),
+            "b": [None if i % 3 == 0 else i for i in range(10)],
+        }
+    )
+    plan = make_plan()
+    expected = dfop.Pipeline(dfops=plan).to_polars(df)
+    assert expected.height == 6
+
+    chunks = list(iter_slices(plan, df, slice_size=4))
+    assert [chunk.height for chunk in chunks] == [2, 3, 1]
+    assert pl.concat(chunks).equals(expected)
+
+    df.write_parquet(tmp_path / "data.parquet")
+    lf = pl.scan_parquet(tmp_path / "data.parquet")
+    for source in [df, lf]:
+        for workers in [1, 3]:
+            res = run_sliced(plan, source, slice_size=3, workers=workers)
+            assert res.equals(expected)
+
+    # the schema of an empty input is kept
+    for source in [df.clear(), lf.filter(pl.col("a") < 0)]:
+        res = run_sliced(plan, source, slice_size=3)
+        assert res.columns == ["b", "d"]
+        assert res.height == 0
+
+    # a plan that is not row-local runs on the whole frame
+    chunks = list(iter_slices([dfop.Sort(by=["a"], descending=True)], df, 4))
+    assert len(chunks) == 1
+    assert chunks[0]["a"].to_list() == list(range(10))[::-1]
+
+
+
+def test_lazy_input_runs_once(monkeypatch):
+    # slicing the lazy frame would run the upstream sort for each slice
+    def fail(*args, **kwargs):  # pragma: no cover
+        raise AssertionError("the lazy input must not be sliced")
+
+    monkeypatch.setattr(pl.LazyFrame, "slice", fail)
+    lf = pl.LazyFrame({"a": list(range(10)), "b": list(range(10))}).sort(
+        "a", descending=True
+    )
+    chunks = list(iter_slices(make_plan(), lf, slice_size=4))
+    assert [chunk.height for chunk in chunks] == [4, 4, 2]
+    assert pl.concat(chunks)["b"].to_list() == list(range(10))[::-1]
+
+def test_registers_the_types():
+    # the dict form works without importing jsonpolars.api first
+    code = (
+        "import polars as pl; "
+        "from jsonpolars.slices import iter_slices; "
+        "list(iter_slices([{'type': 'drop', 'columns': ['b']}], "
+        "pl.DataFrame({'a': [1], 'b': [2]}), 1))"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.slices", preview=False)
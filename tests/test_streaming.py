@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import subprocess
+
+import polars as pl
+
+from jsonpolars.expr import api as expr
+from jsonpolars.dfop import api as dfop
+from jsonpolars.streaming import (
+    _parse_version,
+    split_segments,
+    StreamingPlan,
+    run_streaming,
+)
+
+
+def test_parse_version():
+    assert _parse_version("1.2.1") == (1, 2)
+    assert _parse_version("1.23.0rc1") == (1, 23)
+
+
+def test_split_segments():
+    segments = split_segments(
+        [
+            dfop.Select(exprs=["a"]),
+            dfop.Sort(by=["a"]),
+            dfop.Tail(n=2),
+            dfop.Head(n=1),
+        ]
+    )
+    assert [segment.streaming for segment in segments] == [True, False, True]
+    assert [len(segment.dfops) for segment in segments] == [2, 1, 1]
+
+
+def test_streaming_plan():
+    df = pl.DataFrame({"a": [3, 1, 4, 2], "b": [1, 2, 3, 4]})
+
+    plan = StreamingPlan.from_plan(
+        dfop.Pipeline(
+            dfops=[
+                dfop.WithColumns(
+                    named_exprs={
+                        "c": expr.Plus(
+                            left=expr.Column(name="a"),
+                            right=expr.Column(name="b"),
+                        )
+                    }
+                ),
+                dfop.Sort(by=["a"]),
+            ]
+        )
+    )
+    assert plan.non_streaming_dfops == []
+    assert plan.collect(df.lazy())["c"].to_list() == [3, 6, 4, 7]
+
+    plan_data = [
+        {"type": "sort", "by": ["a"]},
+        {"type": "tail", "n": 3},
+        {"type": "head", "n": 2},
+    ]
+    plan = StreamingPlan.from_plan(plan_data)
+    assert [dfop.type for dfop in plan.dfops] == ["sort", "tail", "head"]
+    assert plan.non_streaming_dfops == [dfop.Tail(n=3)]
+    assert plan.collect(df)["a"].to_list() == [2, 3]
+    assert run_streaming(plan_data, df).equals(plan.collect(df))
+
+
+def test_fallback_stays_lazy(tmp_path, monkeypatch):
+    pl.DataFrame({"a": list(range(10))}).write_parquet(tmp_path / "data.parquet")
+    plan = StreamingPlan.from_plan(
+        [
+            dfop.ScanParquet(source=str(tmp_path / "data.parquet")),
+            dfop.Tail(n=2),
+            dfop.Head(n=1),
+        ]
+    )
+    assert plan.non_streaming_dfops == [dfop.Tail(n=2)]
+
+    # the upstream of the fallback dfop is never collected on its own,
+    # the whole plan is collected once
+    collected = list()
+    collect = pl.LazyFrame.collect
+
+    def spy(self, *args, **kwargs):
+        collected.append(self.explain())
+        return collect(self, *args, **kwargs)
+
+    monkeypatch.setattr(pl.LazyFrame, "collect", spy)
+    assert plan.collect()["a"].to_list() == [8]
+    assert len(collected) == 1
+    assert "SCAN" in collected[0]
+
+
+
+def test_registers_the_types():
+    # the dict form works without importing jsonpolars.api first
+    code = (
+        "from jsonpolars.streaming import StreamingPlan; "
+        "StreamingPlan.from_plan([{'type': 'head', 'n': 3}])"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    from jsonpolars.tests import run_cov_test
+
+    run_cov_test(__file__, "jsonpolars.streaming", preview=False)